@@ -251,6 +251,11 @@ def main():
     else:
         control_uri = "http://%s:%d" % (args.host, args.controlport)
         uris.append("calvinip://%s:%d" % (args.host, args.port))
+        if 'calvinlocal' in _conf.get(None, 'transports'):
+            # Runtimes on the same host pick this one to reach us
+            from calvin.runtime.south.plugins.transports import calvinlocal
+            if calvinlocal.supported():
+                uris.append(calvinlocal.default_uri(args.port))
 
     if not uris:
         print "At least one listening interface is needed"
@@ -16,8 +16,10 @@
 
 import wrapt
 import functools
+import logging
 import time
 from calvin.utilities import calvinuuid
+from calvin.utilities import calvinconfig
 from calvin.utilities.security import Security
 from calvin.actor import actorport
 from calvin.utilities.calvinlogger import get_logger
@@ -25,9 +27,14 @@ from calvin.utilities.utils import enum
 from calvin.runtime.north.calvin_token import Token, ExceptionToken
 from calvin.runtime.north import calvincontrol
 from calvin.runtime.north import metering
+from calvin.runtime.north import offload as offload_
 from calvin.runtime.north.plugins.authorization import authz_plugins
 
 _log = get_logger(__name__)
+_conf = calvinconfig.get()
+
+# Scheduling classes in the order ready actors are served, see Actor.scheduling_set
+SCHEDULING_CLASSES = ('realtime', 'normal', 'bulk')
 
 
 # Tests in test_manage_decorator.py
@@ -71,13 +78,33 @@ def manage(include=None, exclude=None):
     return wrapper
 
 
-def condition(action_input=[], action_output=[]):
+class UpTo(int):
+
+    """
+    Repeat of a port in @condition taking (or producing) from 1 and up to this many tokens in one
+    firing, e.g. @condition([('integer', UpTo(64))], ['integer']). As an int it is the max count.
+    """
+
+    def __repr__(self):
+        return "UpTo(%d)" % self
+
+
+def condition(action_input=[], action_output=[], offload=False):
     """
     Decorator condition specifies the required input data and output space.
     Both parameters are lists of tuples: (port, #tokens consumed/produced)
     Optionally, the port spec can be a port only, meaning #tokens is 1.
     Return value is an ActionResult object
 
+    With an UpTo(n) repeat the action fires when there is at least one token (or slot), and takes as
+    many as are available up to n. All UpTo ports of an action take the same number of tokens, the batch,
+    which the action gets as a list per UpTo inport. The production of an UpTo outport is a list of at
+    most as many tokens as the batch. A batch ends before an exception token, when the exception token
+    is first it is alone in the batch and given to the exception handler as a token, not a list.
+
+    With offload=True a blocking or CPU heavy action (and its guard) runs in a worker thread,
+    see Actor._offload. It must then only use its arguments and its own actor's state.
+
     FIXME:
     - Modify ActionResult to specify how many tokens were read/written from/to each port
       E.g. ActionResult.tokens_consumed/produced are dicts: {'port1':4, 'port2':1, ...}
@@ -93,34 +120,44 @@ def condition(action_input=[], action_output=[]):
     contract_output = tuple(n for _, n in action_output)
     tokens_produced = sum(contract_output)
     tokens_consumed = sum([n for _, n in action_input])
+    batched = any(type(n) is UpTo for _, n in action_input + action_output)
+
+    def compile_ports(self):
+        # The ports of this actor instance, with their available_tokens bound
+        inputs = tuple((self.inports[portname], self.inports[portname].available_tokens, repeat, portname)
+                       for portname, repeat in action_input)
+        outputs = tuple((self.outports[portname], self.outports[portname].available_tokens, repeat)
+                        for portname, repeat in action_output)
+        return inputs, outputs
 
     def wrap(action_method):
 
         @functools.wraps(action_method)
         def condition_wrapper(self):
+            try:
+                inputs, outputs = self._conditions[condition_wrapper]
+            except KeyError:
+                inputs, outputs = self._conditions[condition_wrapper] = compile_ports(self)
             #
-            # Check if input ports have enough tokens. Note that all([]) evaluates to True
-            #
-            input_ok = all(
-                [self.inports[portname].available_tokens() >= repeat for (portname, repeat) in action_input]
-            )
+            # Check if input ports have enough tokens and output ports have enough free token slots,
+            # not being able to fire is the common case and returns without allocating anything
             #
-            # Check if output port have enough free token slots
-            #
-            output_ok = all(
-                [self.outports[portname].available_tokens() >= repeat for (portname, repeat) in action_output]
-            )
-
-            if not input_ok or not output_ok:
-                _log.debug("%s.%s not runnable (%s, %s)" % (self.name, action_method.__name__, input_ok, output_ok))
-                return ActionResult(did_fire=False)
+            for _, available_tokens, repeat, _ in inputs:
+                if available_tokens() < repeat:
+                    if _log.isEnabledFor(logging.DEBUG):
+                        _log.debug("%s.%s not runnable (input)" % (self.name, action_method.__name__))
+                    return NOT_FIRED
+            for _, available_tokens, repeat in outputs:
+                if available_tokens() < repeat:
+                    if _log.isEnabledFor(logging.DEBUG):
+                        _log.debug("%s.%s not runnable (output)" % (self.name, action_method.__name__))
+                    return NOT_FIRED
             #
             # Build the arguments for the action from the input port(s)
             #
             args = []
             ex = {}
-            for (portname, repeat) in action_input:
-                port = self.inports[portname]
+            for port, _, repeat, portname in inputs:
                 tokenlist = []
                 for i in range(repeat):
                     token = port.peek_token()
@@ -135,12 +172,124 @@ def condition(action_input=[], action_output=[]):
             #
             if ex:
                 action_result = self.exception_handler(action_method, args, {'exceptions': ex})
+            elif offload:
+                #
+                # Perform the action in a worker thread, completed when it returns
+                #
+                return self._offload(action_method, args, inputs, functools.partial(complete, self, inputs, outputs))
             else:
                 #
                 # Perform the action (N.B. the method may be wrapped in a guard)
                 #
                 action_result = action_method(self, *args)
+            return complete(self, inputs, outputs, action_result)
+
+        @functools.wraps(action_method)
+        def batch_condition_wrapper(self):
+            try:
+                inputs, outputs = self._conditions[batch_condition_wrapper]
+            except KeyError:
+                inputs, outputs = self._conditions[batch_condition_wrapper] = compile_ports(self)
+            #
+            # The batch is the most tokens (and slots) available on all UpTo ports, at least one
+            #
+            count = None
+            for _, available_tokens, repeat, _ in inputs:
+                available = available_tokens()
+                if available < (1 if type(repeat) is UpTo else repeat):
+                    return NOT_FIRED
+                if type(repeat) is UpTo:
+                    count = min(count or repeat, available)
+            for _, available_tokens, repeat in outputs:
+                available = available_tokens()
+                if available < (1 if type(repeat) is UpTo else repeat):
+                    return NOT_FIRED
+                if type(repeat) is UpTo:
+                    count = min(count or repeat, available)
+            #
+            # Peek the batch, it ends before the first exception token on an UpTo port
+            #
+            batches = []
+            for port, _, repeat, _ in inputs:
+                if type(repeat) is UpTo:
+                    tokens = [port.peek_token() for _ in range(count)]
+                    for index, token in enumerate(tokens):
+                        if isinstance(token, ExceptionToken):
+                            count = min(count, max(index, 1))
+                            break
+                    batches.append(tokens)
+            args = []
+            ex = {}
+            for port, _, repeat, portname in inputs:
+                if type(repeat) is UpTo:
+                    tokens = batches.pop(0)
+                    if len(tokens) > count:
+                        # Peeked beyond the batch
+                        port.peek_rewind()
+                        tokens = [port.peek_token() for _ in range(count)]
+                    if isinstance(tokens[0], ExceptionToken):
+                        ex[portname] = [0]
+                        args.append(tokens[0])
+                    else:
+                        args.append([token.value for token in tokens])
+                    continue
+                tokenlist = []
+                for i in range(repeat):
+                    token = port.peek_token()
+                    is_exception = isinstance(token, ExceptionToken)
+                    if is_exception:
+                        ex.setdefault(portname, []).append(i)
+                    tokenlist.append(token if is_exception else token.value)
+                args.append(tokenlist if len(tokenlist) > 1 else tokenlist[0])
+
+            if ex:
+                action_result = self.exception_handler(action_method, args, {'exceptions': ex})
+            elif offload:
+                return self._offload(action_method, args, inputs,
+                                     functools.partial(complete_batch, self, inputs, outputs, count))
+            else:
+                action_result = action_method(self, *args)
+            return complete_batch(self, inputs, outputs, count, action_result)
 
+        def complete_batch(self, inputs, outputs, count, action_result):
+            # As complete, with the batch size for the UpTo ports
+            valid_production = False
+            if action_result.did_fire and (len(contract_output) == len(action_result.production)):
+                valid_production = True
+                for repeat, prod in zip(contract_output, action_result.production):
+                    if type(repeat) is UpTo:
+                        if not isinstance(prod, (list, tuple)) or len(prod) > count:
+                            valid_production = False
+                            break
+                    elif repeat > 1 and len(prod) != repeat:
+                        valid_production = False
+                        break
+
+            if action_result.did_fire and valid_production:
+                for port, _, _, _ in inputs:
+                    port.commit_peek_as_read()
+                produced = 0
+                for (port, _, repeat), retval in zip(outputs, action_result.production):
+                    values = retval if type(repeat) is UpTo or repeat > 1 else [retval]
+                    for data in values:
+                        port.write_token(data if isinstance(data, Token) else Token(data))
+                    produced += len(values)
+                action_result.tokens_consumed = sum(count if type(repeat) is UpTo else repeat
+                                                    for _, _, repeat, _ in inputs)
+                action_result.tokens_produced = produced
+            else:
+                for port, _, _, _ in inputs:
+                    port.peek_rewind()
+
+            if action_result.did_fire and not valid_production:
+                action = "%s.%s" % (self._type, action_method.__name__)
+                raise Exception("%s invalid production %s, expected %s (batch of %d)" %
+                                (action, str(action_result.production), str(tuple(action_output)), count))
+
+            return action_result
+
+        def complete(self, inputs, outputs, action_result):
+            # Commit or rewind the peeked tokens and write the production of a performed action
             valid_production = False
             if action_result.did_fire and (len(contract_output) == len(action_result.production)):
                 valid_production = True
@@ -153,13 +302,12 @@ def condition(action_input=[], action_output=[]):
                 #
                 # Commit to the read from the FIFOs
                 #
-                for (portname, _) in action_input:
-                    self.inports[portname].commit_peek_as_read()
+                for port, _, _, _ in inputs:
+                    port.commit_peek_as_read()
                 #
                 # Write the results from the action to the output port(s)
                 #
-                for (portname, repeat), retval in zip(action_output, action_result.production):
-                    port = self.outports[portname]
+                for (port, _, repeat), retval in zip(outputs, action_result.production):
                     for data in retval if repeat > 1 else [retval]:
                         port.write_token(data if isinstance(data, Token) else Token(data))
                 #
@@ -171,16 +319,20 @@ def condition(action_input=[], action_output=[]):
                 #
                 # Rewind the read from the FIFOs
                 #
-                for (portname, _) in action_input:
-                    self.inports[portname].peek_rewind()
+                for port, _, _, _ in inputs:
+                    port.peek_rewind()
 
             if action_result.did_fire and not valid_production:
                 action = "%s.%s" % (self._type, action_method.__name__)
                 raise Exception("%s invalid production %s, expected %s" % (action, str(action_result.production), str(tuple(action_output))))
 
             return action_result
+
+        if batched:
+            condition_wrapper = batch_condition_wrapper
         condition_wrapper.action_input = action_input
         condition_wrapper.action_output = action_output
+        condition_wrapper.offload = offload
         return condition_wrapper
     return wrap
 
@@ -197,12 +349,12 @@ def guard(action_guard):
 
         @functools.wraps(action_method)
         def guard_wrapper(self, *args):
-            retval = ActionResult(did_fire=False)
             guard_ok = action_guard(self, *args)
-            _log.debug("%s.%s guard returned %s" % (self.name, action_method.__name__, guard_ok))
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("%s.%s guard returned %s" % (self.name, action_method.__name__, guard_ok))
             if guard_ok:
-                retval = action_method(self, *args)
-            return retval
+                return action_method(self, *args)
+            return NOT_FIRED
 
         return guard_wrapper
     return wrap
@@ -238,6 +390,8 @@ class ActionResult(object):
         self.tokens_consumed = 0
         self.tokens_produced = 0
         self.production = production
+        # The actor stopped firing on its budget, not because no action could fire
+        self.yielded = False
 
     def __str__(self):
         fmtstr = "%s - did_fire:%s, consumed:%d, produced:%d"
@@ -250,12 +404,33 @@ class ActionResult(object):
              any tokens_consumed will be ADDED
              any tokens_produced will be ADDED
              production will be DISCARDED
+             yielded will be OR:ed together
         """
         self.did_fire |= other_result.did_fire
+        self.yielded |= other_result.yielded
         self.tokens_consumed += other_result.tokens_consumed
         self.tokens_produced += other_result.tokens_produced
 
 
+# Shared result of actions that did not fire, must not be modified
+NOT_FIRED = ActionResult(did_fire=False)
+
+
+def local_peer_ids(actor):
+    """ Return the ids of actors on this node that are connected to any of actor's ports """
+    peer_ids = set()
+    for port in actor.inports.itervalues():
+        peer_port = getattr(port.endpoint, 'peer_port', None)
+        if peer_port is not None and peer_port.owner is not None:
+            peer_ids.add(peer_port.owner.id)
+    for port in actor.outports.itervalues():
+        for ep in port.endpoints:
+            peer_port = getattr(ep, 'peer_port', None)
+            if peer_port is not None and peer_port.owner is not None:
+                peer_ids.add(peer_port.owner.id)
+    return peer_ids
+
+
 def _implements_state(obj):
     """Helper method to check if foreign object supports setting/getting state."""
     return hasattr(obj, 'state') and callable(getattr(obj, 'state')) and \
@@ -337,13 +512,26 @@ class Actor(object):
         self._deployment_requirements = []
         self._signature = None
         self._component_members = set([self.id])  # We are only part of component if this is extended
-        self._managed = set(('id', 'name', '_deployment_requirements', '_signature', 'credentials'))
+        # Scheduling class and deadline, see scheduling_set
+        self._sched_class = 'normal'
+        self._sched_deadline = None
+        self._managed = set(('id', 'name', '_deployment_requirements', '_signature', 'credentials',
+                             '_sched_class', '_sched_deadline'))
         self._calvinsys = None
         self._using = {}
         self.control = calvincontrol.get_calvincontrol()
         self.metering = metering.get_metering()
         self._migrating_to = None  # During migration while on the previous node set to the next node id
         self._last_time_warning = 0.0
+        # Ports and preconditions of the @condition actions, compiled on first use
+        self._conditions = {}
+        # Port readiness bits and the bits needed per action, see _compile_action_index
+        self._action_index = None
+        # The (job, input ports) of an action running in a worker thread, see _offload
+        self._offloaded = None
+        # Firings and seconds after which fire yields, 0 is unlimited
+        self._fire_budget = _conf.get(None, 'actor_fire_budget') or 0
+        self._fire_budget_time = _conf.get(None, 'actor_fire_budget_time') or 0.0
         self.credentials = None
         self.authorization_plugins = None
 
@@ -452,7 +640,7 @@ class Actor(object):
 
     @verify_status([STATUS.READY])
     def set_port_property(self, port_type, port_name, port_property, value):
-        """Change a port property. Currently, setting 'fanout' on output ports is only allowed operation."""
+        """Change a port property, e.g. 'fanout' on output ports or 'fifo_size', 'fifo_size_min' and 'fifo_size_max'."""
 
         if port_type not in ('in', 'out'):
             _log.error("Illegal port type '%s' for actor '%s' of type '%s'" % (port_type, self.name, self._type))
@@ -467,7 +655,12 @@ class Actor(object):
             _log.error("Illegal property '%s' for %sport '%s' in actor '%s' of type '%s'" %
                        (port_property, port_type, port_name, self.name, self._type))
             return False
-        setattr(port, port_property, value)
+        try:
+            setattr(port, port_property, value)
+        except Exception as e:
+            _log.error("Failed to set property '%s' for %sport '%s' in actor '%s' of type '%s': %s" %
+                       (port_property, port_type, port_name, self.name, self._type, e))
+            return False
         return True
 
     @verify_status([STATUS.READY, STATUS.PENDING])
@@ -500,6 +693,7 @@ class Actor(object):
         """Called when a port is disconnected, checks actor is fully disconnected."""
         # If we happen to by in ENABLED, go to PENDING
         if self.fsm.state() == Actor.STATUS.ENABLED:
+            self._abandon_offload()
             self.fsm.transition_to(Actor.STATUS.PENDING)
 
         # Three non-patological options:
@@ -517,26 +711,83 @@ class Actor(object):
         # If we made it here, all ports are disconnected
         self.fsm.transition_to(Actor.STATUS.READY)
 
+    def _compile_action_index(self):
+        """
+        Returns a tuple of (bit, available_tokens) for the ports used by the actions and a tuple of
+        (action, bits) where bits are the ports the action needs a token or slot on, 0 for actions without
+        a @condition. Actors with a single action don't use the index, its condition is as cheap.
+        """
+        actions = self.__class__.action_priority
+        if len(actions) < 2:
+            return (), tuple((action, 0) for action in actions)
+        bits = {}
+        ports = []
+        needs = []
+        for action in actions:
+            need = 0
+            for portname, repeat in getattr(action, 'action_input', ()):
+                if not repeat:
+                    continue
+                port = self.inports[portname]
+                if port not in bits:
+                    bits[port] = 1 << len(ports)
+                    ports.append((bits[port], port.available_tokens))
+                need |= bits[port]
+            for portname, repeat in getattr(action, 'action_output', ()):
+                if not repeat:
+                    continue
+                port = self.outports[portname]
+                if port not in bits:
+                    bits[port] = 1 << len(ports)
+                    ports.append((bits[port], port.available_tokens))
+                need |= bits[port]
+            needs.append((action, need))
+        return tuple(ports), tuple(needs)
+
     @verify_status([STATUS.ENABLED])
     def fire(self):
         start_time = time.time()
         total_result = ActionResult(did_fire=False)
+        if self._action_index is None:
+            self._action_index = self._compile_action_index()
+        ports, actions = self._action_index
+        if self._offloaded is not None:
+            # Busy until the offloaded action completes, its inputs are peeked
+            return total_result
+        firings = 0
+        # Each firing is accounted the time since the previous one, i.e. including failed conditions
+        last_time = start_time
         while True:
             if not self.check_authorization_decision():
                 # The authorization decision is not valid anymore.
                 # TODO: try to migrate actor.
                 _log.info("Access denied for actor %s(%s)" % ( self._type, self.id))
                 return total_result
+            # Which ports have a token or a free slot, at least one, the conditions check the number needed
+            ready = 0
+            for bit, available_tokens in ports:
+                if available_tokens() > 0:
+                    ready |= bit
+            action_result = NOT_FIRED
             # Re-try action in list order after EVERY firing
-            for action_method in self.__class__.action_priority:
+            for action_method, need in actions:
+                if need & ready != need:
+                    # Skip actions missing tokens or slots on some port, without entering the condition
+                    continue
                 action_result = action_method(self)
                 total_result.merge(action_result)
+                if self._offloaded is not None:
+                    # The action went to a worker thread, fired (or not) when it returns
+                    return total_result
                 # Action firing should fire the first action that can fire,
                 # hence when fired start from the beginning
                 if action_result.did_fire:
+                    now = time.time()
+                    firings += 1
                     # FIXME: Make this a hook for the runtime to use, don't
                     #        import and use calvin_control or metering in actor
-                    self.metering.fired(self.id, action_method.__name__)
+                    self.metering.fired(self.id, action_method.__name__, now - last_time)
+                    last_time = now
                     self.control.log_actor_firing(
                         self.id,
                         action_method.__name__,
@@ -557,9 +808,79 @@ class Actor(object):
                     _log.warning("%s (%s) actor blocked for %f sec" % (self.name, self._type, diff))
                 # We reached the end of the list without ANY firing => return
                 return total_result
+            if ((self._fire_budget and firings >= self._fire_budget) or
+                    (self._fire_budget_time and last_time - start_time >= self._fire_budget_time)):
+                # Let other actors run, the scheduler fires this actor again in its next loop
+                total_result.yielded = True
+                self.metering.yielded(self.id)
+                return total_result
         # Redundant as of now, kept as reminder for when rewriting exception handling.
         raise Exception('Exit from fire should ALWAYS be from previous line.')
 
+    def _offload(self, action_method, args, inputs, complete):
+        """
+        Runs action_method on the offload pool with the peeked args. The actor does not fire until it
+        returns, then complete commits the peeked tokens and writes the production (or rewinds the
+        peek) on the reactor thread, so token order and the FIFO semantics are the same as for any action.
+        """
+        pool = offload_.get_offload()
+        job = pool.submit(action_method, self, *args)
+        if job is None:
+            # No room in the pool's queue, try again when a worker finishes
+            for port, _, _, _ in inputs:
+                port.peek_rewind()
+            pool.wait(self.id, self._trigger)
+            return NOT_FIRED
+        self._offloaded = (job, inputs)
+        job.addCallback(self._offload_done, job, action_method.__name__, complete)
+        job.addErrback(self._offload_failed, job, action_method.__name__)
+        return NOT_FIRED
+
+    def _offload_done(self, action_result, job, action_name, complete):
+        if self._offloaded is None or self._offloaded[0] is not job:
+            _log.debug("Actor %s(%s) dropped result of abandoned %s" % (self._type, self.id, action_name))
+            return
+        self._offloaded = None
+        try:
+            action_result = complete(action_result)
+        except Exception as e:
+            _log.exception(e)
+        else:
+            if action_result.did_fire:
+                self.metering.fired(self.id, action_name)
+                self.control.log_actor_firing(
+                    self.id,
+                    action_name,
+                    action_result.tokens_produced,
+                    action_result.tokens_consumed,
+                    action_result.production)
+        # The actor's other actions were skipped while busy and tokens and slots may have changed,
+        # fire this actor and its peers again
+        self._trigger()
+
+    def _offload_failed(self, failure, job, action_name):
+        _log.error("Actor %s(%s) offloaded %s failed: %s" % (self._type, self.id, action_name, failure.getErrorMessage()))
+        if self._offloaded is not None and self._offloaded[0] is job:
+            self._abandon_offload()
+            self._trigger()
+
+    def _trigger(self):
+        """ Fire this actor and its local peers """
+        if self._calvinsys is not None:
+            self._calvinsys.scheduler_wakeup([self.id] + list(local_peer_ids(self)))
+
+    def _abandon_offload(self):
+        """ Rewinds the peeked inputs of an offloaded action, its result is dropped when it returns """
+        if self._offloaded is None:
+            return
+        _, inputs = self._offloaded
+        self._offloaded = None
+        for port, _, _, _ in inputs:
+            if port.is_connected():
+                port.peek_rewind()
+            else:
+                port.fifo.rollback_reads(port.id)
+
     def enabled(self):
         return self.fsm.state() == Actor.STATUS.ENABLED
 
@@ -686,6 +1007,21 @@ class Actor(object):
                   'type': '+'}]
                 if hasattr(self, 'requires') else [])
 
+    def scheduling_set(self, sched_class='normal', deadline=None):
+        """
+        Set the scheduling class, one of SCHEDULING_CLASSES, and optionally a deadline in seconds.
+        Ready actors are fired by class and then by deadline, counted from when the actor was triggered.
+        """
+        if sched_class not in SCHEDULING_CLASSES:
+            raise ValueError("Unknown scheduling class '%s'" % sched_class)
+        if deadline is not None and deadline <= 0:
+            raise ValueError("Deadline must be positive, got %s" % deadline)
+        self._sched_class = sched_class
+        self._sched_deadline = deadline
+
+    def scheduling_get(self):
+        return {'class': self._sched_class, 'deadline': self._sched_deadline}
+
     def signature_set(self, signature):
         if self._signature is None:
             self._signature = signature
@@ -730,6 +1066,8 @@ class ShadowActor(Actor):
 
     def create_shadow_port(self, port_name, port_dir, port_id=None):
         # TODO check if we should create port against meta info
+        self._conditions.clear()
+        self._action_index = None
         if port_dir == "in":
             self.inport_names.append(port_name)
             port = actorport.InPort(port_name, self)
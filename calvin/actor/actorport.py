@@ -18,15 +18,17 @@ from calvin.utilities import calvinuuid
 from calvin.runtime.north import fifo
 from calvin.runtime.south import endpoint
 from calvin.utilities.calvinlogger import get_logger
+from calvin.utilities import calvinconfig
 import copy
 
 _log = get_logger(__name__)
+_conf = calvinconfig.get()
 
 
 class Port(object):
     """docstring for Port"""
 
-    def __init__(self, name, owner, fifo_size=5):
+    def __init__(self, name, owner, fifo_size=None):
         super(Port, self).__init__()
         # Human readable port name
         self.name = name
@@ -36,11 +38,51 @@ class Port(object):
         self.id = calvinuuid.uuid("PORT")
         # The token queue. Not all scenarios use it,
         # but needed when e.g. changing from local to remote connection.
-        self.fifo = fifo.FIFO(fifo_size)
+        if fifo_size is None:
+            fifo_size = _conf.get(None, 'fifo_size')
+            self.fifo = fifo.FIFO(fifo_size)
+            self.fifo.set_bounds(min(fifo_size, _conf.get(None, 'fifo_size_min')),
+                                 max(fifo_size, _conf.get(None, 'fifo_size_max')))
+        else:
+            self.fifo = fifo.FIFO(fifo_size)
 
     def __str__(self):
         return "%s id=%s" % (self.name, self.id)
 
+    # FIFO properties, settable from CalvinScript and the control API.
+    # When fifo_size_min < fifo_size_max the FIFO adapts its size between them.
+
+    @property
+    def fifo_size(self):
+        return self.fifo.N
+
+    @fifo_size.setter
+    def fifo_size(self, size):
+        if not self.fifo.resize(int(size)):
+            raise Exception("Can't resize FIFO of port %s.%s with id: %s to %s" % (
+                self.owner.name, self.name, self.id, size))
+
+    @property
+    def fifo_size_min(self):
+        return self.fifo.min_length
+
+    @fifo_size_min.setter
+    def fifo_size_min(self, size):
+        self._set_fifo_bounds(int(size), max(int(size), self.fifo.max_length))
+
+    @property
+    def fifo_size_max(self):
+        return self.fifo.max_length
+
+    @fifo_size_max.setter
+    def fifo_size_max(self, size):
+        self._set_fifo_bounds(min(int(size), self.fifo.min_length), int(size))
+
+    def _set_fifo_bounds(self, min_size, max_size):
+        if not self.fifo.set_bounds(min_size, max_size):
+            raise Exception("Can't bound FIFO of port %s.%s with id: %s to [%s, %s]" % (
+                self.owner.name, self.name, self.id, min_size, max_size))
+
     def _state(self):
         """Return port state for serialization."""
         return {'name': self.name, 'id': self.id, 'fifo': self.fifo._state()}
@@ -216,6 +258,10 @@ class OutPort(Port):
         if not self.fifo.write(data):
             raise Exception("FIFO full when writing to port %s.%s with id: %s" % (
                 self.owner.name, self.name, self.id))
+        for ep in self.endpoints:
+            # Tunnel endpoints have something to send
+            if ep.monitor is not None:
+                ep.monitor.mark_dirty(ep)
 
     def available_tokens(self):
         """Used by actor (owner) to check number of token slots available on the port."""
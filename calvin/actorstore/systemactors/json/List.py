@@ -16,7 +16,7 @@
 
 # encoding: utf-8
 
-from calvin.actor.actor import Actor, ActionResult, manage, condition, guard
+from calvin.actor.actor import Actor, ActionResult, manage, condition, guard, UpTo
 from calvin.runtime.north.calvin_token import EOSToken, ExceptionToken
 
 class List(Actor):
@@ -52,10 +52,10 @@ class List(Actor):
         self.post_list = post_list
         self.done = False
 
-    @condition(['item'], [])
-    @guard(lambda self, item: not self.n and not self.done)
-    def add_item_EOS(self, item):
-        self._list.append(item)
+    @condition([('item', UpTo(64))], [])
+    @guard(lambda self, items: not self.n and not self.done)
+    def add_item_EOS(self, items):
+        self._list.extend(items)
         return ActionResult()
 
     @condition(['item'], [])
@@ -14,7 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from calvin.actor.actor import Actor, ActionResult, manage, condition
+from calvin.actor.actor import Actor, ActionResult, manage, condition, UpTo
 
 
 class Sum(Actor):
@@ -30,10 +30,13 @@ class Sum(Actor):
     def init(self):
         self.sum = 0
 
-    @condition(['integer'], ['integer'])
-    def sum(self, input):
-        self.sum = self.sum + input
-        return ActionResult(production=(self.sum, ))
+    @condition([('integer', UpTo(64))], [('integer', UpTo(64))])
+    def sum(self, inputs):
+        sums = []
+        for input in inputs:
+            self.sum = self.sum + input
+            sums.append(self.sum)
+        return ActionResult(production=(sums, ))
 
     action_priority = (sum, )
 
@@ -17,7 +17,7 @@
 
 from collections import defaultdict
 
-from calvin.actor.actor import Actor, ActionResult, manage, condition, guard
+from calvin.actor.actor import Actor, ActionResult, manage, condition, guard, UpTo
 from calvin.runtime.north.calvin_token import EOSToken
 
 from calvin.utilities.calvinlogger import get_logger
@@ -44,9 +44,10 @@ class WordCount(Actor):
         self.finished = True
         return ActionResult()
 
-    @condition(['in'], [])
-    def count_word(self, word):
-        self.word_counts[word] = self.word_counts[word] + 1
+    @condition([('in', UpTo(64))], [])
+    def count_word(self, words):
+        for word in words:
+            self.word_counts[word] = self.word_counts[word] + 1
         return ActionResult()
 
     @condition(action_output=['out'])
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmarks of the runtime hot paths.
+
+Each module can be run as a script, e.g. python -m calvin.benchmarks.scheduler_bench
+The benchmarks run the runtime classes directly without any reactor or network.
+"""
+
+import time
+from mock import Mock
+
+from calvin.runtime.north import metering
+from calvin.runtime.north.actormanager import ActorManager
+from calvin.runtime.south import endpoint
+
+
+class BenchNode(object):
+
+    """Minimal node for running actors outside of a runtime"""
+
+    def __init__(self):
+        super(BenchNode, self).__init__()
+        self.id = "BENCH-NODE"
+        self.pm = Mock()
+        self.storage = Mock()
+        self.control = Mock()
+        self.sched = Mock()
+        self.metering = metering.set_metering(metering.Metering(self))
+        self.am = ActorManager(self)
+
+    def calvinsys(self):
+        return None
+
+
+def new_actor(node, actor_type, args=None):
+    """Create an actor and return it, ports are not connected"""
+    actor_id = node.am.new(actor_type, args or {})
+    actor = node.am.actors[actor_id]
+    actor._calvinsys = Mock()
+    return actor
+
+
+def connect_local(outport, inport):
+    """Connect two ports on the same node"""
+    inport.attach_endpoint(endpoint.LocalInEndpoint(inport, outport))
+    outport.attach_endpoint(endpoint.LocalOutEndpoint(outport, inport))
+
+
+def measure(func, repeat=1000, *args):
+    """Return mean time in microseconds for a call of func"""
+    start = time.time()
+    for _ in xrange(repeat):
+        func(*args)
+    return (time.time() - start) * 1e6 / repeat
+
+
+def report(title, header, rows):
+    print title
+    fmt = "  ".join(["%14s"] * len(header))
+    print fmt % tuple(header)
+    for row in rows:
+        print fmt % tuple(("%.2f" % c) if isinstance(c, float) else c for c in row)
+    print
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cost of an action attempt with the @condition decorator.
+
+The no-op row is an attempt on an empty inport (the common case when
+actors are swept), the firing row reads, fires and writes one token.
+reference_condition is the precondition check as it was before the ports
+were compiled per actor instance.
+
+The fire rows measure Actor.fire on actors with several actions, with the
+action readiness index and with every action's condition entered in
+priority order, when no port or only the first inport has tokens.
+"""
+
+import argparse
+import functools
+
+from calvin.actor.actor import ActionResult, condition, _log
+from calvin.actor.actorport import InPort, OutPort
+from calvin.benchmarks import BenchNode, new_actor, connect_local, measure, report
+from calvin.runtime.north.calvin_token import Token, ExceptionToken
+
+
+def reference_condition(action_input=[], action_output=[]):
+    action_input = [p if isinstance(p, (list, tuple)) else (p, 1) for p in action_input]
+    action_output = [p if isinstance(p, (list, tuple)) else (p, 1) for p in action_output]
+    contract_output = tuple(n for _, n in action_output)
+    tokens_produced = sum(contract_output)
+    tokens_consumed = sum([n for _, n in action_input])
+
+    def wrap(action_method):
+
+        @functools.wraps(action_method)
+        def condition_wrapper(self):
+            input_ok = all(
+                [self.inports[portname].available_tokens() >= repeat for (portname, repeat) in action_input]
+            )
+            output_ok = all(
+                [self.outports[portname].available_tokens() >= repeat for (portname, repeat) in action_output]
+            )
+
+            if not input_ok or not output_ok:
+                _log.debug("%s.%s not runnable (%s, %s)" % (self.name, action_method.__name__, input_ok, output_ok))
+                return ActionResult(did_fire=False)
+            args = []
+            ex = {}
+            for (portname, repeat) in action_input:
+                port = self.inports[portname]
+                tokenlist = []
+                for i in range(repeat):
+                    token = port.peek_token()
+                    is_exception = isinstance(token, ExceptionToken)
+                    if is_exception:
+                        ex.setdefault(portname, []).append(i)
+                    tokenlist.append(token if is_exception else token.value)
+                args.append(tokenlist if len(tokenlist) > 1 else tokenlist[0])
+
+            if ex:
+                action_result = self.exception_handler(action_method, args, {'exceptions': ex})
+            else:
+                action_result = action_method(self, *args)
+
+            valid_production = False
+            if action_result.did_fire and (len(contract_output) == len(action_result.production)):
+                valid_production = True
+                for repeat, prod in zip(contract_output, action_result.production):
+                    if repeat > 1 and len(prod) != repeat:
+                        valid_production = False
+                        break
+
+            if action_result.did_fire and valid_production:
+                for (portname, _) in action_input:
+                    self.inports[portname].commit_peek_as_read()
+                for (portname, repeat), retval in zip(action_output, action_result.production):
+                    port = self.outports[portname]
+                    for data in retval if repeat > 1 else [retval]:
+                        port.write_token(data if isinstance(data, Token) else Token(data))
+                action_result.tokens_consumed = tokens_consumed
+                action_result.tokens_produced = tokens_produced
+            else:
+                for (portname, _) in action_input:
+                    self.inports[portname].peek_rewind()
+
+            if action_result.did_fire and not valid_production:
+                action = "%s.%s" % (self._type, action_method.__name__)
+                raise Exception("%s invalid production %s, expected %s" % (action, str(action_result.production), str(tuple(action_output))))
+
+            return action_result
+        return condition_wrapper
+    return wrap
+
+
+def forward(self, token):
+    return ActionResult(production=(token, ))
+
+
+def attempt(action, actor):
+    action(actor)
+
+
+def fire(action, actor, source):
+    source.write_token(Token(1))
+    action(actor)
+    actor.outports['token'].endpoints[0].peer_port.read_token()
+
+
+def connect_all(node, actor):
+    """Connect every port of actor to a port of a std.Identity, returns the peer ports by name"""
+    peers = {}
+    for name, inport in actor.inports.iteritems():
+        peers[name] = new_actor(node, 'std.Identity').outports['token']
+        connect_local(peers[name], inport)
+    for name, outport in actor.outports.iteritems():
+        peers[name] = new_actor(node, 'std.Identity').inports['token']
+        connect_local(outport, peers[name])
+    return peers
+
+
+def actor_fire(actor):
+    actor.fire()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=100000)
+    args = parser.parse_args()
+
+    node = BenchNode()
+    source, actor, sink = [new_actor(node, 'std.Identity') for _ in range(3)]
+    connect_local(source.outports['token'], actor.inports['token'])
+    connect_local(actor.outports['token'], sink.inports['token'])
+    reference = reference_condition(['token'], ['token'])(forward)
+    compiled = condition(['token'], ['token'])(forward)
+
+    rows = []
+    times = [measure(attempt, args.repeat, action, actor) for action in (reference, compiled)]
+    rows.append(("no-op", times[0], times[1], times[0] / times[1]))
+    times = [measure(fire, args.repeat, action, actor, source.outports['token']) for action in (reference, compiled)]
+    rows.append(("fire", times[0], times[1], times[0] / times[1]))
+    report("Action attempt (us)", ("attempt", "reference", "compiled", "speedup"), rows)
+
+    rows = []
+    for actor_type, first_inport in (('std.Select', 'select'), ('std.Alternate3', 'token_1'), ('std.Deselect', 'select')):
+        for tokens in (False, True):
+            actor = new_actor(node, actor_type)
+            peers = connect_all(node, actor)
+            if tokens:
+                # More tokens than the actor can consume in the measurement, it only gets tokens on one port
+                for _ in range(4):
+                    peers[first_inport].write_token(Token(1))
+            index = actor._compile_action_index()
+            times = []
+            for ports, actions in (((), tuple((action, 0) for action, _ in index[1])), index):
+                actor._action_index = (ports, actions)
+                times.append(measure(actor_fire, args.repeat / 10, actor))
+            rows.append((actor_type, "first" if tokens else "none", times[0], times[1], times[0] / times[1]))
+    report("Actor.fire without firing (us)", ("actor", "tokens", "all actions", "index", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Throughput of the same pipelines on the twisted and the asyncio backends.
+
+Local: tokens circulate in a ring of std.Identity actors run by the
+scheduler, i.e. the scheduler loops, timers and loop yields of the backend.
+
+Remote: a stream of token messages from one calvinip transport to another
+over the loopback interface, each acknowledged by a reply as a token
+transfer is, with a window of unacknowledged messages.
+
+Every backend runs in its own process, the framework is selected with the
+CALVIN_GLOBAL_FRAMEWORK environment variable.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from calvin.benchmarks import BenchNode, new_actor, connect_local, report
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.scheduler import Scheduler
+from calvin.runtime.south.monitor import Event_Monitor
+from calvin.runtime.south.plugins.async import async
+from calvin.runtime.south.plugins.transports.calvinip import calvinip_transport
+from calvin.utilities.calvin_callback import CalvinCB
+
+BACKENDS = ["twistedimpl", "asyncioimpl"]
+
+
+def local(seconds, tokens):
+    node = BenchNode()
+    ring = [new_actor(node, 'std.Identity') for _ in range(3)]
+    for a, b in zip(ring, ring[1:] + ring[:1]):
+        connect_local(a.outports['token'], b.inports['token'])
+    for i in range(tokens):
+        ring[i % len(ring)].outports['token'].write_token(Token(i))
+    sched = Scheduler(node, node.am, Event_Monitor())
+    sched.trigger_loop()
+    async.DelayedCall(seconds, async.stop_ioloop)
+    start = time.time()
+    sched.run()
+    elapsed = time.time() - start
+    fired = sum(node.metering.actors_aggregated.get(actor.id, {}).get('donothing', 0) for actor in ring)
+    return {'rate': fired / elapsed}
+
+
+class Stream(object):
+
+    def __init__(self, seconds, window):
+        super(Stream, self).__init__()
+        self.seconds = seconds
+        self.window = window
+        self.sent = 0
+        self.acked = 0
+        self.start = None
+        callbacks = {'join_finished': [CalvinCB(self._joined)], 'data_received': [CalvinCB(self._received)],
+                     'server_started': [CalvinCB(self._server_started)]}
+        self.server = calvinip_transport.CalvinTransportFactory("BENCH-SERVER", callbacks)
+        self.client = calvinip_transport.CalvinTransportFactory("BENCH-CLIENT", callbacks)
+
+    def _server_started(self, server, port):
+        self.client.join("calvinip://127.0.0.1:%d" % port)
+
+    def _joined(self, transport, peer_id, uri, is_orginator):
+        if is_orginator:
+            self.transport = transport
+            self.start = time.time()
+            async.DelayedCall(self.seconds, async.stop_ioloop)
+            while self.sent < self.window:
+                self._send()
+
+    def _send(self):
+        self.sent += 1
+        self.transport.send({'cmd': 'TOKEN', 'sequencenbr': self.sent, 'port_id': "PORT", 'peer_port_id': "PEER",
+                             'token': {'type': 'Token', 'data': self.sent}})
+
+    def _received(self, transport, msg):
+        if msg['cmd'] == 'TOKEN':
+            transport.send({'cmd': 'TOKEN_REPLY', 'sequencenbr': msg['sequencenbr'], 'port_id': "PEER",
+                            'peer_port_id': "PORT", 'value': 'ACK'})
+        else:
+            self.acked += 1
+            self._send()
+
+    def run(self):
+        self.server.listen("calvinip:127.0.0.1:0")
+        async.run_ioloop()
+        return {'rate': self.acked / (time.time() - self.start)}
+
+
+def run(mode, seconds, value):
+    if mode == 'local':
+        result = local(seconds, value)
+    else:
+        result = Stream(seconds, value).run()
+    print json.dumps(result)
+
+
+def child(backend, mode, seconds, value):
+    env = dict(os.environ, CALVIN_GLOBAL_FRAMEWORK=json.dumps(backend))
+    output = subprocess.check_output([sys.executable, '-m', 'calvin.benchmarks.backend_bench', '--run', mode,
+                                      str(seconds), str(value)], env=env, stderr=open(os.devnull, 'w'))
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--run', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run[0], float(args.run[1]), int(args.run[2]))
+        return
+
+    rows = []
+    for backend in BACKENDS:
+        rows.append([backend] + [child(backend, 'local', args.seconds, tokens)['rate'] for tokens in (1, 9)])
+    report("Firings/s in a ring of 3 actors", ("backend", "1 token", "9 tokens"), rows)
+    rows = []
+    for backend in BACKENDS:
+        rows.append([backend] + [child(backend, 'remote', args.seconds, window)['rate'] for window in (1, 16)])
+    report("Acknowledged token messages/s over calvinip on loopback", ("backend", "window 1", "window 16"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Token cost of std.Sum taking up to 64 tokens per firing, compared with
+the same actor firing once per token.
+
+The tokens are queued on the inport before the actor is fired until it
+has consumed them all, the sums are read from a consumer port.
+"""
+
+import argparse
+
+from mock import Mock
+
+from calvin.actor.actor import Actor, ActionResult, condition
+from calvin.actorstore.systemactors.std.Sum import Sum
+from calvin.benchmarks import BenchNode, new_actor, connect_local, measure, report
+from calvin.actor.actorport import InPort, OutPort
+from calvin.runtime.north.calvin_token import Token
+
+
+class TokenSum(Sum):
+
+    inport_names = ['integer']
+    outport_names = ['integer']
+
+    @condition(['integer'], ['integer'])
+    def sum(self, input):
+        self.sum = self.sum + input
+        return ActionResult(production=(self.sum, ))
+
+    action_priority = (sum, )
+
+
+def setup(node, actor_class, tokens):
+    if actor_class is None:
+        actor = new_actor(node, 'std.Sum')
+    else:
+        actor = actor_class('std.Sum')
+        actor.init()
+        actor._calvinsys = Mock()
+    producer, consumer = OutPort('out', Mock()), InPort('in', Mock())
+    connect_local(producer, actor.inports['integer'])
+    connect_local(actor.outports['integer'], consumer)
+    producer.fifo.resize(tokens + 1)
+    actor.outports['integer'].fifo.resize(tokens + 1)
+    if not actor.enabled():
+        actor.fsm.transition_to(Actor.STATUS.READY)
+        actor.fsm.transition_to(Actor.STATUS.ENABLED)
+    return actor, producer, consumer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--loops', type=int, default=200)
+    parser.add_argument('--tokens', type=int, nargs='+', default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+
+    node = BenchNode()
+    rows = []
+    for tokens in args.tokens:
+        result = []
+        # The store's std.Sum takes up to 64 tokens
+        for actor_class in (TokenSum, None):
+            actor, producer, consumer = setup(node, actor_class, tokens)
+
+            def run():
+                for i in xrange(tokens):
+                    producer.write_token(Token(i))
+                actor.fire()
+                for _ in xrange(tokens):
+                    consumer.read_token()
+
+            result.append(measure(run, args.loops) / tokens)
+        rows.append((tokens, result[0], result[1], result[0] / result[1]))
+    report("std.Sum cost (us per token)", ("queued tokens", "per token", "up to 64", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
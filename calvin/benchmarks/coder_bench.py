@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Message coder benchmark, json versus cbor.
+
+The messages are captured from calvin_proto sending on a link with a
+recording transport: actor migration with state, tunnel and port setup,
+replies, and token traffic over a tunnel from real tunnel endpoints. Size
+is the coded length in bytes, times are microseconds per message.
+
+Binary tokens (a 100 KB camera frame) are compared as base64 text in the
+coded message, which is what a json link needs, and as an out-of-band
+segment in the transport frame.
+"""
+
+import argparse
+import base64
+import copy
+import os
+from collections import OrderedDict
+from mock import Mock
+
+from calvin.benchmarks import BenchNode, new_actor, measure, report
+from calvin.actor.actorport import InPort, OutPort
+from calvin.requests import calvinresponse as response
+from calvin.runtime.north.calvin_network import CalvinLink
+from calvin.runtime.north.calvin_proto import CalvinProto
+from calvin.runtime.north.calvin_token import Token, EOSToken
+from calvin.runtime.north.plugins.coders.messages import message_coder_factory
+from calvin.runtime.south import endpoint
+from calvin.runtime.south.plugins.transports.lib import segments
+
+NODE_ID = "NODE-A"
+PEER_ID = "NODE-B"
+
+
+class RecordingTransport(object):
+
+    def __init__(self):
+        super(RecordingTransport, self).__init__()
+        self.messages = []
+
+    def send(self, payload):
+        self.messages.append(copy.deepcopy(payload))
+
+
+def trigger_loop(delay=0, actor_ids=None):
+    pass
+
+
+def capture(tokens):
+    """Return the messages sent by calvin_proto for a migration followed by token traffic"""
+    transport = RecordingTransport()
+    network = Mock()
+    network.links = {PEER_ID: CalvinLink(NODE_ID, PEER_ID, transport)}
+    node = Mock()
+    node.id = NODE_ID
+    proto = CalvinProto(node, network)
+
+    bench_node = BenchNode()
+    actor = new_actor(bench_node, 'std.Counter')
+    proto.actor_new(PEER_ID, None, 'std.Counter', actor.state(), {'inports': {}, 'outports': {
+        actor.outports['integer'].id: [(PEER_ID, "f9f4d5b4-bc4b-4baa-8fa2-f4ecd0e52b39")]}})
+    proto.actor_migrate(PEER_ID, None, actor.id, [{'op': 'node_attr_match', 'kwargs': {'index': ['node_name', {'name': 'B'}]}, 'type': '+'}])
+    proto.app_destroy(PEER_ID, None, "b7c1d4ba-4fa5-4a61-9bfa-3c0c4b5a4a2c", [actor.id])
+    tunnel = proto.tunnel_new(PEER_ID, 'token', {})
+    outport = actor.outports['integer']
+    inport = InPort("token", Mock())
+    proto.port_connect(port_id=outport.id, peer_node_id=PEER_ID, peer_port_id=inport.id, tunnel=tunnel,
+                       token_capabilities=endpoint.TOKEN_CAPABILITIES)
+    proto._actor_new_handler({'msg_uuid': "MSGID_0d8f2e1a-5c6e-4e0a-a0a3-1f5c0d4f0e21", 'from_rt_uuid': PEER_ID},
+                             response.CalvinResponse(response.OK, {'port_id': inport.id, 'token_credit': 4}))
+
+    # Token traffic, integers, strings, floats and structured values
+    out_endp = endpoint.TunnelOutEndpoint(outport, tunnel, PEER_ID, inport.id, trigger_loop)
+    in_endp = endpoint.TunnelInEndpoint(inport, tunnel, NODE_ID, outport.id, trigger_loop)
+    outport.attach_endpoint(out_endp)
+    values = [42, 3.14159, "temperature", {'x': 12, 'y': -7, 'label': "sensor"}, [1, 2, 3, 4]]
+    for n in xrange(tokens):
+        outport.write_token(Token(values[n % len(values)]) if n < tokens - 1 else EOSToken())
+        out_endp.communicate()
+        msg = transport.messages[-1]['value']
+        in_endp.recv_token(msg)
+        out_endp.reply(msg['sequencenbr'], 'ACK')
+        inport.endpoint.read_token()
+    proto.port_disconnect(port_id=outport.id, peer_node_id=PEER_ID, peer_port_id=inport.id)
+    return transport.messages
+
+
+def kind(msg):
+    if msg['cmd'] == 'TUNNEL_DATA':
+        return msg['value']['cmd']
+    return msg['cmd']
+
+
+def code_all(coder, messages):
+    for msg in messages:
+        coder.decode(coder.encode(msg))
+
+
+def frame_base64(coder, msg):
+    value = msg['value']['token']['data']
+    msg = copy.copy(msg)
+    msg['value'] = dict(msg['value'], token=Token(base64.b64encode(value)).encode())
+    data = coder.decode(coder.encode(msg))
+    return base64.b64decode(data['value']['token']['data'])
+
+
+def frame_segments(coder, msg):
+    data = segments.decode(''.join(segments.encode(msg, coder, 4096)), coder)
+    return data['value']['token']['data']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tokens', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--frame-size', type=int, default=100 * 1024)
+    args = parser.parse_args()
+
+    messages = capture(args.tokens)
+    coders = OrderedDict((name, message_coder_factory.get(name)) for name in ('json', 'cbor'))
+    kinds = OrderedDict()
+    for msg in messages:
+        kinds.setdefault(kind(msg), []).append(msg)
+    kinds['mix'] = messages
+
+    rows = []
+    for name, msgs in kinds.iteritems():
+        row = [name, len(msgs)]
+        for coder in coders.itervalues():
+            row.append(float(sum(len(coder.encode(m)) for m in msgs)) / len(msgs))
+        for coder in coders.itervalues():
+            row.append(measure(code_all, args.repeat, coder, msgs) / len(msgs))
+        rows.append(row)
+    report("Message coders, mean per message (bytes, us for encode+decode)",
+           ("message", "count", "json bytes", "cbor bytes", "json us", "cbor us"), rows)
+
+    image = os.urandom(args.frame_size)
+    rows = []
+    for value in (image, bytearray(image), memoryview(image)):
+        msg = {'cmd': 'TUNNEL_DATA', 'tunnel_id': "TUNNEL_1", 'value': {
+            'cmd': 'TOKEN', 'port_id': "p1", 'peer_port_id': "p2", 'sequencenbr': 1, 'token': Token(value).encode()}}
+        row = [type(value).__name__]
+        for name, coder in coders.iteritems():
+            row.append(measure(frame_base64, args.repeat, coder, msg))
+            row.append(measure(frame_segments, args.repeat, coder, msg))
+        rows.append(row)
+    report("Binary token of %d bytes, us for encode+decode" % args.frame_size,
+           ("value", "json base64", "json segment", "cbor base64", "cbor segment"), rows)
+
+
+if __name__ == '__main__':
+    main()
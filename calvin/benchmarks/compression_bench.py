@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Size and cost of the per link compression of messages.
+
+Migration: ACTOR_NEW messages with the state of std.Identity actors with
+full FIFOs, one message per actor as when an application migrates.
+Tokens: TOKEN messages with a JSON token, a dict of 30 readings.
+
+Sizes are the bytes on the link per message, for the first message on a
+link and the average over the following ones, which profit from the
+compression context kept per link. Times are the microseconds to encode
+and to decode a message, including the coding.
+"""
+
+import argparse
+import time
+
+from calvin.benchmarks import BenchNode, new_actor, report
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.plugins.coders.messages import message_coder_factory
+from calvin.runtime.south.plugins.transports.lib.compression import Compression
+
+
+def migration_messages(count):
+    node = BenchNode()
+    messages = []
+    for _ in xrange(count):
+        actor = new_actor(node, 'std.Identity')
+        for n in range(5):
+            actor.inports['token'].fifo.write(Token(n))
+        messages.append({'cmd': 'ACTOR_NEW', 'state': {'actor_type': 'std.Identity', 'actor_state': actor.state(),
+                                                      'prev_connections': {}}})
+    return messages
+
+
+def token_messages(count):
+    return [{'cmd': 'TUNNEL_DATA', 'tunnel_id': 'TUNNEL', 'value': {
+        'cmd': 'TOKEN', 'sequencenbr': n, 'token': Token({'sensor%d' % i: {'value': n * 0.1 + i, 'unit': 'celsius',
+                                                                             'timestamp': 1460000000.0 + n}
+                                                         for i in range(30)}).encode()}} for n in xrange(count)]
+
+
+def run(coder, messages, min_size):
+    sender = Compression(coder, min_size) if min_size is not None else coder
+    receiver = Compression(coder, min_size) if min_size is not None else coder
+    start = time.time()
+    coded = [sender.encode(message) for message in messages]
+    encode = time.time() - start
+    start = time.time()
+    for data in coded:
+        receiver.decode(data)
+    decode = time.time() - start
+    rest = coded[1:]
+    return (len(coded[0]), sum(len(data) for data in rest) / float(len(rest)),
+            encode * 1e6 / len(coded), decode * 1e6 / len(coded))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=200)
+    args = parser.parse_args()
+
+    for name, messages in (("Migration", migration_messages(args.messages)),
+                           ("Tokens", token_messages(args.messages))):
+        rows = []
+        for coder_name in ("json", "cbor"):
+            coder = message_coder_factory.get(coder_name)
+            for label, min_size in (("plain", None), ("zlib", 1024)):
+                rows.append(("%s %s" % (coder_name, label),) + run(coder, messages, min_size))
+        report("%s messages" % name, ("coder", "first bytes", "next bytes", "encode us", "decode us"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+FIFO token path micro benchmark for 1, 8 and 64 readers (fan-out).
+
+One round writes a token when there is space and lets every reader
+read and commit it, i.e. the work done per token on a fan-out outport.
+ReferenceFIFO is the FIFO as it was before reader slots and the cached
+slowest reader position were introduced.
+"""
+
+import argparse
+
+from calvin.benchmarks import measure, report
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.fifo import FIFO
+
+
+class ReferenceFIFO(object):
+
+    def __init__(self, length):
+        super(ReferenceFIFO, self).__init__()
+        self.fifo = [Token(0)] * length
+        self.N = length
+        self.readers = set()
+        self.write_pos = 0
+        self.read_pos = {}
+        self.tentative_read_pos = {}
+
+    def __len__(self):
+        return self.write_pos - min(self.read_pos.values() or [0])
+
+    def add_reader(self, reader):
+        if not isinstance(reader, basestring):
+            raise Exception('Not a string: %s' % reader)
+        if reader not in self.readers:
+            self.read_pos[reader] = 0
+            self.tentative_read_pos[reader] = 0
+            self.readers.add(reader)
+
+    def can_write(self):
+        last_readpos = min(self.read_pos.values() or [0])
+        return not (self.write_pos + 1) % self.N == last_readpos % self.N
+
+    def write(self, data):
+        if not self.can_write():
+            return False
+        write_pos = self.write_pos
+        self.fifo[write_pos % self.N] = data
+        self.write_pos = write_pos + 1
+        return True
+
+    def available_slots(self):
+        last_readpos = min(self.read_pos.values() or [0])
+        return self.N - ((self.write_pos - last_readpos) % self.N) - 1
+
+    def available_tokens(self, reader):
+        if not isinstance(reader, basestring):
+            raise Exception('Not a string: %s' % reader)
+        if reader not in self.readers:
+            raise Exception("No reader")
+        return self.write_pos - self.tentative_read_pos[reader]
+
+    def can_read(self, reader):
+        if not isinstance(reader, basestring):
+            raise Exception('Not a string: %s' % reader)
+        if reader not in self.readers:
+            raise Exception("No reader")
+        return not self.tentative_read_pos[reader] == self.write_pos
+
+    def read(self, reader):
+        if not isinstance(reader, basestring):
+            raise Exception('Not a string: %s' % reader)
+        if reader not in self.readers:
+            raise Exception("Unknown reader: '%s'" % reader)
+        if not self.can_read(reader):
+            return None
+        read_pos = self.tentative_read_pos[reader]
+        data = self.fifo[read_pos % self.N]
+        self.tentative_read_pos[reader] = read_pos + 1
+        return data
+
+    def commit_reads(self, reader, commit=True):
+        if commit:
+            self.read_pos[reader] = self.tentative_read_pos[reader]
+        else:
+            self.tentative_read_pos[reader] = self.read_pos[reader]
+
+
+def token_round(f, readers, token):
+    # What an actor firing and the endpoints do per token
+    if f.available_slots() > 0 and f.can_write():
+        f.write(token)
+    for reader in readers:
+        if f.available_tokens(reader) > 0:
+            f.read(reader)
+            f.commit_reads(reader)
+    return len(f)
+
+
+def writer_checks(f):
+    # What the scheduler and the condition checks of the producing actor do
+    return f.can_write() and f.available_slots() > 0 and len(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=20000)
+    parser.add_argument('--readers', type=int, nargs='+', default=[1, 8, 64])
+    parser.add_argument('--size', type=int, default=5)
+    args = parser.parse_args()
+
+    token = Token(1)
+    rows = []
+    checks = []
+    for n in args.readers:
+        readers = ["reader-%d" % i for i in range(n)]
+        results = []
+        for fifo_class in (ReferenceFIFO, FIFO):
+            f = fifo_class(args.size)
+            for reader in readers:
+                f.add_reader(reader)
+            results.append(measure(token_round, args.rounds, f, readers, token))
+        f = FIFO(args.size, validate=True)
+        for reader in readers:
+            f.add_reader(reader)
+        results.append(measure(token_round, args.rounds, f, readers, token))
+        rows.append((n, results[0], results[1], results[2], results[0] / results[1]))
+        results = []
+        for fifo_class in (ReferenceFIFO, FIFO):
+            f = fifo_class(args.size)
+            for reader in readers:
+                f.add_reader(reader)
+            results.append(measure(writer_checks, args.rounds, f))
+        checks.append((n, results[0], results[1], results[0] / results[1]))
+    report("FIFO token round (us per token)",
+           ("readers", "reference", "slots", "slots+validate", "speedup"), rows)
+    report("FIFO writer checks (us per check)", ("readers", "reference", "slots", "speedup"), checks)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cost of the ids of short lived things: uuid4 based ids (calvinuuid.uuid)
+versus a process part and a counter (calvinuuid.ephemeral).
+
+Id: one id. CalvinCB: constructing a callback, which gets an id, as done
+for most callbacks registered or passed on in the runtime.
+"""
+
+import argparse
+
+from calvin.benchmarks import measure, report
+from calvin.utilities import calvin_callback, calvinuuid
+
+
+def callback():
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=100000)
+    args = parser.parse_args()
+
+    ephemeral = calvinuuid.ephemeral
+    rows = []
+    for name, generator in (("uuid", calvinuuid.uuid), ("ephemeral", ephemeral)):
+        # CalvinCB takes its id from calvinuuid.ephemeral
+        calvinuuid.ephemeral = generator
+        rows.append((name, measure(generator, args.rounds, "MSGID"),
+                     measure(calvin_callback.CalvinCB, args.rounds, callback)))
+    calvinuuid.ephemeral = ephemeral
+    report("Microseconds per call", ("ids", "id", "CalvinCB"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Scheduler wake ups and CPU time of a node on the reactor.
+
+Idle: a node with only idle actors (connected in pairs) runs for a while,
+with a fixed 1 s idle heartbeat (the previous scheduler), with the idle
+wait doubling up to 10 s, and woken by events only.
+
+Active: a token circulates in a ring of actors, comparing one reactor
+round-trip per scheduler loop (burst 0) with back to back loops.
+
+Every configuration runs in its own process since the reactor can only
+be started once.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from calvin.benchmarks import BenchNode, new_actor, connect_local, report
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.scheduler import Scheduler
+from calvin.runtime.south.monitor import Event_Monitor
+from calvin.runtime.south.plugins.async import async
+
+# (name, first idle wait, max idle wait)
+IDLE = [("fixed 1 s", 1.0, 1.0), ("doubling to 10 s", 1.0, 10.0), ("events only", None, 0)]
+ACTIVE = [("burst 0", 0.0), ("burst 5 ms", 0.005)]
+
+
+def run(mode, value, actors, seconds):
+    node = BenchNode()
+    if mode == 'idle':
+        for _ in range(actors / 2):
+            a = new_actor(node, 'std.Identity')
+            b = new_actor(node, 'std.Identity')
+            connect_local(a.outports['token'], b.inports['token'])
+            connect_local(b.outports['token'], a.inports['token'])
+    else:
+        ring = [new_actor(node, 'std.Identity') for _ in range(3)]
+        for a, b in zip(ring, ring[1:] + ring[:1]):
+            connect_local(a.outports['token'], b.inports['token'])
+        ring[0].outports['token'].write_token(Token(1))
+    sched = Scheduler(node, node.am, Event_Monitor())
+    if mode == 'idle':
+        sched._idle_min = sched._idle_wait = value[0]
+        sched._idle_max = value[1]
+    else:
+        sched._burst = value
+    loops = [0]
+    _loop = sched._loop
+
+    def counted(all_):
+        loops[0] += 1
+        return _loop(all_)
+
+    sched._loop = counted
+    sched.trigger_loop()
+    async.DelayedCall(seconds, async.stop_ioloop)
+    start_cpu = sum(os.times()[:2])
+    start = time.time()
+    sched.run()
+    elapsed = time.time() - start
+    cpu = sum(os.times()[:2]) - start_cpu
+    fired = sum(node.metering.actors_aggregated.get(actor_id, {}).get('donothing', 0) for actor_id in node.am.actors)
+    print json.dumps({'loops': loops[0], 'cpu': cpu, 'elapsed': elapsed, 'fired': fired})
+
+
+def child(mode, value, actors, seconds):
+    output = subprocess.check_output([sys.executable, '-m', 'calvin.benchmarks.idle_bench', '--run', mode, json.dumps(value),
+                                      '--actors', str(actors), '--seconds', str(seconds)],
+                                     stderr=open(os.devnull, 'w'))
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--actors', type=int, default=5000)
+    parser.add_argument('--seconds', type=float, default=30.0)
+    parser.add_argument('--active-seconds', type=float, default=3.0)
+    parser.add_argument('--run', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run[0], json.loads(args.run[1]), args.actors, args.seconds)
+        return
+
+    rows = []
+    for name, first, most in IDLE:
+        result = child('idle', (first, most), args.actors, args.seconds)
+        rows.append((name, result['loops'], result['cpu'], 100.0 * result['cpu'] / result['elapsed']))
+    report("Idle node with %d actors for %.0f s" % (args.actors, args.seconds),
+           ("idle wait", "loops", "cpu s", "cpu %"), rows)
+    rows = []
+    for name, value in ACTIVE:
+        result = child('active', value, 3, args.active_seconds)
+        rows.append((name, result['loops'] / result['elapsed'], result['fired'] / result['elapsed'],
+                     100.0 * result['cpu'] / result['elapsed']))
+    report("Token circulating in a ring of 3 actors", ("loops", "loops/s", "firings/s", "cpu %"), rows)
+
+
+if __name__ == '__main__':
+    main()
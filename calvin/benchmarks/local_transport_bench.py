@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Same host links over calvinlocal (Unix domain sockets) versus calvinip on
+the loopback interface.
+
+A stream of token messages from one transport to another, each
+acknowledged by a reply as a token transfer is, with a window of
+unacknowledged messages. Small tokens are an int, large tokens a 64 kB
+bytearray, which travels as a binary segment.
+
+Every transport and backend runs in its own process, the framework is
+selected with the CALVIN_GLOBAL_FRAMEWORK environment variable.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from calvin.benchmarks import report
+from calvin.runtime.south.plugins.async import async
+from calvin.runtime.south.plugins.transports import calvinlocal
+from calvin.runtime.south.plugins.transports.calvinip import calvinip_transport
+from calvin.runtime.south.plugins.transports.calvinlocal import calvinlocal_transport
+from calvin.utilities.calvin_callback import CalvinCB
+
+BACKENDS = ["twistedimpl", "asyncioimpl"]
+TRANSPORTS = ["calvinip", "calvinlocal"]
+
+
+class Stream(object):
+
+    def __init__(self, transport, seconds, window, size):
+        super(Stream, self).__init__()
+        self.transport_name = transport
+        self.seconds = seconds
+        self.window = window
+        self.data = bytearray(size) if size else None
+        self.sent = 0
+        self.acked = 0
+        self.start = None
+        callbacks = {'join_finished': [CalvinCB(self._joined)], 'data_received': [CalvinCB(self._received)],
+                     'server_started': [CalvinCB(self._server_started)]}
+        module = calvinlocal_transport if transport == 'calvinlocal' else calvinip_transport
+        self.server = module.CalvinTransportFactory("BENCH-SERVER", callbacks)
+        self.client = module.CalvinTransportFactory("BENCH-CLIENT", callbacks)
+
+    def _server_started(self, server, port):
+        if self.transport_name == 'calvinlocal':
+            self.client.join(calvinlocal.create_uri(port))
+        else:
+            self.client.join("calvinip://127.0.0.1:%d" % port)
+
+    def _joined(self, transport, peer_id, uri, is_orginator):
+        if is_orginator:
+            self.transport = transport
+            self.start = time.time()
+            async.DelayedCall(self.seconds, async.stop_ioloop)
+            while self.sent < self.window:
+                self._send()
+
+    def _send(self):
+        self.sent += 1
+        self.transport.send({'cmd': 'TOKEN', 'sequencenbr': self.sent, 'port_id': "PORT", 'peer_port_id': "PEER",
+                             'token': {'type': 'Token', 'data': self.data or self.sent}})
+
+    def _received(self, transport, msg):
+        if msg['cmd'] == 'TOKEN':
+            transport.send({'cmd': 'TOKEN_REPLY', 'sequencenbr': msg['sequencenbr'], 'port_id': "PEER",
+                            'peer_port_id': "PORT", 'value': 'ACK'})
+        else:
+            self.acked += 1
+            self._send()
+
+    def run(self):
+        path = os.path.join(tempfile.gettempdir(), "calvin-bench-%d.sock" % os.getpid())
+        if self.transport_name == 'calvinlocal':
+            self.server.listen(calvinlocal.create_uri(path))
+        else:
+            self.server.listen("calvinip:127.0.0.1:0")
+        async.run_ioloop()
+        if os.path.exists(path):
+            os.unlink(path)
+        return {'rate': self.acked / (time.time() - self.start)}
+
+
+def child(backend, transport, seconds, window, size):
+    env = dict(os.environ, CALVIN_GLOBAL_FRAMEWORK=json.dumps(backend))
+    output = subprocess.check_output([sys.executable, '-m', 'calvin.benchmarks.local_transport_bench', '--run',
+                                      transport, str(seconds), str(window), str(size)],
+                                     env=env, stderr=open(os.devnull, 'w'))
+    return json.loads(output.strip().splitlines()[-1])['rate']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--run', nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        transport, seconds, window, size = args.run
+        print json.dumps(Stream(transport, float(seconds), int(window), int(size)).run())
+        return
+
+    for title, size in (("Small tokens", 0), ("64 kB tokens", 65536)):
+        rows = []
+        for backend in BACKENDS:
+            for transport in TRANSPORTS:
+                rows.append(["%s %s" % (backend, transport)] +
+                            [child(backend, transport, args.seconds, window, size) for window in (1, 16)])
+        report("%s, acknowledged messages/s" % title, ("link", "window 1", "window 16"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Latency of a control actor sharing the scheduler with bulk actors.
+
+A control token arrives while the bulk actors are firing (each bulk firing
+takes --work ms). Compares all actors in the normal class with the control
+actor as realtime and the bulk actors as bulk, capped by the bulk budget.
+"""
+
+import argparse
+import time
+
+from calvin.actor.actor import ActionResult
+from calvin.benchmarks import BenchNode, new_actor, connect_local, report
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.scheduler import Scheduler
+
+
+def busy(seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        pass
+
+
+def run(bulk_count, work, loops, classes):
+    node = BenchNode()
+    src = new_actor(node, 'std.Identity')
+    control = new_actor(node, 'std.Identity')
+    sink = new_actor(node, 'std.Identity')
+    connect_local(src.outports['token'], control.inports['token'])
+    connect_local(control.outports['token'], sink.inports['token'])
+    sched = Scheduler(node, node.am, None)
+    sched._readiness = False
+    arrivals = []
+    latencies = []
+
+    def bulk_fire(first):
+        if first:
+            # The control token arrives during the bulk work
+            src.outports['token'].write_token(Token(1))
+            arrivals.append(time.time())
+        busy(work)
+        return ActionResult(did_fire=True)
+
+    bulk = [new_actor(node, 'std.Identity') for _ in range(bulk_count)]
+    for index, actor in enumerate(bulk):
+        # Connected in a ring to be enabled, the work is simulated
+        connect_local(actor.outports['token'], bulk[index - 1].inports['token'])
+        actor.fire = lambda first=(index == 0): bulk_fire(first)
+        if classes:
+            actor.scheduling_set('bulk')
+    if classes:
+        control.scheduling_set('realtime', work)
+
+    control_fire = control.fire
+
+    def timed_fire():
+        result = control_fire()
+        if result.did_fire:
+            latencies.append(time.time() - arrivals.pop(0))
+        while sink.inports['token'].read_token() is not None:
+            pass
+        return result
+
+    control.fire = timed_fire
+    for _ in range(loops):
+        sched.fire_actors(None)
+    latencies.sort()
+    n = len(latencies)
+    return 1000.0 * latencies[n // 2], 1000.0 * latencies[n * 99 // 100], 1000.0 * latencies[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--loops', type=int, default=200)
+    parser.add_argument('--work', type=float, default=1.0)
+    parser.add_argument('--bulk', type=int, nargs='+', default=[5, 20, 50])
+    args = parser.parse_args()
+
+    rows = []
+    for bulk_count in args.bulk:
+        flat = run(bulk_count, args.work / 1000.0, args.loops, False)
+        classes = run(bulk_count, args.work / 1000.0, args.loops, True)
+        rows.append((bulk_count,) + flat + classes)
+    report("Control actor trigger to fire latency (ms)",
+           ("bulk actors", "flat p50", "flat p99", "flat max", "classes p50", "classes p99", "classes max"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Token cost of a pipeline of local connections.
+
+A token is written to the first stage of a chain of std.Identity actors,
+every stage is fired once and the token is read at the end. The endpoint
+rows move the token through the same connections without firing actors.
+SyncingLocalInEndpoint is the local inport endpoint as it was before the
+shared fifo fast path, mirroring positions into the inport fifo on every
+read.
+
+The scheduler rows sweep the enabled actors (in the actor manager's order)
+until the token has passed the pipeline, with and without fusing the chain.
+"""
+
+import argparse
+
+from calvin.benchmarks import BenchNode, new_actor, measure, report
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.fusion import Fusion
+from calvin.runtime.north.scheduler import Scheduler
+from calvin.runtime.south import endpoint
+
+
+class SyncingLocalInEndpoint(endpoint.LocalInEndpoint):
+
+    def read_token(self):
+        if self.fifo_mismatch:
+            self._fifo_mismatch_fix()
+
+        if self.data_in_local_fifo:
+            token = self.port.fifo.read(self.port.id)
+            if token:
+                self.port.fifo.commit_reads(self.port.id, True)
+                return token
+            self.data_in_local_fifo = False
+
+        token = self.peer_port.fifo.read(self.port.id)
+        self.peer_port.fifo.commit_reads(self.port.id, token is not None)
+
+        self._sync_local_fifos()
+        return token
+
+    def available_tokens(self):
+        if self.fifo_mismatch:
+            self._fifo_mismatch_fix()
+
+        tokens = 0
+        if self.data_in_local_fifo:
+            tokens += self.port.fifo.available_tokens(self.port.id)
+            if tokens == 0:
+                self.data_in_local_fifo = False
+        tokens += self.peer_port.fifo.available_tokens(self.port.id)
+        return tokens
+
+
+def setup(node, stages, in_endpoint):
+    """Chain stages actors, returns the actors, the first outport is written to by the benchmark"""
+    source = new_actor(node, 'std.Identity')
+    actors = [new_actor(node, 'std.Identity') for _ in range(stages)]
+    for a, b in zip([source] + actors, actors):
+        outport, inport = a.outports['token'], b.inports['token']
+        inport.attach_endpoint(in_endpoint(inport, outport))
+        outport.attach_endpoint(endpoint.LocalOutEndpoint(outport, inport))
+    sink = new_actor(node, 'std.Identity')
+    outport, inport = actors[-1].outports['token'], sink.inports['token']
+    inport.attach_endpoint(in_endpoint(inport, outport))
+    outport.attach_endpoint(endpoint.LocalOutEndpoint(outport, inport))
+    return source, actors, sink
+
+
+def fire_pipeline(source, actors, sink):
+    source.outports['token'].write_token(Token(1))
+    for a in actors:
+        a.fire()
+    sink.inports['token'].read_token()
+
+
+def move_pipeline(source, actors, sink):
+    source.outports['token'].write_token(Token(1))
+    for a in actors:
+        inport = a.inports['token']
+        if inport.available_tokens():
+            a.outports['token'].write_token(inport.read_token())
+    sink.inports['token'].read_token()
+
+
+def sweep_pipeline(sched, source, sink):
+    source.outports['token'].write_token(Token(1))
+    passes = 0
+    while sink.inports['token'].read_token() is None:
+        sched.fire_actors(None)
+        passes += 1
+    return passes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tokens', type=int, default=5000)
+    parser.add_argument('--stages', type=int, default=10)
+    args = parser.parse_args()
+
+    rows = []
+    for name, run in (("actors", fire_pipeline), ("endpoints", move_pipeline)):
+        times = []
+        for in_endpoint in (SyncingLocalInEndpoint, endpoint.LocalInEndpoint):
+            node = BenchNode()
+            times.append(measure(run, args.tokens, *setup(node, args.stages, in_endpoint)))
+        rows.append((name, times[0], times[1], times[0] / times[1]))
+    report("%d stage local pipeline (us per token)" % args.stages, ("fired", "syncing", "shared", "speedup"), rows)
+
+    rows = []
+    for fused in (False, True):
+        node = BenchNode()
+        source, actors, sink = setup(node, args.stages, endpoint.LocalInEndpoint)
+        sched = Scheduler(node, node.am, None)
+        sched._fusion = Fusion() if fused else None
+        passes = sweep_pipeline(sched, source, sink)
+        rows.append(("fused" if fused else "sweep", passes, measure(sweep_pipeline, args.tokens / 10, sched, source, sink)))
+    report("%d stage local pipeline, scheduler sweeps" % args.stages, ("scheduler", "passes", "us per token"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Scheduler loop cost as a function of the number of idle actors.
+
+Compares a full sweep over all enabled actors with a readiness scheduler
+loop where only the actor that got a token is fired.
+"""
+
+import argparse
+
+from calvin.benchmarks import BenchNode, new_actor, connect_local, measure, report
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.scheduler import Scheduler
+
+
+def setup(node, idle):
+    """Create idle actors in connected pairs, and one source/sink pair that gets the tokens"""
+    for _ in range(idle / 2):
+        a = new_actor(node, 'std.Identity')
+        b = new_actor(node, 'std.Identity')
+        connect_local(a.outports['token'], b.inports['token'])
+        connect_local(b.outports['token'], a.inports['token'])
+    active = [new_actor(node, 'std.Identity') for _ in range(3)]
+    for a, b in zip(active, active[1:] + active[:1]):
+        connect_local(a.outports['token'], b.inports['token'])
+    return active
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--loops', type=int, default=200)
+    parser.add_argument('--idle', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    args = parser.parse_args()
+
+    rows = []
+    for idle in args.idle:
+        node = BenchNode()
+        active = setup(node, idle)
+        src = active[1]
+        sched = Scheduler(node, node.am, None)
+
+        def token_arrived(ready_set):
+            # A token arrives at the source, fire and then drain all tokens from the active actors
+            active[0].outports['token'].write_token(Token(1))
+            sched.fire_actors(ready_set)
+            for a in active:
+                while a.inports['token'].read_token() is not None:
+                    pass
+
+        sched._readiness = False
+        sweep = measure(token_arrived, args.loops, None)
+        sched._readiness = True
+        ready = measure(token_arrived, args.loops, set([src.id]))
+        rows.append((idle, sweep, ready, sweep / ready))
+    report("Scheduler loop cost (us per loop)", ("idle actors", "sweep", "readiness", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Token throughput over a tunnel between two port managers.
+
+The link is simulated by a message queue where each tunnel message is JSON
+encoded and decoded as on a real link, so the cost per message (coding and
+dispatch) is included but no socket or reactor is involved. The transfer is
+run with a peer without token capabilities (one TOKEN per message) and with
+a peer supporting TOKEN_BATCH, with and without CREDIT flow control.
+The congested case has a consumer that only reads one token per round,
+where the inport fifo is full most of the time.
+
+The monitor rows give the cost of a scheduler loop's Event_Monitor.loop
+with many remote connections of which one has a token to send, for the
+dirty set and for PollingMonitor, visiting every endpoint as it used to.
+"""
+
+import argparse
+import json
+import time
+from collections import deque
+from mock import Mock
+
+from calvin.benchmarks import measure, report
+from calvin.actor.actorport import InPort, OutPort
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.fifo import FIFO
+from calvin.runtime.north.portmanager import PortManager
+from calvin.runtime.south import endpoint
+from calvin.runtime.south.monitor import Event_Monitor
+
+
+class QueueTunnel(object):
+
+    """Tunnel end delivering JSON coded messages to the peer port manager via a shared queue"""
+
+    def __init__(self, queue, id="TUNNEL"):
+        super(QueueTunnel, self).__init__()
+        self.queue = queue
+        self.id = id
+        self.peer = None
+        self.messages = 0
+        self.tokens = 0
+
+    def send(self, payload):
+        self.messages += 1
+        if payload['cmd'] == 'TOKEN':
+            self.tokens += 1
+        elif payload['cmd'] == 'TOKEN_BATCH':
+            self.tokens += len(payload['tokens'])
+        self.queue.append((self.peer, json.dumps({'cmd': 'TUNNEL_DATA', 'value': payload, 'tunnel_id': self.id})))
+
+    def rtt_sample(self, rtt):
+        pass
+
+    def retransmitted(self, count):
+        pass
+
+
+class Owner(object):
+
+    def __init__(self, id):
+        super(Owner, self).__init__()
+        self.id = id
+        self.name = id
+
+    def did_connect(self, port):
+        pass
+
+
+def trigger_loop(delay=0, actor_ids=None):
+    pass
+
+
+def port_manager(node_id):
+    node = Mock()
+    node.id = node_id
+    return PortManager(node, Mock())
+
+
+def setup(fifo_size, capabilities):
+    queue = deque()
+    pm_out = port_manager("NODE-OUT")
+    pm_in = port_manager("NODE-IN")
+    tunnel_out = QueueTunnel(queue)
+    tunnel_in = QueueTunnel(queue)
+    tunnel_out.peer = (pm_in, tunnel_in)
+    tunnel_in.peer = (pm_out, tunnel_out)
+
+    outport = OutPort("token", Owner("producer"))
+    inport = InPort("token", Owner("consumer"))
+    outport.fifo = FIFO(fifo_size)
+    inport.fifo = FIFO(fifo_size)
+    inport.fifo.add_reader(inport.id)
+    pm_out.ports[outport.id] = outport
+    pm_in.ports[inport.id] = inport
+    out_endp = endpoint.TunnelOutEndpoint(outport, tunnel_out, "NODE-IN", inport.id, trigger_loop, capabilities,
+                                          endpoint.credit_limit(inport.fifo))
+    in_endp = endpoint.TunnelInEndpoint(inport, tunnel_in, "NODE-OUT", outport.id, trigger_loop, capabilities)
+    outport.attach_endpoint(out_endp)
+    inport.attach_endpoint(in_endp)
+    return queue, outport, inport, out_endp, tunnel_out
+
+
+def transfer(count, fifo_size, capabilities, reads_per_round=None):
+    """Transfer count tokens, returns (tokens per second, messages per token, tokens sent per token)"""
+    queue, outport, inport, out_endp, tunnel_out = setup(fifo_size, capabilities)
+    token = Token(1)
+    written = 0
+    received = 0
+    start = time.time()
+    while received < count:
+        while written < count and outport.fifo.can_write():
+            outport.write_token(token)
+            written += 1
+        out_endp.communicate()
+        while queue:
+            (pm, tunnel), data = queue.popleft()
+            pm.tunnel_recv_handler(tunnel, json.loads(data)['value'])
+        reads = 0
+        # Like an actor, check for tokens before reading
+        while reads != reads_per_round and inport.endpoint.available_tokens() > 0:
+            inport.endpoint.read_token()
+            received += 1
+            reads += 1
+    elapsed = time.time() - start
+    return count / elapsed, float(tunnel_out.messages) / count, float(tunnel_out.tokens) / count
+
+
+class PollingMonitor(Event_Monitor):
+
+    def loop(self, scheduler):
+        return any([endp.communicate() for endp in self.out_endpoints])
+
+
+def monitor_setup(monitor, connections):
+    """Returns the outports of connections registered tunnel out endpoints"""
+    ports = []
+    for _ in range(connections):
+        port = OutPort("out", Mock())
+        endp = endpoint.TunnelOutEndpoint(port, Mock(), "NODE", "PEER-PORT", Mock())
+        monitor.register_out_endpoint(endp)
+        port.attach_endpoint(endp)
+        ports.append(port)
+    monitor.loop(None)
+    return ports
+
+
+def monitor_round(monitor, port):
+    port.write_token(Token(1))
+    monitor.loop(None)
+    port.fifo.commit_reads("PEER-PORT", True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tokens', type=int, default=20000)
+    parser.add_argument('--congested-tokens', type=int, default=100)
+    parser.add_argument('--fifo-sizes', type=int, nargs='+', default=[5, 16, 64])
+    args = parser.parse_args()
+
+    protocols = (("TOKEN", []), ("TOKEN_BATCH", ['TOKEN_BATCH']), ("BATCH+CREDIT", endpoint.TOKEN_CAPABILITIES))
+    for title, count, reads_per_round in (("Tunnel token throughput", args.tokens, None),
+                                          ("Congested tunnel, one read per round", args.congested_tokens, 1)):
+        rows = []
+        for size in args.fifo_sizes:
+            for name, capabilities in protocols:
+                rate, msgs, sent = transfer(count, size, capabilities, reads_per_round)
+                rows.append((size, name, int(rate), msgs, sent))
+        report(title, ("fifo size", "protocol", "tokens/s", "msgs/token", "sent/token"), rows)
+
+    rows = []
+    for connections in (10, 100, 500):
+        times = []
+        for monitor in (PollingMonitor(), Event_Monitor()):
+            ports = monitor_setup(monitor, connections)
+            times.append(measure(monitor_round, 1000, monitor, ports[0]))
+        rows.append((connections, times[0], times[1], times[0] / times[1]))
+    report("Monitor loop with one active connection (us)", ("connections", "polling", "dirty set", "speedup"), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -36,8 +36,8 @@ class Sys(object):
                 # This is a package, ignore it
                 pass
 
-    def scheduler_wakeup(self):
-        self._node.sched.trigger_loop()
+    def scheduler_wakeup(self, actor_ids=None):
+        self._node.sched.trigger_loop(actor_ids=actor_ids)
 
     def _loadmodule(self, modulename):
         if self.modules[modulename]['module'] or self.modules[modulename]['error']:
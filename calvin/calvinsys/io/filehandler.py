@@ -23,14 +23,21 @@ if 'tests.pytest' not in sys.modules:
 else:
     import tests.calvin_file as filedescriptor
 
+from calvin.utilities.calvin_callback import CalvinCB
 from calvin.utilities.calvinlogger import get_logger
 
 _log = get_logger(__name__)
 
 
+def _trigger(node, actor):
+    if actor is None:
+        return node.sched.trigger_loop
+    return CalvinCB(node.sched.trigger_loop, actor_ids=[actor.id])
+
+
 class File(object):
-    def __init__(self, node, fname, mode):
-        self.fd = filedescriptor.FD(node.sched.trigger_loop, fname, mode)
+    def __init__(self, node, fname, mode, actor=None):
+        self.fd = filedescriptor.FD(_trigger(node, actor), fname, mode)
 
     def write(self, data):
         self.fd.write(data)
@@ -55,8 +62,8 @@ class File(object):
 
 
 class StdIn(File):
-    def __init__(self, node):
-        self.fd = filedescriptor.FDStdIn(node.sched.trigger_loop)
+    def __init__(self, node, actor=None):
+        self.fd = filedescriptor.FDStdIn(_trigger(node, actor))
 
 
 def access_allowed(filename):
@@ -64,9 +71,10 @@ def access_allowed(filename):
 
 
 class FileHandler(object):
-    def __init__(self, node):
+    def __init__(self, node, actor=None):
         super(FileHandler, self).__init__()
         self.node = node
+        self.actor = actor
 
     def open(self, fname, mode):
         if 'r' in mode and not os.path.exists(fname):
@@ -75,10 +83,10 @@ class FileHandler(object):
         if 'w' in mode and not access_allowed(fname):
             raise Exception("Cannot create file")
 
-        return File(self.node, fname, mode)
+        return File(self.node, fname, mode, self.actor)
 
     def open_stdin(self):
-        return StdIn(self.node)
+        return StdIn(self.node, self.actor)
 
     def close(self, fp):
         fp.close()
@@ -88,4 +96,4 @@ def register(node, actor, io=None):
     """
         Called when the system object is first created.
     """
-    return FileHandler(node)
+    return FileHandler(node, actor)
@@ -50,6 +50,7 @@ class Analyzer(object):
         self.constants = {}
         self.app_info = {}
         self.connections = {}
+        self.port_properties = {}
         self.actors = {}
         self.verify = verify
         self.actorstore = ActorStore()
@@ -81,6 +82,8 @@ class Analyzer(object):
             _log.exception(e)
             valid = False
         self.app_info = {'valid': valid, 'actors': self.actors, 'connections': self.connections}
+        if self.port_properties:
+            self.app_info['port_properties'] = self.port_properties
         if self.script_name:
             self.app_info['name'] = self.script_name
 
@@ -125,6 +128,11 @@ class Analyzer(object):
         else:
             self.connections.setdefault(src_actor_port, []).append(dst_actor_port)
 
+    def add_port_properties(self, port_dir, actor_port, properties):
+        ports = actor_port if type(actor_port) is list else [actor_port]
+        for port in ports:
+            self.port_properties.setdefault(port_dir, {}).setdefault(port, {}).update(properties)
+
     def expand_literals(self, structure, argd):
         # Check for literals on inports...
         const_count = 1
@@ -164,7 +172,7 @@ class Analyzer(object):
             args[arg_name] = arg_value
         return args
 
-    def create_connection(self, c, namespace, in_mappings, out_mappings):
+    def create_connection(self, c, namespace, in_mappings, out_mappings, argd):
         # export_mapping = {'in':{}, 'out':{}}
         # Get the full port name.
         # If src/dst is ".", the full port name is component port name at caller level
@@ -176,6 +184,12 @@ class Analyzer(object):
         dst_actor_port = in_mappings.get(dst_actor_port, dst_actor_port)
         src_actor_port = out_mappings.get(src_actor_port, src_actor_port)
 
+        # Port properties are kept for the actor ports, also when given on component ports
+        if c['src'] != '.' and 'src_port_properties' in c:
+            self.add_port_properties('out', src_actor_port, self.resolve_arguments(c['src_port_properties'], argd))
+        if c['dst'] != '.' and 'dst_port_properties' in c:
+            self.add_port_properties('in', dst_actor_port, self.resolve_arguments(c['dst_port_properties'], argd))
+
         # Add connections if possible, or export a port mapping for calling level
         if c['src'] != '.' and c['dst'] != '.':
             self.add_connection(src_actor_port, dst_actor_port)
@@ -236,7 +250,7 @@ class Analyzer(object):
         export_in_mappings = {}
         export_out_mappings = {}
         for c in structure['connections']:
-            in_mapping, out_mapping = self.create_connection(c, namespace, in_mappings, out_mappings)
+            in_mapping, out_mapping = self.create_connection(c, namespace, in_mappings, out_mappings, argd)
             for p in in_mapping:
                 export_in_mappings.setdefault(p, []).extend(in_mapping[p])
             export_out_mappings.update(out_mapping)
@@ -134,22 +134,31 @@ def p_assignment(p):
 def p_link(p):
     """link : port GT port
             | argument GT port"""
-    kind, value = p[1]
+    kind, value = p[1][:2]
     (src, port) = value if kind == 'PORT' else (None, (kind, value))
     d = {}
     d['src'] = src
     d['src_port'] = port
-    _, (dst, port) = p[3]
+    if kind == 'PORT' and p[1][2]:
+        d['src_port_properties'] = p[1][2]
+    _, (dst, port), properties = p[3]
     d['dst'] = dst
     d['dst_port'] = port
+    if properties:
+        d['dst_port_properties'] = properties
     d['dbg_line'] = p.lineno(2)
     p[0] = ('link', d)
 
 
 def p_port(p):
     """port : IDENTIFIER DOT IDENTIFIER
+            | IDENTIFIER DOT IDENTIFIER LBRACK named_args RBRACK
             | DOT IDENTIFIER"""
-    p[0] = ('PORT', (p[1], p[2] if len(p) == 3 else p[3]))
+    # Port properties, e.g. src.out[fifo_size=20], are named arguments
+    if len(p) == 3:
+        p[0] = ('PORT', (p[1], p[2]), {})
+    else:
+        p[0] = ('PORT', (p[1], p[3]), p[5] if len(p) == 7 else {})
 
 
 def p_named_args(p):
@@ -1,13 +1,14 @@
 
 # parsetab.py
 # This file is automatically generated. Do not edit.
-_tabversion = '3.8'
+# pylint: disable=W,C,R
+_tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = '861D35F55FA6B91D5E8BF508730A3692'
+_lr_signature = 'COLON COMMA COMPONENT DEFINE DOCSTRING DOT EQ FALSE GT IDENTIFIER LBRACE LBRACK LPAREN NULL NUMBER RARROW RBRACE RBRACK RPAREN STRING TRUEscript : constdefs compdefs opt_programconstdefs :\n                 | constdefs constdef\n                 | constdefconstdef : DEFINE IDENTIFIER EQ argumentcompdefs :\n                | compdefs compdef\n                | compdefcompdef : COMPONENT qualified_name LPAREN identifiers RPAREN identifiers RARROW identifiers LBRACE docstring program RBRACEdocstring :\n                 | DOCSTRING opt_program :\n                   | programprogram : program statement\n               | statement statement : assignment\n                 | linkassignment : IDENTIFIER COLON qualified_name LPAREN named_args RPARENlink : port GT port\n            | argument GT portport : IDENTIFIER DOT IDENTIFIER\n            | IDENTIFIER DOT IDENTIFIER LBRACK named_args RBRACK\n            | DOT IDENTIFIERnamed_args :\n                  | named_args named_arg COMMA\n                  | named_args named_argnamed_arg : IDENTIFIER EQ argumentargument : value\n                | IDENTIFIERvalue : dictionary\n             | array\n             | bool\n             | null\n             | NUMBER\n             | STRINGbool : TRUE\n            | FALSEnull : NULLdictionary : LBRACE members RBRACEmembers :\n                | members member COMMA\n                | members membermember : STRING COLON valuevalues :\n                | values value COMMA\n                | values valuearray :  LBRACK values RBRACKidentifiers :\n                   | identifiers IDENTIFIER COMMA\n                   | identifiers IDENTIFIERqualified_name : qualified_name DOT IDENTIFIER\n                      | IDENTIFIER'
     
-_lr_action_items = {'NUMBER':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,63,64,71,75,76,78,79,80,81,],[-2,-6,-4,-8,28,-3,-29,-30,-32,-35,-34,-37,-7,28,-15,-31,-16,-33,-17,-36,-43,-27,28,-22,-14,28,-5,-28,-20,-19,-21,-38,-46,-45,28,-44,-18,28,-10,28,-11,28,-9,]),'NULL':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,63,64,71,75,76,78,79,80,81,],[-2,-6,-4,-8,20,-3,-29,-30,-32,-35,-34,-37,-7,20,-15,-31,-16,-33,-17,-36,-43,-27,20,-22,-14,20,-5,-28,-20,-19,-21,-38,-46,-45,20,-44,-18,20,-10,20,-11,20,-9,]),'TRUE':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,63,64,71,75,76,78,79,80,81,],[-2,-6,-4,-8,16,-3,-29,-30,-32,-35,-34,-37,-7,16,-15,-31,-16,-33,-17,-36,-43,-27,16,-22,-14,16,-5,-28,-20,-19,-21,-38,-46,-45,16,-44,-18,16,-10,16,-11,16,-9,]),'DOT':([0,2,3,5,7,8,10,11,13,14,15,16,19,20,21,22,23,24,25,27,28,29,31,33,37,38,39,40,45,46,48,49,50,51,52,53,54,57,71,76,78,79,80,81,],[-2,-6,-4,-8,18,-3,36,-51,-29,-30,-32,-35,-34,-37,-7,18,-15,-31,42,-16,-33,-17,-36,-27,18,18,-22,-14,-5,-28,-50,42,-20,-19,36,-21,-38,-46,-18,-10,18,-11,18,-9,]),'RBRACE':([13,14,15,16,19,20,23,24,27,28,29,30,31,39,40,43,50,51,53,54,55,57,62,68,71,80,],[-29,-30,-32,-35,-34,-37,-15,-31,-16,-33,-17,-39,-36,-22,-14,54,-20,-19,-21,-38,-41,-46,-40,-42,-18,81,]),'RPAREN':([13,14,15,16,19,20,24,28,31,33,35,46,47,54,57,60,61,66,67,70,74,77,],[-29,-30,-32,-35,-34,-37,-31,-33,-36,-27,-47,-28,59,-38,-46,-49,-23,-48,71,-25,-24,-26,]),'DOCSTRING':([76,],[79,]),'RARROW':([59,60,65,66,],[-47,-49,69,-48,]),'COLON':([25,56,],[41,63,]),'COMMA':([13,14,15,16,19,20,24,28,31,33,46,54,55,57,58,60,68,70,77,],[-29,-30,-32,-35,-34,-37,-31,-33,-36,-27,-28,-38,62,-46,64,66,-42,74,-26,]),'IDENTIFIER':([0,2,3,4,5,6,7,8,13,14,15,16,18,19,20,21,22,23,24,27,28,29,31,33,34,35,36,37,38,39,40,41,42,45,46,47,50,51,53,54,57,59,60,61,65,66,67,69,70,71,73,74,75,76,77,78,79,80,81,],[-2,-6,-4,9,-8,11,25,-3,-29,-30,-32,-35,39,-34,-37,-7,25,-15,-31,-16,-33,-17,-36,-27,46,-47,48,49,49,-22,-14,11,53,-5,-28,60,-20,-19,-21,-38,-46,-47,-49,-23,60,-48,72,-47,-25,-18,60,-24,46,-10,-26,25,-11,25,-9,]),'DEFINE':([0,2,3,8,13,14,15,16,19,20,24,28,31,33,45,46,54,57,],[4,4,-4,-3,-29,-30,-32,-35,-34,-37,-31,-33,-36,-27,-5,-28,-38,-46,]),'GT':([12,13,14,15,16,17,19,20,24,25,28,31,33,39,53,54,57,],[37,-29,-30,-32,-35,38,-34,-37,-31,-28,-33,-36,-27,-22,-21,-38,-46,]),'STRING':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,30,31,32,33,34,39,40,43,44,45,46,50,51,53,54,55,57,58,62,63,64,68,71,75,76,78,79,80,81,],[-2,-6,-4,-8,19,-3,-29,-30,-32,-35,-34,-37,-7,19,-15,-31,-16,-33,-17,-39,-36,-43,-27,19,-22,-14,56,19,-5,-28,-20,-19,-21,-38,-41,-46,-45,-40,19,-44,-42,-18,19,-10,19,-11,19,-9,]),'RBRACK':([13,14,15,16,19,20,24,28,31,32,44,54,57,58,64,],[-29,-30,-32,-35,-34,-37,-31,-33,-36,-43,57,-38,-46,-45,-44,]),'LPAREN':([10,11,48,52,],[35,-51,-50,61,]),'EQ':([9,72,],[34,75,]),'LBRACE':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,60,63,64,66,69,71,73,75,76,78,79,80,81,],[-2,-6,-4,-8,30,-3,-29,-30,-32,-35,-34,-37,-7,30,-15,-31,-16,-33,-17,-36,-43,-27,30,-22,-14,30,-5,-28,-20,-19,-21,-38,-46,-45,-49,30,-44,-48,-47,-18,76,30,-10,30,-11,30,-9,]),'FALSE':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,63,64,71,75,76,78,79,80,81,],[-2,-6,-4,-8,31,-3,-29,-30,-32,-35,-34,-37,-7,31,-15,-31,-16,-33,-17,-36,-43,-27,31,-22,-14,31,-5,-28,-20,-19,-21,-38,-46,-45,31,-44,-18,31,-10,31,-11,31,-9,]),'COMPONENT':([0,2,3,5,7,8,13,14,15,16,19,20,21,24,28,31,33,45,46,54,57,81,],[-2,6,-4,-8,6,-3,-29,-30,-32,-35,-34,-37,-7,-31,-33,-36,-27,-5,-28,-38,-46,-9,]),'LBRACK':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,63,64,71,75,76,78,79,80,81,],[-2,-6,-4,-8,32,-3,-29,-30,-32,-35,-34,-37,-7,32,-15,-31,-16,-33,-17,-36,-43,-27,32,-22,-14,32,-5,-28,-20,-19,-21,-38,-46,-45,32,-44,-18,32,-10,32,-11,32,-9,]),'$end':([0,1,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,26,27,28,29,31,33,39,40,45,46,50,51,53,54,57,71,81,],[-2,0,-6,-4,-8,-12,-3,-29,-30,-32,-35,-34,-37,-7,-13,-15,-31,-1,-16,-33,-17,-36,-27,-22,-14,-5,-28,-20,-19,-21,-38,-46,-18,-9,]),}
+_lr_action_items = {'NUMBER':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,64,65,73,75,78,79,81,82,83,84,],[-2,-6,-4,-8,28,-3,-30,-31,-33,-36,-35,-38,-7,28,-15,-32,-16,-34,-17,-37,-44,-28,28,-23,-14,28,-5,-29,-20,-19,-21,-39,-47,-46,28,-45,-18,-22,28,-10,28,-11,28,-9,]),'NULL':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,64,65,73,75,78,79,81,82,83,84,],[-2,-6,-4,-8,20,-3,-30,-31,-33,-36,-35,-38,-7,20,-15,-32,-16,-34,-17,-37,-44,-28,20,-23,-14,20,-5,-29,-20,-19,-21,-39,-47,-46,20,-45,-18,-22,20,-10,20,-11,20,-9,]),'TRUE':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,64,65,73,75,78,79,81,82,83,84,],[-2,-6,-4,-8,16,-3,-30,-31,-33,-36,-35,-38,-7,16,-15,-32,-16,-34,-17,-37,-44,-28,16,-23,-14,16,-5,-29,-20,-19,-21,-39,-47,-46,16,-45,-18,-22,16,-10,16,-11,16,-9,]),'DOT':([0,2,3,5,7,8,10,11,13,14,15,16,19,20,21,22,23,24,25,27,28,29,31,33,37,38,39,40,45,46,48,49,50,51,52,53,54,57,73,75,79,81,82,83,84,],[-2,-6,-4,-8,18,-3,36,-52,-30,-31,-33,-36,-35,-38,-7,18,-15,-32,42,-16,-34,-17,-37,-28,18,18,-23,-14,-5,-29,-51,42,-20,-19,36,-21,-39,-47,-18,-22,-10,18,-11,18,-9,]),'RBRACE':([13,14,15,16,19,20,23,24,27,28,29,30,31,39,40,43,50,51,53,54,55,57,63,70,73,75,83,],[-30,-31,-33,-36,-35,-38,-15,-32,-16,-34,-17,-40,-37,-23,-14,54,-20,-19,-21,-39,-42,-47,-41,-43,-18,-22,84,]),'RPAREN':([13,14,15,16,19,20,24,28,31,33,35,46,47,54,57,60,61,67,68,72,77,80,],[-30,-31,-33,-36,-35,-38,-32,-34,-37,-28,-48,-29,59,-39,-47,-50,-24,-49,73,-26,-25,-27,]),'DOCSTRING':([79,],[82,]),'RARROW':([59,60,66,67,],[-48,-50,71,-49,]),'COLON':([25,56,],[41,64,]),'COMMA':([13,14,15,16,19,20,24,28,31,33,46,54,55,57,58,60,70,72,80,],[-30,-31,-33,-36,-35,-38,-32,-34,-37,-28,-29,-39,63,-47,65,67,-43,77,-27,]),'IDENTIFIER':([0,2,3,4,5,6,7,8,13,14,15,16,18,19,20,21,22,23,24,27,28,29,31,33,34,35,36,37,38,39,40,41,42,45,46,47,50,51,53,54,57,59,60,61,62,66,67,68,69,71,72,73,75,76,77,78,79,80,81,82,83,84,],[-2,-6,-4,9,-8,11,25,-3,-30,-31,-33,-36,39,-35,-38,-7,25,-15,-32,-16,-34,-17,-37,-28,46,-48,48,49,49,-23,-14,11,53,-5,-29,60,-20,-19,-21,-39,-47,-48,-50,-24,-24,60,-49,74,74,-48,-26,-18,-22,60,-25,46,-10,-27,25,-11,25,-9,]),'DEFINE':([0,2,3,8,13,14,15,16,19,20,24,28,31,33,45,46,54,57,],[4,4,-4,-3,-30,-31,-33,-36,-35,-38,-32,-34,-37,-28,-5,-29,-39,-47,]),'GT':([12,13,14,15,16,17,19,20,24,25,28,31,33,39,53,54,57,75,],[37,-30,-31,-33,-36,38,-35,-38,-32,-29,-34,-37,-28,-23,-21,-39,-47,-22,]),'STRING':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,30,31,32,33,34,39,40,43,44,45,46,50,51,53,54,55,57,58,63,64,65,70,73,75,78,79,81,82,83,84,],[-2,-6,-4,-8,19,-3,-30,-31,-33,-36,-35,-38,-7,19,-15,-32,-16,-34,-17,-40,-37,-44,-28,19,-23,-14,56,19,-5,-29,-20,-19,-21,-39,-42,-47,-46,-41,19,-45,-43,-18,-22,19,-10,19,-11,19,-9,]),'RBRACK':([13,14,15,16,19,20,24,28,31,32,33,44,46,54,57,58,62,65,69,72,77,80,],[-30,-31,-33,-36,-35,-38,-32,-34,-37,-44,-28,57,-29,-39,-47,-46,-24,-45,75,-26,-25,-27,]),'LPAREN':([10,11,48,52,],[35,-52,-51,61,]),'EQ':([9,74,],[34,78,]),'LBRACE':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,60,64,65,67,71,73,75,76,78,79,81,82,83,84,],[-2,-6,-4,-8,30,-3,-30,-31,-33,-36,-35,-38,-7,30,-15,-32,-16,-34,-17,-37,-44,-28,30,-23,-14,30,-5,-29,-20,-19,-21,-39,-47,-46,-50,30,-45,-49,-48,-18,-22,79,30,-10,30,-11,30,-9,]),'FALSE':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,64,65,73,75,78,79,81,82,83,84,],[-2,-6,-4,-8,31,-3,-30,-31,-33,-36,-35,-38,-7,31,-15,-32,-16,-34,-17,-37,-44,-28,31,-23,-14,31,-5,-29,-20,-19,-21,-39,-47,-46,31,-45,-18,-22,31,-10,31,-11,31,-9,]),'COMPONENT':([0,2,3,5,7,8,13,14,15,16,19,20,21,24,28,31,33,45,46,54,57,84,],[-2,6,-4,-8,6,-3,-30,-31,-33,-36,-35,-38,-7,-32,-34,-37,-28,-5,-29,-39,-47,-9,]),'LBRACK':([0,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,27,28,29,31,32,33,34,39,40,44,45,46,50,51,53,54,57,58,64,65,73,75,78,79,81,82,83,84,],[-2,-6,-4,-8,32,-3,-30,-31,-33,-36,-35,-38,-7,32,-15,-32,-16,-34,-17,-37,-44,-28,32,-23,-14,32,-5,-29,-20,-19,62,-39,-47,-46,32,-45,-18,-22,32,-10,32,-11,32,-9,]),'$end':([0,1,2,3,5,7,8,13,14,15,16,19,20,21,22,23,24,26,27,28,29,31,33,39,40,45,46,50,51,53,54,57,73,75,84,],[-2,0,-6,-4,-8,-12,-3,-30,-31,-33,-36,-35,-38,-7,-13,-15,-32,-1,-16,-34,-17,-37,-28,-23,-14,-5,-29,-20,-19,-21,-39,-47,-18,-22,-9,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -16,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'argument':([7,22,34,75,78,80,],[12,12,45,77,12,12,]),'dictionary':([7,22,34,44,63,75,78,80,],[13,13,13,13,13,13,13,13,]),'array':([7,22,34,44,63,75,78,80,],[14,14,14,14,14,14,14,14,]),'null':([7,22,34,44,63,75,78,80,],[15,15,15,15,15,15,15,15,]),'port':([7,22,37,38,78,80,],[17,17,50,51,17,17,]),'compdef':([2,7,],[5,21,]),'script':([0,],[1,]),'compdefs':([2,],[7,]),'member':([43,],[55,]),'program':([7,78,],[22,80,]),'bool':([7,22,34,44,63,75,78,80,],[24,24,24,24,24,24,24,24,]),'statement':([7,22,78,80,],[23,40,23,40,]),'opt_program':([7,],[26,]),'constdef':([0,2,],[3,8,]),'named_arg':([67,],[70,]),'qualified_name':([6,41,],[10,52,]),'assignment':([7,22,78,80,],[27,27,27,27,]),'docstring':([76,],[78,]),'link':([7,22,78,80,],[29,29,29,29,]),'named_args':([61,],[67,]),'members':([30,],[43,]),'constdefs':([0,],[2,]),'identifiers':([35,59,69,],[47,65,73,]),'value':([7,22,34,44,63,75,78,80,],[33,33,33,58,68,33,33,33,]),'values':([32,],[44,]),}
+_lr_goto_items = {'argument':([7,22,34,78,81,83,],[12,12,45,80,12,12,]),'dictionary':([7,22,34,44,64,78,81,83,],[13,13,13,13,13,13,13,13,]),'array':([7,22,34,44,64,78,81,83,],[14,14,14,14,14,14,14,14,]),'null':([7,22,34,44,64,78,81,83,],[15,15,15,15,15,15,15,15,]),'port':([7,22,37,38,81,83,],[17,17,50,51,17,17,]),'compdef':([2,7,],[5,21,]),'script':([0,],[1,]),'compdefs':([2,],[7,]),'member':([43,],[55,]),'program':([7,81,],[22,83,]),'bool':([7,22,34,44,64,78,81,83,],[24,24,24,24,24,24,24,24,]),'statement':([7,22,81,83,],[23,40,23,40,]),'opt_program':([7,],[26,]),'constdef':([0,2,],[3,8,]),'named_arg':([68,69,],[72,72,]),'qualified_name':([6,41,],[10,52,]),'assignment':([7,22,81,83,],[27,27,27,27,]),'docstring':([79,],[81,]),'link':([7,22,81,83,],[29,29,29,29,]),'named_args':([61,62,],[68,69,]),'members':([30,],[43,]),'constdefs':([0,],[2,]),'identifiers':([35,59,71,],[47,66,76,]),'value':([7,22,34,44,64,78,81,83,],[33,33,33,58,70,33,33,33,]),'values':([32,],[44,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -46,35 +47,36 @@ _lr_productions = [
   ('assignment -> IDENTIFIER COLON qualified_name LPAREN named_args RPAREN','assignment',6,'p_assignment','parser.py',130),
   ('link -> port GT port','link',3,'p_link','parser.py',135),
   ('link -> argument GT port','link',3,'p_link','parser.py',136),
-  ('port -> IDENTIFIER DOT IDENTIFIER','port',3,'p_port','parser.py',150),
-  ('port -> DOT IDENTIFIER','port',2,'p_port','parser.py',151),
-  ('named_args -> <empty>','named_args',0,'p_named_args','parser.py',156),
-  ('named_args -> named_args named_arg COMMA','named_args',3,'p_named_args','parser.py',157),
-  ('named_args -> named_args named_arg','named_args',2,'p_named_args','parser.py',158),
-  ('named_arg -> IDENTIFIER EQ argument','named_arg',3,'p_named_arg','parser.py',166),
-  ('argument -> value','argument',1,'p_argument','parser.py',171),
-  ('argument -> IDENTIFIER','argument',1,'p_argument','parser.py',172),
-  ('value -> dictionary','value',1,'p_value','parser.py',177),
-  ('value -> array','value',1,'p_value','parser.py',178),
-  ('value -> bool','value',1,'p_value','parser.py',179),
-  ('value -> null','value',1,'p_value','parser.py',180),
-  ('value -> NUMBER','value',1,'p_value','parser.py',181),
-  ('value -> STRING','value',1,'p_value','parser.py',182),
-  ('bool -> TRUE','bool',1,'p_bool','parser.py',187),
-  ('bool -> FALSE','bool',1,'p_bool','parser.py',188),
-  ('null -> NULL','null',1,'p_null','parser.py',193),
-  ('dictionary -> LBRACE members RBRACE','dictionary',3,'p_dictionary','parser.py',198),
-  ('members -> <empty>','members',0,'p_members','parser.py',203),
-  ('members -> members member COMMA','members',3,'p_members','parser.py',204),
-  ('members -> members member','members',2,'p_members','parser.py',205),
-  ('member -> STRING COLON value','member',3,'p_member','parser.py',214),
-  ('values -> <empty>','values',0,'p_values','parser.py',219),
-  ('values -> values value COMMA','values',3,'p_values','parser.py',220),
-  ('values -> values value','values',2,'p_values','parser.py',221),
-  ('array -> LBRACK values RBRACK','array',3,'p_array','parser.py',230),
-  ('identifiers -> <empty>','identifiers',0,'p_identifiers','parser.py',243),
-  ('identifiers -> identifiers IDENTIFIER COMMA','identifiers',3,'p_identifiers','parser.py',244),
-  ('identifiers -> identifiers IDENTIFIER','identifiers',2,'p_identifiers','parser.py',245),
-  ('qualified_name -> qualified_name DOT IDENTIFIER','qualified_name',3,'p_qualified_name','parser.py',253),
-  ('qualified_name -> IDENTIFIER','qualified_name',1,'p_qualified_name','parser.py',254),
+  ('port -> IDENTIFIER DOT IDENTIFIER','port',3,'p_port','parser.py',154),
+  ('port -> IDENTIFIER DOT IDENTIFIER LBRACK named_args RBRACK','port',6,'p_port','parser.py',155),
+  ('port -> DOT IDENTIFIER','port',2,'p_port','parser.py',156),
+  ('named_args -> <empty>','named_args',0,'p_named_args','parser.py',165),
+  ('named_args -> named_args named_arg COMMA','named_args',3,'p_named_args','parser.py',166),
+  ('named_args -> named_args named_arg','named_args',2,'p_named_args','parser.py',167),
+  ('named_arg -> IDENTIFIER EQ argument','named_arg',3,'p_named_arg','parser.py',175),
+  ('argument -> value','argument',1,'p_argument','parser.py',180),
+  ('argument -> IDENTIFIER','argument',1,'p_argument','parser.py',181),
+  ('value -> dictionary','value',1,'p_value','parser.py',186),
+  ('value -> array','value',1,'p_value','parser.py',187),
+  ('value -> bool','value',1,'p_value','parser.py',188),
+  ('value -> null','value',1,'p_value','parser.py',189),
+  ('value -> NUMBER','value',1,'p_value','parser.py',190),
+  ('value -> STRING','value',1,'p_value','parser.py',191),
+  ('bool -> TRUE','bool',1,'p_bool','parser.py',196),
+  ('bool -> FALSE','bool',1,'p_bool','parser.py',197),
+  ('null -> NULL','null',1,'p_null','parser.py',202),
+  ('dictionary -> LBRACE members RBRACE','dictionary',3,'p_dictionary','parser.py',207),
+  ('members -> <empty>','members',0,'p_members','parser.py',212),
+  ('members -> members member COMMA','members',3,'p_members','parser.py',213),
+  ('members -> members member','members',2,'p_members','parser.py',214),
+  ('member -> STRING COLON value','member',3,'p_member','parser.py',223),
+  ('values -> <empty>','values',0,'p_values','parser.py',228),
+  ('values -> values value COMMA','values',3,'p_values','parser.py',229),
+  ('values -> values value','values',2,'p_values','parser.py',230),
+  ('array -> LBRACK values RBRACK','array',3,'p_array','parser.py',239),
+  ('identifiers -> <empty>','identifiers',0,'p_identifiers','parser.py',252),
+  ('identifiers -> identifiers IDENTIFIER COMMA','identifiers',3,'p_identifiers','parser.py',253),
+  ('identifiers -> identifiers IDENTIFIER','identifiers',2,'p_identifiers','parser.py',254),
+  ('qualified_name -> qualified_name DOT IDENTIFIER','qualified_name',3,'p_qualified_name','parser.py',262),
+  ('qualified_name -> IDENTIFIER','qualified_name',1,'p_qualified_name','parser.py',263),
 ]
@@ -37,6 +37,7 @@ _log = get_logger(__name__)
 NODE_PATH = '/node/{}'
 NODE = '/node'
 NODES = '/nodes'
+LINKS = '/links'
 NODE_ID = '/id'
 PEER_SETUP = '/peer_setup'
 ACTOR = '/actor'
@@ -44,6 +45,8 @@ ACTOR_PATH = '/actor/{}'
 ACTORS = '/actors'
 ACTOR_DISABLE = '/actor/{}/disable'
 ACTOR_MIGRATE = '/actor/{}/migrate'
+ACTOR_SCHEDULING = '/actor/{}/scheduling'
+SCHEDULING = '/scheduling'
 APPLICATION_PATH = '/application/{}'
 APPLICATION_MIGRATE = '/application/{}/migrate'
 ACTOR_PORT = '/actor/{}/{}'
@@ -133,6 +136,10 @@ class RequestHandler(object):
         r = self._get(rt, timeout, async, NODES)
         return self.check_response(r)
 
+    def get_links(self, rt, timeout=DEFAULT_TIMEOUT, async=False):
+        r = self._get(rt, timeout, async, LINKS)
+        return self.check_response(r)
+
     def peer_setup(self, rt, *peers, **kwargs):
         timeout = kwargs.get('timeout', DEFAULT_TIMEOUT)
         async = kwargs.get('async', False)
@@ -230,6 +237,16 @@ class RequestHandler(object):
         r = self._post(rt, timeout, async, path, data)
         return self.check_response(r)
 
+    def set_scheduling(self, rt, actor_id, sched_class, deadline=None, timeout=DEFAULT_TIMEOUT, async=False):
+        data = {'class': sched_class, 'deadline': deadline}
+        path = ACTOR_SCHEDULING.format(actor_id)
+        r = self._post(rt, timeout, async, path, data)
+        return self.check_response(r)
+
+    def get_scheduling(self, rt, timeout=DEFAULT_TIMEOUT, async=False):
+        r = self._get(rt, timeout, async, SCHEDULING)
+        return self.check_response(r)
+
     def get_port(self, rt, actor_id, port_id, timeout=DEFAULT_TIMEOUT, async=False):
         path = ACTOR_PORT.format(actor_id, port_id)
         r = self._get(rt, timeout, async, path)
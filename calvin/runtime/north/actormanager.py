@@ -410,6 +410,11 @@ class ActorManager(object):
         success = actor.set_port_property(port_type, port_name, port_property, value)
         return 'OK' if success else 'FAILURE'
 
+    def set_scheduling(self, actor_id, sched_class, deadline=None):
+        if actor_id not in self.actors:
+            self._actor_not_found(actor_id)
+        self.actors[actor_id].scheduling_set(sched_class, deadline)
+
     def get_port_state(self, actor_id, port_id):
         if actor_id not in self.actors:
             self._actor_not_found(actor_id)
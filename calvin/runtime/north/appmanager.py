@@ -615,6 +615,12 @@ class Deployer(object):
         return self.deploy_info['requirements'][name] if (self.deploy_info and 'requirements' in self.deploy_info
                                                             and name in self.deploy_info['requirements']) else []
 
+    def get_scheduling(self, actor_name):
+        name = self.component_name(actor_name) or actor_name
+        name = name.split(':', 1)[1] if self.ns else name
+        return self.deploy_info['scheduling'].get(name) if (self.deploy_info and
+                                                            'scheduling' in self.deploy_info) else None
+
     def instantiate(self, actor_name, actor_type, argd, signature=None):
         """
         Instantiate an actor.
@@ -624,19 +630,20 @@ class Deployer(object):
           - 'signature' is the GlobalStore actor-signature to lookup the actor
         """
         req = self.get_req(actor_name)
+        scheduling = self.get_scheduling(actor_name)
         _log.analyze(self.node.id, "+ SECURITY", {'sec': str(self.sec)})
         found, is_primitive, actor_def = self.actorstore.lookup(actor_type)
         if not found or not is_primitive:
             raise Exception("Not known actor type: %s" % actor_type)
 
-        actor_id = self.instantiate_primitive(actor_name, actor_type, argd, req, signature)
+        actor_id = self.instantiate_primitive(actor_name, actor_type, argd, req, signature, scheduling)
         if not actor_id:
             raise Exception(
                 "Could not instantiate actor of type: %s" % actor_type)
         self.actor_map[actor_name] = actor_id
         self.node.app_manager.add(self.app_id, actor_id)
 
-    def instantiate_primitive(self, actor_name, actor_type, args, req=None, signature=None):
+    def instantiate_primitive(self, actor_name, actor_type, args, req=None, signature=None, scheduling=None):
         # name is <namespace>:<identifier>, e.g. app:src, or app:component:src
         # args is a **dictionary** of key-value arguments for this instance
         # signature is the GlobalStore actor-signature to lookup the actor
@@ -644,6 +651,8 @@ class Deployer(object):
         actor_id = self.node.am.new(actor_type=actor_type, args=args, signature=signature, credentials=self.credentials)
         if req:
             self.node.am.actors[actor_id].requirements_add(req, extend=False)
+        if scheduling:
+            self.node.am.set_scheduling(actor_id, scheduling.get('class', 'normal'), scheduling.get('deadline'))
         return actor_id
 
     def connectid(self, connection):
@@ -737,7 +746,8 @@ class Deployer(object):
                 # It was a normal primitive shadow actor, just instanciate
                 req = self.get_req(name)
                 info = self.deployable['actors'][name]
-                actor_id = self.instantiate_primitive(name, info['actor_type'], info['args'], req, info['signature'])
+                actor_id = self.instantiate_primitive(name, info['actor_type'], info['args'], req, info['signature'],
+                                                      self.get_scheduling(name))
                 if not actor_id:
                     _log.error("Second phase, could not make shadow actor %s!" % info['actor_type'])
                 self.actor_map[name] = actor_id
@@ -791,7 +801,8 @@ class Deployer(object):
                                     name + ":" + connection['dst'] + "." + connection['dst_port'])
                     _log.analyze(self.node.id, "+ ADDED PORTS", {'connections': self.deployable['connections']})
                     # Instanciate it
-                    actor_id = self.instantiate_primitive(name + ":" + actor_name, actor_desc['actor_type'], args, req, sign)
+                    actor_id = self.instantiate_primitive(name + ":" + actor_name, actor_desc['actor_type'], args, req, sign,
+                                                          self.get_scheduling(name + ":" + actor_name))
                     if not actor_id:
                         _log.error("Third phase, could not make shadow actor %s!" % info['actor_type'])
                     self.actor_map[name + ":" + actor_name] = actor_id
@@ -831,6 +842,12 @@ class Deployer(object):
                 src_name, src_port = src.split('.')
                 self.set_port_property(src_name, 'out', src_port, 'fanout', len(dst_list))
 
+        for port_type, ports in self.deployable.get('port_properties', {}).iteritems():
+            for actor_port, properties in ports.iteritems():
+                actor_name, port_name = actor_port.split('.')
+                for port_property, value in properties.iteritems():
+                    self.set_port_property(actor_name, port_type, port_name, port_property, value)
+
         for src, dst_list in self.deployable['connections'].iteritems():
             src_actor, src_port = src.split('.')
             for dst in dst_list:
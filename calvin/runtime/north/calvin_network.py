@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import os
+import time
 import glob
 import importlib
 
@@ -47,6 +48,10 @@ class CalvinLink(object):
         # to handle dying transports losing reply callbacks
         self.replies = old_link.replies if old_link else {}
         self.replies_timeout = old_link.replies_timeout if old_link else {}
+        # Send time of each request, the replies are round trip time samples
+        self.replies_sent = old_link.replies_sent if old_link else {}
+        self.retransmissions = 0
+        self.timeouts = 0
         if old_link:
             # close old link after a period, since might still receive messages on the transport layer
             # TODO chose the delay based on RTT instead of arbitrary 3 seconds
@@ -56,6 +61,9 @@ class CalvinLink(object):
 
     def reply_handler(self, payload):
         """ Gets called when a REPLY messages arrives on this link """
+        sent = self.replies_sent.pop(payload.get('msg_uuid'), None)
+        if sent is not None:
+            self.rtt_sample((time.time() - sent) * 1000.0)
         try:
             # Cancel timeout
             self.replies_timeout.pop(payload['msg_uuid']).cancel()
@@ -77,6 +85,8 @@ class CalvinLink(object):
             self.replies_timeout.pop(msg_id)
         except:
             pass
+        self.replies_sent.pop(msg_id, None)
+        self.timeouts += 1
         try:
             self.replies.pop(msg_id)(response.CalvinResponse(response.GATEWAY_TIMEOUT))
         except:
@@ -87,9 +97,10 @@ class CalvinLink(object):
         """ Adds a message id to the message and send it,
             also registers the callback for the reply.
         """
-        msg_id = calvinuuid.uuid("MSGID")
+        msg_id = calvinuuid.ephemeral("MSGID")
         self.replies[msg_id] = callback
         self.replies_timeout[msg_id] = async.DelayedCall(10.0, CalvinCB(self.reply_timeout, msg_id))
+        self.replies_sent[msg_id] = time.time()
         msg['msg_uuid'] = msg_id
         self.send(msg)
 
@@ -116,6 +127,22 @@ class CalvinLink(object):
     def get_transport_category(self):
         return self.transport_category
 
+    def rtt_sample(self, rtt):
+        """ A round trip time in ms measured on the link, e.g. of a request and its reply """
+        self.transport.update_rtt(rtt)
+
+    def retransmitted(self, count):
+        """ count messages (e.g. tokens) are sent again """
+        self.retransmissions += count
+
+    def stats(self):
+        """ Statistics of the link and its transport, compression is None for uncompressed links """
+        transport_stats = getattr(self.transport, 'stats', None)
+        stats = transport_stats() if transport_stats else {'rtt': self.transport.get_rtt(), 'compression': None}
+        stats.update({'pending_replies': len(self.replies), 'retransmissions': self.retransmissions,
+                      'timeouts': self.timeouts})
+        return stats
+
 
 class CalvinNetwork(object):
     """ CalvinNetwork keeps track of and establish all runtime to runtime links,
@@ -260,11 +287,18 @@ class CalvinNetwork(object):
                                          peer_node_id=peer_id, tb=True)
         if tp_link is None:
             # This is a failed join lets send it upwards
-            if uri in self.pending_joins:
-                cbs = self.pending_joins.pop(uri)
-                if cbs:
-                    for cb in cbs:
-                        cb(status=response.CalvinResponse(response.SERVICE_UNAVAILABLE), uri=uri, peer_node_id=peer_id)
+            self._join_failed(uri, peer_id)
+            return
+        expected_ids = [expected_id for expected_id, expected_uri in self.pending_joins_by_id.iteritems()
+                        if expected_uri == uri] if is_orginator else []
+        if peer_id == self.node.id or (expected_ids and peer_id not in expected_ids):
+            # The uri led to another runtime than the one it was given for, e.g. a calvinlocal socket
+            # with the same path in another container, or back to ourselves
+            _log.error("Join with %s reached %s instead of %s" % (uri, peer_id, expected_ids or "a peer"))
+            tp_link.disconnect()
+            for expected_id in expected_ids:
+                self.pending_joins_by_id.pop(expected_id)
+            self._join_failed(uri, peer_id)
             return
         # Only support for one RT to RT communication link per peer
         if peer_id in self.links:
@@ -314,6 +348,13 @@ class CalvinNetwork(object):
 
         return
 
+    def _join_failed(self, uri, peer_id):
+        if uri in self.pending_joins:
+            cbs = self.pending_joins.pop(uri)
+            if cbs:
+                for cb in cbs:
+                    cb(status=response.CalvinResponse(response.SERVICE_UNAVAILABLE), uri=uri, peer_node_id=peer_id)
+
     def link_get(self, peer_id):
         """ Get a link by node id """
         return self.links.get(peer_id, None)
@@ -348,13 +389,16 @@ class CalvinNetwork(object):
         self.join([self.get_supported_uri(value['uri'])], callback, [key])
 
     def get_supported_uri(self, uris):
-        """ Match configured transport interfaces with uris and return first match.
+        """ Match configured transport interfaces with uris and return first match,
+            uris of transports not registered or that can't reach the peer from here (e.g. calvinlocal
+            on another host) are skipped.
             returns: First supported uri, None if no match
         """
         transports = _conf.get(None, 'transports')
         for transport in transports:
+            factory = self.transports.get(transport)
             for uri in uris:
-                if transport in uri:
+                if transport in uri and factory is not None and factory.reachable(uri):
                     return uri
         return None
 
@@ -381,6 +425,10 @@ class CalvinNetwork(object):
     def list_links(self):
         return list(self.links.keys())
 
+    def link_stats(self):
+        """ Statistics of each link by peer node id """
+        return {peer_id: link.stats() for peer_id, link in self.links.items()}
+
     def link_get_transport_category(self, peer_id):
         """ Get a link by node id and its transport category"""
         return self.links.get(peer_id, None).get_transport_category()
@@ -107,7 +107,7 @@ class Node(object):
         async.DelayedCall(0, self.start)
 
     def insert_local_reply(self):
-        msg_id = calvinuuid.uuid("LMSG")
+        msg_id = calvinuuid.ephemeral("LMSG")
         self.async_msg_ids[msg_id] = None
         return msg_id
 
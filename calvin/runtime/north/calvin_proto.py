@@ -44,7 +44,7 @@ class CalvinTunnel(object):
         self.policy = policy
         self.rt_id = rt_id
         # id may change while status is PENDING, but is fixed in WORKING
-        self.id = id if id else calvinuuid.uuid("TUNNEL")
+        self.id = id if id else calvinuuid.ephemeral("TUNNEL")
         # If id supplied then we must be the second end and hence working
         self.status = CalvinTunnel.STATUS.WORKING if id else CalvinTunnel.STATUS.PENDING
         # Add the tunnel to the dictionary
@@ -112,6 +112,18 @@ class CalvinTunnel(object):
             # so far only seen during node quit
             _log.analyze(self.rt_id, "+ TUNNEL FAILED", payload, peer_node_id=self.peer_node_id)
 
+    def rtt_sample(self, rtt):
+        """ A round trip time in ms measured on the tunnel, e.g. of a token and its ACK """
+        link = self.links.get(self.peer_node_id)
+        if link is not None:
+            link.rtt_sample(rtt)
+
+    def retransmitted(self, count):
+        """ count messages on the tunnel are sent again """
+        link = self.links.get(self.peer_node_id)
+        if link is not None:
+            link.retransmitted(count)
+
     def register_recv(self, handler):
         """ Register the handler of incoming messages on this tunnel """
         self.recv_handler = handler
@@ -481,12 +493,18 @@ class CalvinProto(CalvinCBClass):
 
     #### PORTS ####
 
-    def port_connect(self, callback=None, port_id=None, peer_node_id=None, peer_port_id=None, peer_actor_id=None, peer_port_name=None, peer_port_dir=None, tunnel=None):
+    def port_connect(self, callback=None, port_id=None, peer_node_id=None, peer_port_id=None, peer_actor_id=None, peer_port_name=None, peer_port_dir=None, tunnel=None, token_capabilities=None, token_credit=None):
         """ Before calling this method all needed information and when requested a tunnel must be available
             see port manager for parameters
+            token_capabilities: list of token transfer capabilities the local endpoint supports
+            token_credit: credit granted by a local inport, see endpoint.credit_limit
         """
         if tunnel:
             msg = {'cmd': 'PORT_CONNECT', 'port_id': port_id, 'peer_actor_id': peer_actor_id, 'peer_port_name': peer_port_name, 'peer_port_id': peer_port_id, 'peer_port_dir': peer_port_dir, 'tunnel_id':tunnel.id}
+            if token_capabilities:
+                msg['token_capabilities'] = token_capabilities
+            if token_credit is not None:
+                msg['token_credit'] = token_credit
             self.network.links[peer_node_id].send_with_reply(callback, msg)
         else:
             raise NotImplementedError()
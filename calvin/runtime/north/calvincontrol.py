@@ -133,6 +133,29 @@ control_api_doc += \
 """
 re_get_nodes = re.compile(r"GET /nodes\sHTTP/1")
 
+control_api_doc += \
+    """
+    GET /links
+    Statistics of the links to the nodes in network known to self
+    Response status code: OK
+    Response:
+    {
+        <node-id>: {
+            "rtt": <smoothed round trip time in ms>, "rttvar": <mean deviation in ms or null before measured>,
+            "messages_sent": <count>, "messages_received": <count>,
+            "bytes_sent": <bytes>, "bytes_received": <bytes>,
+            "queued": <messages waiting to be sent>, "queued_bytes": <bytes>,
+            "pending_replies": <requests waiting for a reply>, "timeouts": <requests without reply>,
+            "retransmissions": <tokens sent again>,
+            "compression": null or {"messages": <count>, "compressed": <count>,
+                                    "bytes_in": <bytes>, "bytes_out": <bytes>, "ratio": <bytes_out / bytes_in>,
+                                    "compress_time": <seconds>, "decompress_time": <seconds>}
+        },
+        ...
+    }
+"""
+re_get_links = re.compile(r"GET /links\sHTTP/1")
+
 control_api_doc += \
     """
     GET /node/{node-id}
@@ -279,6 +302,36 @@ control_api_doc += \
 """
 re_post_actor_disable = re.compile(r"POST /actor/(ACTOR_" + uuid_re + "|" + uuid_re + ")/disable\sHTTP/1")
 
+control_api_doc += \
+    """
+    POST /actor/{actor-id}/scheduling
+    Set the scheduling class of an actor, ready actors are fired realtime first and bulk last,
+    within a class by deadline (seconds from when the actor was triggered)
+    Body:
+    {
+        "class": "realtime", "normal" or "bulk",
+        "deadline": <seconds>  # optional
+    }
+    Response status code: OK, BAD_REQUEST or NOT_FOUND
+    Response: none
+"""
+re_post_actor_scheduling = re.compile(r"POST /actor/(ACTOR_" + uuid_re + "|" + uuid_re + ")/scheduling\sHTTP/1")
+
+control_api_doc += \
+    """
+    GET /scheduling
+    Get the trigger to fire latency of the actors of each scheduling class on this runtime
+    Response status code: OK
+    Response:
+    {
+        <class>: {"count": <firings>, "missed_deadlines": <firings>,
+                  "mean": <seconds>, "p50": <seconds>, "p99": <seconds>, "max": <seconds>},
+        ...
+    }
+    The latencies are over the most recent firings.
+"""
+re_get_scheduling = re.compile(r"GET /scheduling\sHTTP/1")
+
 # control_api_doc += \
 """
     GET /actor/{actor-id}/port/{port-id}
@@ -320,7 +373,8 @@ control_api_doc += \
     """
     POST /set_port_property
     Sets a property of the port.
-    Currently only fanout on outports is supported.
+    Supported are fanout on outports, and fifo_size, fifo_size_min and
+    fifo_size_max on all ports (the FIFO adapts its size when min < max).
     Body:
     {
         "actor_id" : <actor-id>,
@@ -356,7 +410,11 @@ control_api_doc += \
                                               }, ...
                                            ],
                 ...
-                            }
+                            },
+            "scheduling": {  # optional, see POST /actor/{actor-id}/scheduling
+                "<actor instance 1 name>": {"class": "realtime", "normal" or "bulk", "deadline": <seconds>},
+                ...
+                          }
            }
     }
     Note that either a script or app_info must be supplied. Optionally security
@@ -515,6 +573,25 @@ control_api_doc += \
         {
             <actor-id>: [<start time of counter>, <last modification time>],
             ...
+        },
+        'cpu_time':
+        {
+            <actor-id>:
+            {
+                <action-name>: <total seconds firing on the runtime thread>,
+                ...
+            },
+            ...
+        },
+        'yields':
+        {
+            <actor-id>: <times the actor used up its fire budget>,
+            ...
+        },
+        'links':
+        {
+            <node-id>: {...},  (as in GET /links)
+            ...
         }
     }
 """
@@ -760,6 +837,7 @@ class CalvinControl(object):
             (re_get_log, self.handle_get_log),
             (re_get_node_id, self.handle_get_node_id),
             (re_get_nodes, self.handle_get_nodes),
+            (re_get_links, self.handle_get_links),
             (re_get_node, self.handle_get_node),
             (re_post_peer_setup, self.handle_peer_setup),
             (re_get_applications, self.handle_get_applications),
@@ -772,6 +850,8 @@ class CalvinControl(object):
             (re_get_actor_report, self.handle_get_actor_report),
             (re_post_actor_migrate, self.handle_actor_migrate),
             (re_post_actor_disable, self.handle_actor_disable),
+            (re_post_actor_scheduling, self.handle_actor_scheduling),
+            (re_get_scheduling, self.handle_get_scheduling),
             (re_get_port, self.handle_get_port),
             (re_get_port_state, self.handle_get_port_state),
             (re_post_connect, self.handle_connect),
@@ -1007,6 +1087,11 @@ class CalvinControl(object):
         """
         self.send_response(handle, connection, json.dumps(self.node.network.list_links()))
 
+    def handle_get_links(self, handle, connection, match, data, hdr):
+        """ Get statistics of the links
+        """
+        self.send_response(handle, connection, json.dumps(self.node.network.link_stats()))
+
     def handle_get_node(self, handle, connection, match, data, hdr):
         """ Get node information from id
         """
@@ -1129,6 +1214,21 @@ class CalvinControl(object):
             status = calvinresponse.NOT_FOUND
         self.send_response(handle, connection, None, status)
 
+    def handle_actor_scheduling(self, handle, connection, match, data, hdr):
+        if match.group(1) not in self.node.am.actors:
+            status = calvinresponse.NOT_FOUND
+        else:
+            try:
+                self.node.am.set_scheduling(match.group(1), data['class'], data.get('deadline'))
+                status = calvinresponse.OK
+            except:
+                _log.exception("Set scheduling failed")
+                status = calvinresponse.BAD_REQUEST
+        self.send_response(handle, connection, None, status)
+
+    def handle_get_scheduling(self, handle, connection, match, data, hdr):
+        self.send_response(handle, connection, json.dumps(self.node.sched.stats()))
+
     def handle_get_port(self, handle, connection, match, data, hdr):
         """ Get port from id
         """
@@ -1754,7 +1854,7 @@ class CalvinControlTunnel(object):
         """
         if self.server.pending_connections:
             addr, conn = self.server.accept()
-            msg_id = calvinuuid.uuid("MSGID")
+            msg_id = calvinuuid.ephemeral("MSGID")
             self.connections[msg_id] = conn
             _log.debug("New connection msg_id: %s" % msg_id)
 
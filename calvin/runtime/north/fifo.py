@@ -14,7 +14,64 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+
 from calvin_token import Token
+from calvin.utilities.calvinlogger import get_logger
+
+_log = get_logger(__name__)
+
+# Adaptive sizing: grow when the FIFO filled up this many times within a window,
+# the window being this many writes per entry of the FIFO
+ADAPT_STALLS = 2
+ADAPT_WINDOW = 8
+
+
+class _Positions(object):
+
+    """
+    Dictionary like view of the FIFO's reader positions, keyed by reader id.
+    Used where positions are accessed by reader id, e.g. when acking tokens on tunnels.
+    """
+
+    def __init__(self, fifo, positions, setter):
+        super(_Positions, self).__init__()
+        self._fifo = fifo
+        self._positions = positions
+        self._setter = setter
+
+    def __getitem__(self, reader):
+        return self._positions[self._fifo._slots[reader]]
+
+    def __setitem__(self, reader, pos):
+        self._setter(self._fifo._slots[reader], pos)
+
+    def __contains__(self, reader):
+        return reader in self._fifo._slots
+
+    def __iter__(self):
+        return iter(self._fifo._slots)
+
+    def __len__(self):
+        return len(self._fifo._slots)
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def keys(self):
+        return self._fifo._slots.keys()
+
+    def values(self):
+        return [self._positions[slot] for slot in self._fifo._slots.itervalues()]
+
+    def items(self):
+        return [(reader, self._positions[slot]) for reader, slot in self._fifo._slots.iteritems()]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
 
 
 class FIFO(object):
@@ -24,24 +81,41 @@ class FIFO(object):
     Parameters:
         length is the number of entries in the FIFO
         readers is a set of actors reading from the FIFO
+        validate enables checks of the reader on every access, default is on when debug logging
+    Each reader is given an integer slot, read positions are kept in lists indexed by slot and the
+    position of the slowest reader is kept up to date on commits instead of searched for on writes.
+    When given bounds (set_bounds) the FIFO adapts its length: it doubles when it repeatedly fills up
+    and halves when the occupancy stays low during a window of writes.
     """
 
     # FIXME: (MAJOR) Readers must be UUIDs instead of sockets or we can't
     # migrate
 
-    def __init__(self, length):
+    def __init__(self, length, validate=None):
         super(FIFO, self).__init__()
         self.fifo = [Token(0)] * length
         self.N = length
+        self.min_length = length
+        self.max_length = length
+        self._adaptive = False
+        self._reset_stats()
         self.readers = set()
+        self.validate = _log.getEffectiveLevel() <= logging.DEBUG if validate is None else validate
         # NOTE: For simplicity, modulo operation is only used in fifo access,
         #       all read and write positions are monotonousy increasing
         self.write_pos = 0
-        self.read_pos = {}
-        self.tentative_read_pos = {}
+        self._slots = {}
+        self._free_slots = []
+        self._read_pos = []
+        self._tentative_read_pos = []
+        # Read position of the slowest reader(s) and how many readers are at that position
+        self._min_read_pos = 0
+        self._min_count = 0
+        self.read_pos = _Positions(self, self._read_pos, self._set_read_pos)
+        self.tentative_read_pos = _Positions(self, self._tentative_read_pos, self._set_tentative_read_pos)
 
     def __len__(self):
-        return self.write_pos - min(self.read_pos.values() or [0])
+        return self.write_pos - self._min_read_pos
 
     def __str__(self):
         return "Tokens: %s, w:%i, r:%s, tr:%s" % (self.fifo, self.write_pos, self.read_pos, self.tentative_read_pos)
@@ -50,40 +124,151 @@ class FIFO(object):
         state = {
             'fifo': [t.encode() for t in self.fifo],
             'N': self.N,
+            'min_length': self.min_length,
+            'max_length': self.max_length,
+            'adaptive': self._adaptive,
             'readers': list(self.readers),
             'write_pos': self.write_pos,
-            'read_pos': self.read_pos,
-            'tentative_read_pos': self.tentative_read_pos
+            'read_pos': dict(self.read_pos.items()),
+            'tentative_read_pos': dict(self.tentative_read_pos.items())
         }
         return state
 
     def _set_state(self, state):
         self.fifo = [Token.decode(d) for d in state['fifo']]
         self.N = state['N']
-        self.readers = set(state['readers'])
+        self.min_length = state.get('min_length', self.N)
+        self.max_length = state.get('max_length', self.N)
+        self._adaptive = state.get('adaptive', self.min_length < self.max_length)
+        self._reset_stats()
+        self.readers = set()
+        self._slots = {}
+        self._free_slots = []
+        del self._read_pos[:]
+        del self._tentative_read_pos[:]
+        for reader in state['readers']:
+            slot = self._new_slot(reader)
+            self._read_pos[slot] = state['read_pos'][reader]
+            self._tentative_read_pos[slot] = state['tentative_read_pos'][reader]
         self.write_pos = state['write_pos']
-        self.read_pos = state['read_pos']
-        self.tentative_read_pos = state['tentative_read_pos']
+        self._update_min()
+
+    def _reset_stats(self):
+        self._writes = 0
+        self._stalls = 0
+        self._max_fill = 0
+
+    def resize(self, length):
+        """
+        Change the number of entries, keeping tokens and positions. Returns False if the tokens don't fit.
+        A fixed length FIFO gets the new length as its fixed length, the bounds of an adaptive FIFO are
+        widened to include it.
+        """
+        if not self._resize(length):
+            return False
+        if self._adaptive:
+            self.min_length = min(self.min_length, length)
+            self.max_length = max(self.max_length, length)
+        else:
+            self.min_length = self.max_length = length
+        return True
+
+    def _resize(self, length):
+        if length < 2 or length <= self.write_pos - self._min_read_pos:
+            return False
+        fifo = [Token(0)] * length
+        for pos in xrange(self._min_read_pos, self.write_pos):
+            fifo[pos % length] = self.fifo[pos % self.N]
+        self.fifo = fifo
+        self.N = length
+        return True
+
+    def set_bounds(self, min_length, max_length):
+        """ Let the FIFO adapt its length between min_length and max_length, fixed length when equal """
+        if not 2 <= min_length <= max_length:
+            return False
+        length = max(min_length, min(max_length, self.N))
+        if length != self.N and not self._resize(length):
+            return False
+        self.min_length = min_length
+        self.max_length = max_length
+        self._adaptive = min_length < max_length
+        self._reset_stats()
+        return True
+
+    def _adapt(self):
+        fill = self.write_pos - self._min_read_pos
+        self._writes += 1
+        if fill > self._max_fill:
+            self._max_fill = fill
+        if fill == self.N - 1:
+            # Full, the writer stalls until a token is consumed
+            self._stalls += 1
+            if self._stalls >= ADAPT_STALLS and self.N < self.max_length:
+                self._resize(min(self.max_length, 2 * self.N))
+                self._reset_stats()
+                return
+        if self._writes >= ADAPT_WINDOW * self.N:
+            if not self._stalls and self._max_fill < self.N // 4 and self.N > self.min_length:
+                self._resize(max(self.min_length, self.N // 2, fill + 1))
+            self._reset_stats()
+
+    def _update_min(self):
+        positions = [self._read_pos[slot] for slot in self._slots.itervalues()]
+        self._min_read_pos = min(positions or [0])
+        self._min_count = positions.count(self._min_read_pos)
+
+    def _set_read_pos(self, slot, pos):
+        old_pos = self._read_pos[slot]
+        self._read_pos[slot] = pos
+        if pos == old_pos or (pos > old_pos and old_pos != self._min_read_pos):
+            return
+        if pos > old_pos:
+            # One of the slowest readers moved on
+            self._min_count -= 1
+            if self._min_count:
+                return
+        self._update_min()
+
+    def _set_tentative_read_pos(self, slot, pos):
+        self._tentative_read_pos[slot] = pos
+
+    def _new_slot(self, reader):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._read_pos)
+            self._read_pos.append(0)
+            self._tentative_read_pos.append(0)
+        self._read_pos[slot] = 0
+        self._tentative_read_pos[slot] = 0
+        self._slots[reader] = slot
+        self.readers.add(reader)
+        return slot
+
+    def _check_reader(self, reader):
+        if not isinstance(reader, basestring):
+            raise Exception('Not a string: %s' % reader)
+        if reader not in self._slots:
+            raise Exception("Unknown reader: '%s'" % reader)
 
     def add_reader(self, reader):
         if not isinstance(reader, basestring):
             raise Exception('Not a string: %s' % reader)
         if reader not in self.readers:
-            self.read_pos[reader] = 0
-            self.tentative_read_pos[reader] = 0
-            self.readers.add(reader)
+            self._new_slot(reader)
+            self._update_min()
 
     def remove_reader(self, reader):
         if not isinstance(reader, basestring):
             raise Exception('Not a string: %s' % reader)
-        del self.read_pos[reader]
-        del self.tentative_read_pos[reader]
+        self._free_slots.append(self._slots.pop(reader))
         self.readers.discard(reader)
+        self._update_min()
 
     def can_write(self):
         # See if there is space to write data
-        last_readpos = min(self.read_pos.values() or [0])
-        return not (self.write_pos + 1) % self.N == last_readpos % self.N
+        return not (self.write_pos + 1) % self.N == self._min_read_pos % self.N
 
     def write(self, data):
         if not self.can_write():
@@ -91,55 +276,62 @@ class FIFO(object):
         write_pos = self.write_pos
         self.fifo[write_pos % self.N] = data
         self.write_pos = write_pos + 1
+        if self._adaptive:
+            self._adapt()
         return True
 
     def available_slots(self):
         # See if there is space to write data
-        last_readpos = min(self.read_pos.values() or [0])
-        return self.N - ((self.write_pos - last_readpos) % self.N) - 1
+        return self.N - ((self.write_pos - self._min_read_pos) % self.N) - 1
 
     def available_tokens(self, reader):
-        if not isinstance(reader, basestring):
-            raise Exception('Not a string: %s' % reader)
-        if reader not in self.readers:
-            raise Exception("No reader")
-        return self.write_pos - self.tentative_read_pos[reader]
+        if self.validate:
+            self._check_reader(reader)
+        return self.write_pos - self._tentative_read_pos[self._slots[reader]]
 
     #
     # Reading is now done tentatively until committed
     #
     def can_read(self, reader):
-        if not isinstance(reader, basestring):
-            raise Exception('Not a string: %s' % reader)
-        if reader not in self.readers:
-            raise Exception("No reader")
-        return not self.tentative_read_pos[reader] == self.write_pos
+        if self.validate:
+            self._check_reader(reader)
+        return not self._tentative_read_pos[self._slots[reader]] == self.write_pos
 
     def read(self, reader):
-        if not isinstance(reader, basestring):
-            raise Exception('Not a string: %s' % reader)
-        if reader not in self.readers:
-            raise Exception("Unknown reader: '%s'" % reader)
-        if not self.can_read(reader):
+        if self.validate:
+            self._check_reader(reader)
+        slot = self._slots[reader]
+        read_pos = self._tentative_read_pos[slot]
+        if read_pos == self.write_pos:
             return None
-        read_pos = self.tentative_read_pos[reader]
         data = self.fifo[read_pos % self.N]
-        self.tentative_read_pos[reader] = read_pos + 1
+        self._tentative_read_pos[slot] = read_pos + 1
         return data
 
     # Commit is always required after reads.
     def commit_reads(self, reader, commit=True):
+        slot = self._slots[reader]
         if commit:
-            self.read_pos[reader] = self.tentative_read_pos[reader]
+            pos = self._tentative_read_pos[slot]
+            old_pos = self._read_pos[slot]
+            self._read_pos[slot] = pos
+            if old_pos == self._min_read_pos and pos > old_pos:
+                # One of the slowest readers moved on
+                self._min_count -= 1
+                if not self._min_count:
+                    self._update_min()
+            elif pos < old_pos:
+                self._update_min()
         else:
-            self.tentative_read_pos[reader] = self.read_pos[reader]
+            self._tentative_read_pos[slot] = self._read_pos[slot]
 
     def rollback_reads(self, reader):
         self.commit_reads(reader, False)
 
     def commit_one_read(self, reader, commit=True):
-        if self.read_pos[reader] < self.tentative_read_pos[reader]:
+        slot = self._slots[reader]
+        if self._read_pos[slot] < self._tentative_read_pos[slot]:
             if commit:
-                self.read_pos[reader] += 1
+                self._set_read_pos(slot, self._read_pos[slot] + 1)
             else:
-                self.tentative_read_pos[reader] -= 1
+                self._tentative_read_pos[slot] -= 1
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from calvin.runtime.south import endpoint
+from calvin.utilities.calvinlogger import get_logger
+
+_log = get_logger(__name__)
+
+
+class Chain(object):
+
+    """
+    Actors connected in a line by single producer, single consumer local connections.
+    The links are the (outport, out endpoint, inport, in endpoint) between consecutive actors.
+    """
+
+    def __init__(self, actors, links):
+        super(Chain, self).__init__()
+        self.actors = actors
+        self.links = links
+
+    def __str__(self):
+        return " > ".join(actor.id for actor in self.actors)
+
+    def valid(self):
+        """ False when a member is no longer enabled or any of the chain's ports has been reconnected """
+        for actor in self.actors:
+            if not actor.enabled():
+                return False
+        for outport, out_endpoint, inport, in_endpoint in self.links:
+            if inport.endpoint is not in_endpoint or len(outport.endpoints) != 1 or outport.endpoints[0] is not out_endpoint:
+                return False
+        return True
+
+
+def _link(actor):
+    """ The link to the only consumer of actor's tokens when that is the consumer's only producer, or None """
+    if len(actor.outports) != 1:
+        return None
+    outport = actor.outports.values()[0]
+    if outport.fanout != 1 or len(outport.endpoints) != 1:
+        return None
+    out_endpoint = outport.endpoints[0]
+    if type(out_endpoint) is not endpoint.LocalOutEndpoint:
+        return None
+    inport = out_endpoint.peer_port
+    consumer = inport.owner
+    if consumer is None or consumer is actor or len(consumer.inports) != 1:
+        return None
+    in_endpoint = inport.endpoint
+    if type(in_endpoint) is not endpoint.LocalInEndpoint or in_endpoint.peer_port is not outport:
+        return None
+    return (outport, out_endpoint, inport, in_endpoint)
+
+
+class Fusion(object):
+
+    """
+    Keeps the chains of enabled actors on this node, for the scheduler to fire each chain as one unit
+    in chain order. A token entering a chain then passes all of it in one scheduler pass.
+    Chains are found among all enabled actors (find) and dropped when they are no longer valid, i.e. a
+    member migrates, is disabled or a port of the chain is reconnected (group).
+    """
+
+    def __init__(self):
+        super(Fusion, self).__init__()
+        # Actor id to the chain it is member of
+        self.chains = {}
+        # Rediscover when the number of enabled actors changed or a chain was dropped
+        self._count = None
+        self._dropped = False
+
+    def outdated(self, actors):
+        return self._dropped or len(actors) != self._count
+
+    def find(self, actors):
+        """ Find the chains among actors, all enabled actors on this node """
+        self.chains = {}
+        self._count = len(actors)
+        self._dropped = False
+        enabled = set(actor.id for actor in actors)
+        links = {}
+        consumers = set()
+        for actor in actors:
+            link = _link(actor)
+            if link is not None and link[2].owner.id in enabled:
+                links[actor.id] = link
+                consumers.add(link[2].owner.id)
+        for actor in actors:
+            if actor.id not in links or actor.id in consumers:
+                # Not the head of a chain, actors in a cycle are not fused
+                continue
+            members = [actor]
+            chain_links = []
+            link = links[actor.id]
+            while link is not None:
+                chain_links.append(link)
+                members.append(link[2].owner)
+                link = links.get(link[2].owner.id)
+            chain = Chain(members, chain_links)
+            for member in members:
+                self.chains[member.id] = chain
+            _log.debug("Fused actors %s" % chain)
+
+    def group(self, actors):
+        """
+        Returns the actors to fire with the members of valid chains replaced by their chain (once),
+        chains that are no longer valid are dropped and their members fired one by one.
+        """
+        if not self.chains:
+            return actors
+        units = []
+        seen = set()
+        for actor in actors:
+            chain = self.chains.get(actor.id)
+            if chain is None:
+                units.append(actor)
+            elif chain in seen:
+                continue
+            elif chain.valid():
+                seen.add(chain)
+                units.append(chain)
+            else:
+                _log.debug("Unfused actors %s" % chain)
+                for member in chain.actors:
+                    self.chains.pop(member.id, None)
+                self._dropped = True
+                units.append(actor)
+        return units
@@ -57,13 +57,18 @@ class Metering(object):
         self.next_forget_aggregated = time.time()
         self.actors_aggregated = {}
         self.actors_aggregated_time = {}
+        self.actors_cpu_time = {}
+        self.actors_yields = {}
 
-    def fired(self, actor_id, action_name):
+    def fired(self, actor_id, action_name, cpu_time=0.0):
+        """ An action fired, cpu_time is the seconds spent firing it on the runtime thread """
         t = time.time()
         if self.aggregated_timeout > 0.0:
             # Aggregate
             self.actors_aggregated.setdefault(actor_id,
                                             {action: 0 for action in self.actors_meta[actor_id]})[action_name] += 1
+            self.actors_cpu_time.setdefault(actor_id,
+                                            {action: 0.0 for action in self.actors_meta[actor_id]})[action_name] += cpu_time
             # Set [start time, modification time] and update modification time
             self.actors_aggregated_time.setdefault(actor_id, [t, t])[1] = t
             if self.next_forget_aggregated <= t:
@@ -75,6 +80,11 @@ class Metering(object):
             if self.oldest < t - self.timeout and self.last_forget < t - 1.0:
                 self.forget(t)
 
+    def yielded(self, actor_id):
+        """ The actor used up its fire budget """
+        if self.aggregated_timeout > 0.0:
+            self.actors_yields[actor_id] = self.actors_yields.get(actor_id, 0) + 1
+
     def register(self, user_id=None):
         if not user_id:
             user_id = calvinuuid.uuid("METERING")
@@ -107,7 +117,12 @@ class Metering(object):
         if user_id not in self.users:
             _log.debug("get_aggregated_meter: User id not found")
             raise Exception("User id not found")
-        response = {'activity': self.actors_aggregated, 'time': self.actors_aggregated_time}
+        response = {'activity': self.actors_aggregated, 'time': self.actors_aggregated_time,
+                    'cpu_time': self.actors_cpu_time, 'yields': self.actors_yields}
+        # Nodes without a network (e.g. in tests) have no links
+        network = getattr(self.node, 'network', None)
+        if network is not None:
+            response['links'] = network.link_stats()
         return response
 
     def forget(self, current):
@@ -135,6 +150,8 @@ class Metering(object):
                     self.actors_aggregated.pop(actor_id)
                 except:
                     pass
+                self.actors_cpu_time.pop(actor_id, None)
+                self.actors_yields.pop(actor_id, None)
         self.actors_destroyed = {actor_id: dt for actor_id, dt in self.actors_destroyed.iteritems() if dt >= et}
         if self.actors_destroyed:
             self.next_forget_aggregated = (min(self.actors_destroyed.values()) +
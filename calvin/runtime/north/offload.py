@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+
+from calvin.runtime.south.plugins.async import threads
+from calvin.utilities.calvinlogger import get_logger
+from calvin.utilities import calvinconfig
+
+_log = get_logger(__name__)
+_conf = calvinconfig.get()
+
+_offload = None
+
+
+def get_offload():
+    """ Returns the Offload singleton, created on first use from the configuration """
+    global _offload
+    if _offload is None:
+        _offload = Offload(_conf.get(None, 'offload_pool_size') or 4,
+                           _conf.get(None, 'offload_queue_limit') or 0)
+    return _offload
+
+
+class Offload(object):
+
+    """
+    Runs the actions declared with @condition(..., offload=True) off the reactor thread, on a pool
+    of size worker threads. At most queue_limit actions wait for a free worker, further actions are
+    refused (submit returns None), the refused actors wait (see wait) until a worker finishes.
+    """
+
+    def __init__(self, size, queue_limit):
+        super(Offload, self).__init__()
+        self.size = size
+        self.queue_limit = queue_limit
+        self.pending = 0
+        # Callbacks of refused submitters, by key, called when a worker finishes
+        self._waiting = OrderedDict()
+        self._pool = threads.ThreadPool(size, name="offload")
+
+    def submit(self, f, *args):
+        """ Returns a deferred with the result of f(*args) run in the pool, or None when the queue is full """
+        if self.pending >= self.size + self.queue_limit:
+            _log.debug("Offload queue full, %d pending" % self.pending)
+            return None
+        self.pending += 1
+        job = self._pool.defer_to_thread(f, *args)
+        job.addBoth(self._done)
+        return job
+
+    def wait(self, key, callback):
+        """ Calls callback (once per key) when a job finishes, for a submit that was refused """
+        self._waiting[key] = callback
+
+    def _done(self, result):
+        self.pending -= 1
+        waiting = self._waiting.values()
+        self._waiting.clear()
+        for callback in waiting:
+            try:
+                callback()
+            except Exception as e:
+                _log.exception(e)
+        return result
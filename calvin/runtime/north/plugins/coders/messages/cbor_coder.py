@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+from message_coder import MessageCoderBase
+
+# Self-contained CBOR (RFC 7049) coder for the built-in types used in messages.
+# A str is coded as a byte string and a unicode as a text string, hence both
+# keep their python type over the link. Tuples are decoded as lists (as in json).
+
+_MAJOR_UINT = 0x00
+_MAJOR_NEGINT = 0x20
+_MAJOR_BYTES = 0x40
+_MAJOR_TEXT = 0x60
+_MAJOR_ARRAY = 0x80
+_MAJOR_MAP = 0xa0
+_MAJOR_TAG = 0xc0
+
+_FALSE = '\xf4'
+_TRUE = '\xf5'
+_NULL = '\xf6'
+_FLOAT64 = '\xfb'
+
+_TAG_POS_BIGNUM = 2
+_TAG_NEG_BIGNUM = 3
+
+_pack_B = struct.Struct('>BB').pack
+_pack_H = struct.Struct('>BH').pack
+_pack_I = struct.Struct('>BI').pack
+_pack_Q = struct.Struct('>BQ').pack
+_pack_d = struct.Struct('>d').pack
+_unpack_H = struct.Struct('>H').unpack_from
+_unpack_I = struct.Struct('>I').unpack_from
+_unpack_Q = struct.Struct('>Q').unpack_from
+_unpack_f = struct.Struct('>f').unpack_from
+_unpack_d = struct.Struct('>d').unpack_from
+
+# Single byte heads, indexed by major type | length
+_HEADS = [chr(n) for n in range(256)]
+
+
+def _head(major, n):
+    if n < 24:
+        return _HEADS[major | n]
+    if n < 0x100:
+        return _pack_B(major | 24, n)
+    if n < 0x10000:
+        return _pack_H(major | 25, n)
+    if n < 0x100000000:
+        return _pack_I(major | 26, n)
+    return _pack_Q(major | 27, n)
+
+
+def _bignum(value):
+    # Tag and big-endian bytes of integers outside of the 64 bit range
+    if value >= 0:
+        tag = _TAG_POS_BIGNUM
+    else:
+        tag, value = _TAG_NEG_BIGNUM, -1 - value
+    digits = '%x' % value
+    if len(digits) % 2:
+        digits = '0' + digits
+    data = digits.decode('hex')
+    return _head(_MAJOR_TAG, tag) + _head(_MAJOR_BYTES, len(data)) + data
+
+
+def _encode_int(value):
+    if value >= 0:
+        if value < 0x10000000000000000:
+            return _head(_MAJOR_UINT, value)
+    elif value >= -0x10000000000000000:
+        return _head(_MAJOR_NEGINT, -1 - value)
+    return _bignum(value)
+
+
+def dumps(value):
+    out = []
+    append = out.append
+    heads = _HEADS
+
+    def encode(value):
+        # The most common types in messages first
+        type_ = type(value)
+        if type_ is str:
+            n = len(value)
+            append(heads[_MAJOR_BYTES | n] if n < 24 else _head(_MAJOR_BYTES, n))
+            append(value)
+        elif type_ is dict:
+            n = len(value)
+            append(heads[_MAJOR_MAP | n] if n < 24 else _head(_MAJOR_MAP, n))
+            for key, item in value.iteritems():
+                encode(key)
+                encode(item)
+        elif type_ is int:
+            append(heads[value] if 0 <= value < 24 else _encode_int(value))
+        elif type_ is unicode:
+            data = value.encode('utf-8')
+            n = len(data)
+            append(heads[_MAJOR_TEXT | n] if n < 24 else _head(_MAJOR_TEXT, n))
+            append(data)
+        elif type_ is list or type_ is tuple:
+            n = len(value)
+            append(heads[_MAJOR_ARRAY | n] if n < 24 else _head(_MAJOR_ARRAY, n))
+            for item in value:
+                encode(item)
+        elif value is None:
+            append(_NULL)
+        elif type_ is bool:
+            append(_TRUE if value else _FALSE)
+        elif type_ is float:
+            append(_FLOAT64)
+            append(_pack_d(value))
+        elif type_ is long:
+            append(_encode_int(value))
+        else:
+            # Subclasses of the built-in types, order matters since bool is an int
+            for base in (bool, int, long, str, unicode, float, list, tuple, dict):
+                if isinstance(value, base):
+                    encode(base(value))
+                    return
+            raise TypeError("%r is not CBOR serializable" % (value,))
+
+    encode(value)
+    return ''.join(out)
+
+
+def _decode_half(bits):
+    exponent = (bits >> 10) & 0x1f
+    mantissa = bits & 0x3ff
+    if exponent == 0:
+        value = mantissa * 2.0 ** -24
+    elif exponent == 0x1f:
+        value = float('nan') if mantissa else float('inf')
+    else:
+        value = (mantissa + 1024) * 2.0 ** (exponent - 25)
+    return -value if bits & 0x8000 else value
+
+
+def loads(data):
+
+    def decode(pos):
+        initial = ord(data[pos])
+        pos += 1
+        major = initial & 0xe0
+        info = initial & 0x1f
+        if major == 0xe0:
+            # Simple values and floats, info is not a length
+            if info == 20:
+                return False, pos
+            if info == 21:
+                return True, pos
+            if info == 22 or info == 23:
+                return None, pos
+            if info == 27:
+                return _unpack_d(data, pos)[0], pos + 8
+            if info == 26:
+                return _unpack_f(data, pos)[0], pos + 4
+            if info == 25:
+                return _decode_half(_unpack_H(data, pos)[0]), pos + 2
+            raise ValueError("Unsupported CBOR item 0x%02x at %d" % (initial, pos - 1))
+        if info < 24:
+            n = info
+        elif info == 24:
+            n = ord(data[pos])
+            pos += 1
+        elif info == 25:
+            n = _unpack_H(data, pos)[0]
+            pos += 2
+        elif info == 26:
+            n = _unpack_I(data, pos)[0]
+            pos += 4
+        elif info == 27:
+            n = _unpack_Q(data, pos)[0]
+            pos += 8
+        else:
+            # Indefinite lengths are not used
+            raise ValueError("Unsupported CBOR length 0x%02x at %d" % (initial, pos - 1))
+        if major == _MAJOR_BYTES:
+            end = pos + n
+            return data[pos:end], end
+        if major == _MAJOR_MAP:
+            value = {}
+            for _ in xrange(n):
+                key, pos = decode(pos)
+                value[key], pos = decode(pos)
+            return value, pos
+        if major == _MAJOR_UINT:
+            return n, pos
+        if major == _MAJOR_TEXT:
+            end = pos + n
+            return data[pos:end].decode('utf-8'), end
+        if major == _MAJOR_ARRAY:
+            value = []
+            append = value.append
+            for _ in xrange(n):
+                item, pos = decode(pos)
+                append(item)
+            return value, pos
+        if major == _MAJOR_NEGINT:
+            return -1 - n, pos
+        # Tag
+        value, pos = decode(pos)
+        if (n == _TAG_POS_BIGNUM or n == _TAG_NEG_BIGNUM) and isinstance(value, str):
+            value = long(value.encode('hex') or '0', 16)
+            return (value if n == _TAG_POS_BIGNUM else -1 - value), pos
+        # Unknown tags are ignored
+        return value, pos
+
+    value, pos = decode(0)
+    if pos != len(data):
+        raise ValueError("Extra data after CBOR item at %d" % pos)
+    return value
+
+
+class MessageCoder(MessageCoderBase):
+
+    def encode(self, data):
+        return dumps(data)
+
+    def decode(self, data):
+        return loads(data)
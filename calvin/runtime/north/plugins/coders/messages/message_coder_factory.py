@@ -16,12 +16,15 @@
 
 # Coders
 import json_coder
+import cbor_coder
 
 def get_prio_list():
-    return ['json']
+    return ['cbor', 'json']
 
 def get(type_):
     if type_ == "json":
         return json_coder.MessageCoder()
+    if type_ == "cbor":
+        return cbor_coder.MessageCoder()
 
     raise Exception("Coder {} requested is not supported".format(type_))
@@ -23,6 +23,13 @@ _conf = calvinconfig.get()
 
 class DynamicNegotiator(negotiator_base.NegotiatorBase):
 
-    def get_coder(self, channel):
-        raise NotImplemented("This is not implemented yet.")
+    def get_coder(self, prio_list):
+        """ Our most prefered coder that the peer also supports, json when none """
+        for coder in self.get_list():
+            if not prio_list or coder in prio_list:
+                return message_coder_factory.get(coder)
+        return message_coder_factory.get("json")
+
+    def get_list(self):
+        return message_coder_factory.get_prio_list()
 
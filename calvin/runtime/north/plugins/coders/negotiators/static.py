@@ -24,10 +24,10 @@ _conf = calvinconfig.get()
 class StaticNegotiator(negotiator_base.NegotiatorBase):
 
     def get_coder(self, prio_list):
-        coder = _conf.get("static_coder", None)
+        coder = _conf.get(None, "static_coder")
         if prio_list and coder not in prio_list:
             raise Exception("Coder not supported!")
         return message_coder_factory.get(coder)
 
     def get_list(self):
-        return [_conf.get("static_coder", None)]
+        return [_conf.get(None, "static_coder")]
@@ -87,7 +87,7 @@ class StorageProxy(StorageBase):
             self.replies.pop(payload['msg_uuid'])(**{k: v for k, v in payload.iteritems() if k in ('key', 'value')})
 
     def send(self, cmd, msg, cb):
-        msg_id = calvinuuid.uuid("MSGID")
+        msg_id = calvinuuid.ephemeral("MSGID")
         self.replies[msg_id] = cb
         msg['msg_uuid'] = msg_id
         self.tunnel.send(dict(msg, cmd=cmd, msg_uuid=msg_id))
@@ -20,6 +20,8 @@ from calvin.runtime.south.plugins.storage import dht, securedht
 from calvin.runtime.north.plugins.storage.proxy import StorageProxy
 
 def get(type_, node=None):
+    if type_ in ("dht", "securedht") and globals()[type_] is None:
+        raise Exception("Storage {} is not available on this framework".format(type_))
     if type_ == "dht":
         return dht.AutoDHTServer()
     elif type_ == "securedht":
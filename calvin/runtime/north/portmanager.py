@@ -115,7 +115,52 @@ class PortManager(object):
                 # it is sorted out if we connect again
                 try:
                     if e.get_peer()[1] == payload['peer_port_id']:
-                        e.reply(payload['sequencenbr'], payload['value'])
+                        e.reply(payload['sequencenbr'], payload['value'], payload.get('credit'))
+                        break
+                except:
+                    pass
+
+    def recv_token_batch_handler(self, tunnel, payload):
+        """ Gets called when a batch of tokens arrive to any port """
+        try:
+            port = self._get_local_port(port_id=payload['peer_port_id'])
+            port.endpoint.recv_token_batch(payload)
+        except:
+            # Inform other end that it sent tokens to a port that does not exist on this runtime
+            reply = {'cmd': 'TOKEN_BATCH_REPLY',
+                     'port_id': payload['port_id'],
+                     'peer_port_id': payload['peer_port_id'],
+                     'sequencenbr': payload['sequencenbr'],
+                     'ack': payload['sequencenbr'],
+                     'value': 'ABORT'}
+            tunnel.send(reply)
+
+    def recv_token_batch_reply_handler(self, tunnel, payload):
+        """ Gets called when a batch of tokens is (N)ACKed for any port """
+        try:
+            port = self._get_local_port(port_id=payload['port_id'])
+        except:
+            pass
+        else:
+            for e in port.endpoints:
+                try:
+                    if e.get_peer()[1] == payload['peer_port_id']:
+                        e.reply_batch(payload['sequencenbr'], payload['ack'], payload['value'], payload.get('credit'))
+                        break
+                except:
+                    pass
+
+    def recv_token_credit_handler(self, tunnel, payload):
+        """ Gets called when a peer inport has freed slots in its fifo """
+        try:
+            port = self._get_local_port(port_id=payload['port_id'])
+        except:
+            pass
+        else:
+            for e in port.endpoints:
+                try:
+                    if e.get_peer()[1] == payload['peer_port_id']:
+                        e.grant_credit(payload['credit'])
                         break
                 except:
                     pass
@@ -127,6 +172,12 @@ class PortManager(object):
                 self.recv_token_handler(tunnel, payload)
             elif 'TOKEN_REPLY' == payload['cmd']:
                 self.recv_token_reply_handler(tunnel, payload)
+            elif 'TOKEN_BATCH' == payload['cmd']:
+                self.recv_token_batch_handler(tunnel, payload)
+            elif 'TOKEN_BATCH_REPLY' == payload['cmd']:
+                self.recv_token_batch_reply_handler(tunnel, payload)
+            elif 'TOKEN_CREDIT' == payload['cmd']:
+                self.recv_token_credit_handler(tunnel, payload)
 
     def connection_request(self, payload):
         """ A request from a peer to connect a port"""
@@ -159,18 +210,23 @@ class PortManager(object):
                 _log.analyze(self.node.id, "+ WRONG TUNNEL", payload, peer_node_id=payload['from_rt_uuid'])
                 return response.CalvinResponse(response.GONE)
 
+            # Older peers don't send any token capabilities
+            peer_capabilities = payload.get('token_capabilities', [])
             if isinstance(port, InPort):
                 endp = endpoint.TunnelInEndpoint(port,
                                                  tunnel,
                                                  payload['from_rt_uuid'],
                                                  payload['port_id'],
-                                                 self.node.sched.trigger_loop)
+                                                 self.node.sched.trigger_loop,
+                                                 peer_capabilities)
             else:
                 endp = endpoint.TunnelOutEndpoint(port,
                                                   tunnel,
                                                   payload['from_rt_uuid'],
                                                   payload['port_id'],
-                                                  self.node.sched.trigger_loop)
+                                                  self.node.sched.trigger_loop,
+                                                  peer_capabilities,
+                                                  payload.get('token_credit'))
                 self.monitor.register_out_endpoint(endp)
 
             invalid_endpoint = port.attach_endpoint(endp)
@@ -187,7 +243,10 @@ class PortManager(object):
                 self.node.storage.add_port(port, self.node.id, port.owner.id, "out")
 
             _log.analyze(self.node.id, "+ OK", payload, peer_node_id=payload['from_rt_uuid'])
-            return response.CalvinResponse(response.OK, {'port_id': port.id})
+            data = {'port_id': port.id, 'token_capabilities': endpoint.TOKEN_CAPABILITIES}
+            if isinstance(port, InPort):
+                data['token_credit'] = endpoint.credit_limit(port.fifo)
+            return response.CalvinResponse(response.OK, data)
 
 
     def connect(self, callback=None, actor_id=None, port_name=None, port_dir=None, port_id=None, peer_node_id=None,
@@ -403,13 +462,17 @@ class PortManager(object):
         _log.analyze(self.node.id, "+ SENDING", dict({k: state[k] for k in state.keys() if k != 'callback'},tunnel_status=self.tunnels[state['peer_node_id']].status), peer_node_id=state['peer_node_id'])
         if 'retries' not in state:
             state['retries'] = 0
+        # An inport grants the peer's outport credit from the start
+        token_credit = endpoint.credit_limit(port.fifo) if isinstance(port, InPort) else None
         self.proto.port_connect(callback=CalvinCB(self._connected_via_tunnel, **state),
                                 port_id=state['port_id'],
                                 peer_node_id=state['peer_node_id'],
                                 peer_port_id=state['peer_port_id'],
                                 peer_actor_id=state['peer_actor_id'],
                                 peer_port_name=state['peer_port_name'],
-                                peer_port_dir=state['peer_port_dir'], tunnel=tunnel)
+                                peer_port_dir=state['peer_port_dir'], tunnel=tunnel,
+                                token_capabilities=endpoint.TOKEN_CAPABILITIES,
+                                token_credit=token_credit)
 
 
     def _connected_via_tunnel(self, reply, **state):
@@ -445,18 +508,23 @@ class PortManager(object):
         # Set up the port's endpoint
         tunnel = self.tunnels[state['peer_node_id']]
         port = self.ports[state['port_id']]
+        # Older peers don't reply with any token capabilities
+        peer_capabilities = reply.data.get('token_capabilities', [])
         if isinstance(port, InPort):
             endp = endpoint.TunnelInEndpoint(port,
                                              tunnel,
                                              state['peer_node_id'],
                                              reply.data['port_id'],
-                                             self.node.sched.trigger_loop)
+                                             self.node.sched.trigger_loop,
+                                             peer_capabilities)
         else:
             endp = endpoint.TunnelOutEndpoint(port,
                                               tunnel,
                                               state['peer_node_id'],
                                               reply.data['port_id'],
-                                              self.node.sched.trigger_loop)
+                                              self.node.sched.trigger_loop,
+                                              peer_capabilities,
+                                              reply.data.get('token_credit'))
             # register into main loop
             self.monitor.register_out_endpoint(endp)
         invalid_endpoint = port.attach_endpoint(endp)
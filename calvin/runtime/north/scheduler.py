@@ -14,14 +14,52 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import sys
 import time
 
-from calvin.actor.actor import ActionResult
+from calvin.actor.actor import ActionResult, SCHEDULING_CLASSES, local_peer_ids
+from calvin.runtime.north import fusion
 from calvin.runtime.south.plugins.async import async
 from calvin.utilities.calvinlogger import get_logger
+from calvin.utilities import calvinconfig
 
 _log = get_logger(__name__)
+_conf = calvinconfig.get()
+
+# Ready actors are served in the order of their scheduling class
+_RANK = {name: rank for rank, name in enumerate(SCHEDULING_CLASSES)}
+_NO_DEADLINE = float('inf')
+
+
+class LatencyStats(object):
+
+    """ Trigger to fire latency of the actors of a scheduling class, over the most recent firings """
+
+    def __init__(self, window=1000):
+        super(LatencyStats, self).__init__()
+        self.count = 0
+        self.missed = 0
+        self.latencies = collections.deque(maxlen=window)
+
+    def add(self, latency, deadline):
+        self.count += 1
+        if deadline is not None and latency > deadline:
+            self.missed += 1
+        self.latencies.append(latency)
+
+    def summary(self):
+        """ Counts since start, latencies in seconds over the window """
+        latencies = sorted(self.latencies)
+        n = len(latencies)
+        return {
+            'count': self.count,
+            'missed_deadlines': self.missed,
+            'mean': sum(latencies) / n if n else None,
+            'p50': latencies[n // 2] if n else None,
+            'p99': latencies[min(n - 1, n * 99 // 100)] if n else None,
+            'max': latencies[-1] if n else None
+        }
 
 
 class Scheduler(object):
@@ -39,7 +77,35 @@ class Scheduler(object):
         self._loop_once = None
         self._trigger_set = set()
         self._heartbeat_loop = None
+        # The current idle wait, see _sleep
         self._heartbeat = 1
+        # Run a loop over all enabled actors next
+        self._all = False
+        # In loop_once, triggers are then taken by the running loop
+        self._running = False
+        # While idle, the wait before a loop doubles from 1 s up to scheduler_idle_max, 0 only wakes on events
+        self._idle_min = 1.0
+        self._idle_max = _conf.get(None, 'scheduler_idle_max')
+        if self._idle_max is None:
+            self._idle_max = 10.0
+        self._idle_wait = self._idle_min if self._idle_max else None
+        # Loops run back to back for at most this long before yielding to the reactor
+        self._burst = _conf.get(None, 'scheduler_burst') or 0.005
+        # In readiness mode only actors in the trigger set are fired, i.e. actors that have
+        # had tokens or slots change on any of their ports, or that got a calvinsys event.
+        # A full sweep over all enabled actors is still done every sweep interval as a safety net.
+        self._readiness = _conf.get(None, 'scheduler_mode') == 'readiness'
+        self._sweep_interval = _conf.get(None, 'scheduler_sweep_interval') or 10.0
+        self._last_sweep = 0.0
+        if self._readiness:
+            self._heartbeat = self._sweep_interval
+        # Fire chains of local actors as one unit, see fusion.Fusion
+        self._fusion = fusion.Fusion() if _conf.get(None, 'scheduler_fusion') else None
+        # When triggered actors were first triggered, for the deadlines and the latency statistics
+        self._triggered = {}
+        # Bulk actors run for at most this long per loop, the rest wait for the next loop
+        self._bulk_budget = _conf.get(None, 'scheduler_bulk_budget') or 0.005
+        self._stats = {name: LatencyStats() for name in SCHEDULING_CLASSES}
 
     def run(self):
         async.run_ioloop()
@@ -50,32 +116,92 @@ class Scheduler(object):
         self.done = True
 
     def loop_once(self, all_=False):
-        activity = self.monitor.loop(self)
+        """
+        Runs scheduler loops back to back while there is work, for at most the burst time, then yields
+        to the reactor. When nothing happened it sleeps until the next idle wake up, see _sleep.
+        """
+        self._loop_once = None
+        self._running = True
+        start = time.time()
+        try:
+            while True:
+                all_ = all_ or self._all
+                self._all = False
+                activity, total = self._loop(all_)
+                all_ = False
+                if activity:
+                    # Something happened - run again (in readiness mode with the actors that got ready)
+                    self._add_triggers(total.actor_ids)
+                if not self._pending(activity) or self.done or time.time() - start >= self._burst:
+                    break
+        finally:
+            self._running = False
 
-        # If all ignore the set
-        if all_:
-            total = self.fire_actors(None)
+        if self._pending(activity):
+            self._idle_wait = self._idle_min if self._idle_max else None
+            if self._loop_once is None:
+                self._loop_once = async.DelayedCall(0, self.loop_once)
         else:
-            total = self.fire_actors(self._trigger_set)
+            self._sleep()
 
-        self._loop_once = None
+    def _pending(self, activity):
+        return activity or self._all or (self._trigger_set and self._trigger_set != set([None]))
 
+    def _loop(self, all_):
+        activity = self.monitor.loop(self)
+
+        # Swap out the trigger set before firing, any triggers during firing goes into a new set
         local_trigger_set = self._trigger_set
         self._trigger_set = set()
 
-        activity = total.did_fire or activity
+        now = time.time()
+        if self._readiness and now - self._last_sweep >= self._sweep_interval:
+            # Safety net, make sure that every actor is visited now and then
+            all_ = True
 
-        _log.debug("looped_once for %s at %s again in %s" %
-                   ("ALL" if all_ else local_trigger_set, time.time(), 0 if activity else self._heartbeat))
+        # If all ignore the set
+        if all_ or not self._readiness:
+            self._last_sweep = now
+            total = self.fire_actors(None)
+            # Every enabled actor was visited, other than triggers during firing the trigger times are stale
+            self._triggered = {actor_id: self._triggered[actor_id] for actor_id in self._trigger_set | total.deferred
+                               if actor_id in self._triggered}
+        else:
+            total = self.fire_actors(local_trigger_set)
+
+        activity = total.did_fire or activity or bool(total.deferred)
 
-        if activity:
-            # Something happened - run again
-            self.trigger_loop(0, total.actor_ids)
+        _log.debug("looped_once for %s at %s %s" %
+                   ("ALL" if all_ else local_trigger_set, time.time(), "active" if activity else "idle"))
+        return activity, total
+
+    def _sleep(self):
+        """
+        Nothing fired, sleep until an event triggers a loop or the earliest of: the monitor's next delayed
+        endpoint, the next sweep in readiness mode, or the idle wait which doubles while the node stays idle.
+        """
+        now = time.time()
+        if self._readiness:
+            wait = min(max(self._sweep_interval - (now - self._last_sweep), 0), self._sweep_interval)
         else:
-            # No firings, wait a while until next loop
-            if self._heartbeat_loop is not None:
-                self._heartbeat_loop.cancel()
-            self._heartbeat_loop = async.DelayedCall(self._heartbeat, self.trigger_loop)
+            wait = self._idle_wait
+            if self._idle_max:
+                self._idle_wait = min(2 * self._idle_wait, self._idle_max)
+        due = self.monitor.next_due()
+        if due is not None:
+            wait = max(due - now, 0) if wait is None else min(wait, max(due - now, 0))
+        self._heartbeat = wait
+        if self._heartbeat_loop is not None:
+            self._heartbeat_loop.cancel()
+            self._heartbeat_loop = None
+        if wait is not None:
+            self._heartbeat_loop = async.DelayedCall(wait, self.trigger_loop)
+
+    def _add_triggers(self, actor_ids):
+        self._trigger_set.update(actor_ids)
+        now = time.time()
+        for actor_id in actor_ids:
+            self._triggered.setdefault(actor_id, now)
 
     def trigger_loop(self, delay=0, actor_ids=None):
         """ Trigger the loop_once potentially after waiting delay seconds """
@@ -83,46 +209,114 @@ class Scheduler(object):
         if delay > 0:
             _log.debug("Delayed trigger %s" % delay)
             async.DelayedCall(delay, self.loop_once, True)
-        else:
-            # Never have more then one outstanding loop_once
+            return
 
-            if actor_ids is None:
-                if self._loop_once is not None:
-                    self._loop_once.cancel()
-                self._loop_once = async.DelayedCall(0, self.loop_once, True)
-            else:
-                self._trigger_set.update(actor_ids)
+        if actor_ids is None:
+            self._all = True
+        else:
+            self._add_triggers(actor_ids)
 
-                # Dont run None jobs
-                if self._trigger_set == set([None]):
-                    _log.debug("Ignoring fire")
-                    return
+            # Dont run None jobs
+            if self._trigger_set == set([None]) and not self._all:
+                _log.debug("Ignoring fire")
+                return
 
-                _log.debug(self._trigger_set)
-                if self._loop_once is None:
-                    self._loop_once = async.DelayedCall(0, self.loop_once)
+            _log.debug(self._trigger_set)
+        if self._running:
+            # The running loop_once picks it up
+            return
+        # Never have more then one outstanding loop_once
+        if self._loop_once is None:
+            self._loop_once = async.DelayedCall(0, self.loop_once)
 
     def _log_exception_during_fire(self, e):
         _log.exception(e)
 
+    def _ready_actors(self, actor_ids):
+        actors = self.actor_mgr.actors
+        ready = []
+        for actor_id in actor_ids:
+            if actor_id in actors and actors[actor_id].enabled():
+                ready.append(actors[actor_id])
+            else:
+                self._triggered.pop(actor_id, None)
+        return ready
+
+    def stats(self):
+        """ Latency statistics per scheduling class """
+        return {name: stats.summary() for name, stats in self._stats.iteritems()}
+
+    def _priority(self, unit, now):
+        """ Sort key of a unit, the class, the time the deadline expires and then the time it was triggered """
+        actors = unit.actors if type(unit) is fusion.Chain else (unit,)
+        rank = len(SCHEDULING_CLASSES)
+        due = _NO_DEADLINE
+        triggered = now
+        for actor in actors:
+            rank = min(rank, _RANK[actor._sched_class])
+            since = self._triggered.get(actor.id, now)
+            triggered = min(triggered, since)
+            if actor._sched_deadline is not None:
+                due = min(due, since + actor._sched_deadline)
+        return rank, due, triggered
+
     def fire_actors(self, actor_ids=None):
         total = ActionResult(did_fire=False)
         total.actor_ids = set()
+        total.deferred = set()
 
-        for actor in self.actor_mgr.enabled_actors():
-            # if actor_ids is not None and actor.id not in actor_ids:
-            #     _log.debug("ignoring actor %s(%s)" % (actor._type, actor.id))
-            #     continue
-            try:
-                action_result = actor.fire()
-                _log.debug("fired actor %s(%s)" % (actor._type, actor.id))
-                total.merge(action_result)
-                total.actor_ids.add(actor.id)
-            except Exception as e:
-                self._log_exception_during_fire(e)
+        actors = self.actor_mgr.enabled_actors() if actor_ids is None else self._ready_actors(actor_ids)
+        if self._fusion is not None:
+            if actor_ids is None and self._fusion.outdated(actors):
+                self._fusion.find(actors)
+            actors = self._fusion.group(actors)
+        now = time.time()
+        # Stable order within a class and deadline
+        units = [(self._priority(unit, now), index, unit) for index, unit in enumerate(actors)]
+        units.sort()
+        bulk_time = None
+        for (rank, _, _), _, unit in units:
+            members = unit.actors if type(unit) is fusion.Chain else (unit,)
+            bulk = rank == _RANK['bulk']
+            if bulk and bulk_time is not None and bulk_time >= self._bulk_budget:
+                # Out of time for bulk actors in this loop (at least one runs), they keep their trigger time
+                # and are served before bulk actors triggered later
+                for actor in members:
+                    self._triggered.setdefault(actor.id, now)
+                    total.deferred.add(actor.id)
+                continue
+            start = time.time()
+            # Fire the members in chain order, tokens pass the whole chain in this pass
+            for actor in members:
+                self._fire(actor, total, now)
+            if bulk:
+                bulk_time = (bulk_time or 0.0) + time.time() - start
+        # Deferred actors are fired first thing in the next loop
+        total.actor_ids.update(total.deferred)
         self.idle = not total.did_fire
         return total
 
+    def _fire(self, actor, total, now):
+        triggered = self._triggered.pop(actor.id, now)
+        try:
+            start = time.time()
+            action_result = actor.fire()
+            _log.debug("fired actor %s(%s)" % (actor._type, actor.id))
+            total.merge(action_result)
+            if action_result.yielded:
+                # Stopped on its budget with more to do, fire again in the next loop
+                total.actor_ids.add(actor.id)
+            if action_result.did_fire:
+                self._stats[actor._sched_class].add(start - triggered, actor._sched_deadline)
+            if not self._readiness:
+                total.actor_ids.add(actor.id)
+            elif action_result.did_fire:
+                # The actor fired until it could not fire anymore, but the tokens and slots
+                # of its local peers' ports changed
+                total.actor_ids.update(local_peer_ids(actor))
+        except Exception as e:
+            self._log_exception_during_fire(e)
+
 
 class DebugScheduler(Scheduler):
     """This is an instrumented version of the scheduler for use in debugging runs."""
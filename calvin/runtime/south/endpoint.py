@@ -17,14 +17,30 @@
 from calvin.runtime.north.calvin_token import Token
 import time
 from calvin.utilities.calvinlogger import get_logger
+from calvin.utilities import calvinconfig
 
 _log = get_logger(__name__)
+_conf = calvinconfig.get()
+
+# Token transfer capabilities of the tunnel endpoints, exchanged with the peer runtime when connecting ports.
+# A peer that does not list a capability (e.g. an older runtime) gets the plain one TOKEN per message protocol.
+TOKEN_CAPABILITIES = ['TOKEN_BATCH', 'CREDIT']
+
+
+def credit_limit(fifo):
+    """ The credit an inport FIFO can grant its peer: the sequence number (exclusive) the free slots reach to.
+        Being absolute it only grows and is not affected by reordered, lost or duplicated credit messages.
+    """
+    return fifo.write_pos + fifo.available_slots()
 
 
 class Endpoint(object):
 
     """docstring for Endpoint"""
 
+    # The Event_Monitor of out endpoints that need to communicate, set when registered
+    monitor = None
+
     def __init__(self, port, former_peer_id=None):
         super(Endpoint, self).__init__()
         self.port = port
@@ -59,7 +75,12 @@ class Endpoint(object):
 
 class LocalInEndpoint(Endpoint):
 
-    """docstring for LocalEndpoint"""
+    """
+    Reads directly from the peer outport's fifo, the ring buffer shared by producer and consumer.
+    The inport's own fifo is only drained of tokens left from a remote connection, and its positions
+    are reconciled with the shared fifo when the endpoint is destroyed (disconnect or migration),
+    so that a following tunnel connection continues from the right sequence number.
+    """
 
     def __init__(self, port, peer_port):
         super(LocalInEndpoint, self).__init__(port)
@@ -82,43 +103,45 @@ class LocalInEndpoint(Endpoint):
         self.fifo_mismatch = False
 
     def _sync_local_fifos(self):
-        # TODO Fix performance by only doing this at a disconnect of local port
         # Make this port's write pos to be synced with peer's read_pos as it is when using 2 FIFOs (i.e. remote)
         self.port.fifo.write_pos = self.peer_port.fifo.read_pos[self.port.id]
         # and the read pos reflect it does not actually contain any data
         self.port.fifo.read_pos[self.port.id] = self.port.fifo.write_pos
         self.port.fifo.tentative_read_pos[self.port.id] = self.port.fifo.write_pos
 
-    def read_token(self):
-        if self.fifo_mismatch:
-            self._fifo_mismatch_fix()
-
-        if self.data_in_local_fifo:
-            # Empty local inport fifo once, since local transport only use outport's fifo
-            token = self.port.fifo.read(self.port.id)
-            if token:
-                self.port.fifo.commit_reads(self.port.id, True)
-                return token
-            self.data_in_local_fifo = False
+    def destroy(self):
+        self._sync_local_fifos()
 
-        token = self.peer_port.fifo.read(self.port.id)
-        self.peer_port.fifo.commit_reads(self.port.id, token is not None)
+    def read_token(self):
+        if self.fifo_mismatch or self.data_in_local_fifo:
+            if self.fifo_mismatch:
+                self._fifo_mismatch_fix()
+
+            if self.data_in_local_fifo:
+                # Empty local inport fifo once, since local transport only use outport's fifo
+                token = self.port.fifo.read(self.port.id)
+                if token:
+                    self.port.fifo.commit_reads(self.port.id, True)
+                    return token
+                self.data_in_local_fifo = False
 
-        self._sync_local_fifos()
+        fifo = self.peer_port.fifo
+        token = fifo.read(self.port.id)
+        fifo.commit_reads(self.port.id, token is not None)
         return token
 
     def peek_token(self):
-        if self.fifo_mismatch:
-            self._fifo_mismatch_fix()
+        if self.fifo_mismatch or self.data_in_local_fifo:
+            if self.fifo_mismatch:
+                self._fifo_mismatch_fix()
 
-        if self.data_in_local_fifo:
-            # Empty local FIFO (once) in case it contains data
-            token = self.port.fifo.read(self.port.id)
-            if token:
-                return token
+            if self.data_in_local_fifo:
+                # Empty local FIFO (once) in case it contains data
+                token = self.port.fifo.read(self.port.id)
+                if token:
+                    return token
 
-        token = self.peer_port.fifo.read(self.port.id)
-        return token
+        return self.peer_port.fifo.read(self.port.id)
 
     def peek_rewind(self):
         if self.data_in_local_fifo:
@@ -134,9 +157,11 @@ class LocalInEndpoint(Endpoint):
             else:
                 self.data_in_local_fifo = False
         self.peer_port.fifo.commit_reads(self.port.id)
-        self._sync_local_fifos()
 
     def available_tokens(self):
+        if not (self.fifo_mismatch or self.data_in_local_fifo):
+            return self.peer_port.fifo.available_tokens(self.port.id)
+
         if self.fifo_mismatch:
             self._fifo_mismatch_fix()
 
@@ -177,12 +202,16 @@ class TunnelInEndpoint(Endpoint):
 
     """docstring for TunnelInEndpoint"""
 
-    def __init__(self, port, tunnel, peer_node_id, peer_port_id, trigger_loop):
+    def __init__(self, port, tunnel, peer_node_id, peer_port_id, trigger_loop, peer_capabilities=None):
         super(TunnelInEndpoint, self).__init__(port)
         self.tunnel = tunnel
         self.peer_port_id = peer_port_id
         self.peer_node_id = peer_node_id
         self.trigger_loop = trigger_loop
+        self.peer_capabilities = peer_capabilities or []
+        # Last credit granted to the peer, None when the peer does not use credits.
+        # Start from nothing granted beyond what we have, so that the first read sends a credit update.
+        self.credit = port.fifo.write_pos if 'CREDIT' in self.peer_capabilities else None
 
     def __str__(self):
         str = super(TunnelInEndpoint, self).__str__()
@@ -196,7 +225,7 @@ class TunnelInEndpoint(Endpoint):
         # Drop any tokens that we can't write to fifo or is out of sequence
         if self.port.fifo.can_write() and self.port.fifo.write_pos == payload['sequencenbr']:
             self.port.fifo.write(Token.decode(payload['token']))
-            self.trigger_loop()
+            self.trigger_loop(actor_ids=[self.port.owner.id])
             ok = True
         elif self.port.fifo.write_pos > payload['sequencenbr']:
             # Other side resent a token we already have received (can happen after a reconnect if our previous ACK was
@@ -209,11 +238,64 @@ class TunnelInEndpoint(Endpoint):
             'sequencenbr': payload['sequencenbr'],
             'value': 'ACK' if ok else 'NACK'
         }
+        if self.credit is not None:
+            self.credit = reply['credit'] = credit_limit(self.port.fifo)
+        self.tunnel.send(reply)
+
+    def recv_token_batch(self, payload):
+        """ Receive a run of tokens with consecutive sequence numbers starting at payload['sequencenbr'].
+            Replies with one cumulative reply: the tokens from payload['sequencenbr'] up to (but not including)
+            reply['ack'] are ACKed, when the reply value is 'NACK' the token with sequence number reply['ack']
+            and all following it are NACKed.
+        """
+        fifo = self.port.fifo
+        sequencenbr = payload['sequencenbr']
+        written = False
+        ok = True
+        for token in payload['tokens']:
+            if fifo.write_pos > sequencenbr:
+                # Resent token we already have received, just ACK
+                pass
+            elif fifo.write_pos == sequencenbr and fifo.can_write():
+                fifo.write(Token.decode(token))
+                written = True
+            else:
+                # Full fifo or out of sequence, NACK from here
+                ok = False
+                break
+            sequencenbr += 1
+        if written:
+            self.trigger_loop(actor_ids=[self.port.owner.id])
+        reply = {
+            'cmd': 'TOKEN_BATCH_REPLY',
+            'port_id': payload['port_id'],
+            'peer_port_id': payload['peer_port_id'],
+            'sequencenbr': payload['sequencenbr'],
+            'ack': sequencenbr,
+            'value': 'ACK' if ok else 'NACK'
+        }
+        if self.credit is not None:
+            self.credit = reply['credit'] = credit_limit(self.port.fifo)
         self.tunnel.send(reply)
 
+    def _update_credit(self, threshold):
+        # Tell the peer about freed slots, otherwise the credit is sent with the next reply
+        limit = credit_limit(self.port.fifo)
+        if limit - self.credit >= threshold:
+            self.credit = limit
+            self.tunnel.send({
+                'cmd': 'TOKEN_CREDIT',
+                'port_id': self.peer_port_id,
+                'peer_port_id': self.port.id,
+                'credit': limit
+            })
+
     def read_token(self):
         token = self.port.fifo.read(self.port.id)
         self.port.fifo.commit_reads(self.port.id, token is not None)
+        if token is not None and self.credit is not None:
+            # Only when a substantial part of the fifo has been freed
+            self._update_credit(max(1, self.port.fifo.N // 2))
         return token
 
     def peek_token(self):
@@ -225,8 +307,13 @@ class TunnelInEndpoint(Endpoint):
 
     def commit_peek_as_read(self):
         self.port.fifo.commit_reads(self.port.id)
+        if self.credit is not None:
+            self._update_credit(max(1, self.port.fifo.N // 2))
 
     def available_tokens(self):
+        if self.credit is not None and self.credit <= self.port.fifo.write_pos:
+            # The peer has used up its credit and our actor wants more tokens, any freed slot counts
+            self._update_credit(1)
         # First fit as many tokens as possible in the fifo
         return self.port.fifo.available_tokens(self.port.id)
 
@@ -241,17 +328,26 @@ class TunnelOutEndpoint(Endpoint):
 
     """docstring for TunnelOutEndpoint"""
 
-    def __init__(self, port, tunnel, peer_node_id, peer_port_id, trigger_loop):
+    def __init__(self, port, tunnel, peer_node_id, peer_port_id, trigger_loop, peer_capabilities=None, credit=None):
         super(TunnelOutEndpoint, self).__init__(port)
         self.tunnel = tunnel
         self.peer_id = peer_port_id
         self.peer_node_id = peer_node_id
         self.trigger_loop = trigger_loop
+        self.peer_capabilities = peer_capabilities or []
+        # Max number of tokens in each TOKEN_BATCH, only sent when the peer has the capability
+        self.batch_size = _conf.get(None, 'token_batch_size') or 1
+        if 'TOKEN_BATCH' not in self.peer_capabilities:
+            self.batch_size = 1
+        # Sequence number (exclusive) the peer has granted credit up to, None when not using credits
+        self.credit = credit if 'CREDIT' in self.peer_capabilities else None
         # Keep track of acked tokens, only contains something post call if acks comes out of order
         self.sequencenbrs_acked = []
         self.backoff = 0.0
         self.time_cont = 0.0
         self.bulk = True
+        # Sequence number and send time of the token timed for the link's round trip time, one at a time
+        self.timed = None
 
     def __str__(self):
         str = super(TunnelOutEndpoint, self).__str__()
@@ -260,8 +356,29 @@ class TunnelOutEndpoint(Endpoint):
     def is_connected(self):
         return True
 
-    def reply(self, sequencenbr, status):
+    def _mark_dirty(self):
+        if self.monitor is not None:
+            self.monitor.mark_dirty(self)
+
+    def grant_credit(self, credit):
+        """ The peer has free slots up to sequence number credit """
+        if self.credit is not None and credit is not None and credit > self.credit:
+            self.credit = credit
+            # Can send again
+            self._mark_dirty()
+            self.trigger_loop(actor_ids=[self.port.owner.id])
+
+    def _window(self):
+        # Number of tokens that can be sent now
+        available = self.port.fifo.available_tokens(self.peer_id)
+        if self.credit is None:
+            return available
+        return min(available, self.credit - self.port.fifo.tentative_read_pos[self.peer_id])
+
+    def reply(self, sequencenbr, status, credit=None):
         _log.debug("Reply on port %s/%s/%s [%i] %s" % (self.port.owner.name, self.peer_id, self.port.name, sequencenbr, status))
+        self.grant_credit(credit)
+        self._mark_dirty()
         if status == 'ACK':
             self._reply_ack(sequencenbr, status)
         elif status == 'NACK':
@@ -270,7 +387,51 @@ class TunnelOutEndpoint(Endpoint):
             # FIXME implement ABORT
             pass
 
+    def reply_batch(self, sequencenbr, ack, status, credit=None):
+        """ Cumulative reply on a TOKEN_BATCH, tokens sequencenbr to ack - 1 are ACKed and when status is 'NACK'
+            also the token ack is NACKed.
+        """
+        _log.debug("Reply on port %s/%s/%s [%i-%i] %s" % (self.port.owner.name, self.peer_id, self.port.name,
+                                                           sequencenbr, ack, status))
+        self.grant_credit(credit)
+        self._mark_dirty()
+        if status == 'ACK' or status == 'NACK':
+            if ack > sequencenbr:
+                self._reply_ack_batch(sequencenbr, ack)
+            if status == 'NACK':
+                self._reply_nack(ack, status)
+        else:
+            # FIXME implement ABORT
+            pass
+
+    def _ack_timed(self, sequencenbr, ack):
+        # Tokens sequencenbr to ack - 1 are ACKed
+        if self.timed is not None and sequencenbr <= self.timed[0] < ack:
+            self.tunnel.rtt_sample((time.time() - self.timed[1]) * 1000.0)
+            self.timed = None
+
+    def _reply_ack_batch(self, sequencenbr, ack):
+        self._ack_timed(sequencenbr, ack)
+        fifo = self.port.fifo
+        sequencenbr_sent = fifo.tentative_read_pos[self.peer_id]
+        # Back to full send speed directly
+        self.bulk = True
+        self.backoff = 0.0
+        if sequencenbr <= fifo.read_pos[self.peer_id]:
+            end = min(ack, sequencenbr_sent)
+            while fifo.read_pos[self.peer_id] < end:
+                fifo.commit_one_read(self.peer_id, True)
+            # Any ACKs that came in out of order before this one
+            while fifo.read_pos[self.peer_id] in self.sequencenbrs_acked:
+                self.sequencenbrs_acked.remove(fifo.read_pos[self.peer_id])
+                fifo.commit_one_read(self.peer_id, True)
+        else:
+            self.sequencenbrs_acked.extend(range(sequencenbr, min(ack, sequencenbr_sent)))
+        # Maybe someone can fill the fifo again
+        self.trigger_loop(actor_ids=[self.port.owner.id])
+
     def _reply_ack(self, sequencenbr, status):
+        self._ack_timed(sequencenbr, sequencenbr + 1)
         sequencenbr_sent = self.port.fifo.tentative_read_pos[self.peer_id]
         sequencenbr_acked = self.port.fifo.read_pos[self.peer_id]
         # Back to full send speed directly
@@ -282,7 +443,7 @@ class TunnelOutEndpoint(Endpoint):
             self.port.fifo.commit_one_read(self.peer_id, True)
             self.sequencenbrs_acked.remove(sequencenbr_acked)
         # Maybe someone can fill the fifo again
-        self.trigger_loop()
+        self.trigger_loop(actor_ids=[self.port.owner.id])
 
     def _reply_nack(self, sequencenbr, status):
         sequencenbr_sent = self.port.fifo.tentative_read_pos[self.peer_id]
@@ -293,14 +454,17 @@ class TunnelOutEndpoint(Endpoint):
             self.time_cont = curr_time
         if self.time_cont <= curr_time:
             # Need to trigger again due to either too late NACK or switched from series of ACK
-            self.trigger_loop()
+            self.trigger_loop(actor_ids=[self.port.owner.id])
         self.bulk = False
         self.backoff = min(1.0, 0.1 if self.backoff < 0.1 else self.backoff * 2.0)
 
         if sequencenbr < sequencenbr_sent and sequencenbr >= sequencenbr_acked:
             # Filter out ACK for later seq nbrs, should not happen but precaution
             self.sequencenbrs_acked = [n for n in self.sequencenbrs_acked if n < sequencenbr]
-            # Rollback fifo to the NACKed token
+            # Rollback fifo to the NACKed token, the tokens from it are sent again
+            self.tunnel.retransmitted(sequencenbr_sent - sequencenbr)
+            # The timed token may be among them, time a token sent from now on instead
+            self.timed = None
             while(self.port.fifo.tentative_read_pos[self.peer_id] > sequencenbr):
                 self.port.fifo.commit_one_read(self.peer_id, False)
 
@@ -312,6 +476,8 @@ class TunnelOutEndpoint(Endpoint):
                                                        self.port.name,
                                                        sequencenbr_sent,
                                                        "" if self.bulk else "@%f/%f" % (self.time_cont, self.backoff)))
+        if self.timed is None:
+            self.timed = (sequencenbr_sent, time.time())
         self.tunnel.send({
             'cmd': 'TOKEN',
             'token': token.encode(),
@@ -320,23 +486,52 @@ class TunnelOutEndpoint(Endpoint):
             'port_id': self.port.id
         })
 
+    def _send_token_batch(self, count):
+        fifo = self.port.fifo
+        sequencenbr = fifo.tentative_read_pos[self.peer_id]
+        tokens = [fifo.read(self.peer_id).encode() for _ in xrange(count)]
+        _log.debug("Send on port  %s/%s/%s [%i-%i]" % (self.port.owner.name,
+                                                       self.peer_id,
+                                                       self.port.name,
+                                                       sequencenbr,
+                                                       sequencenbr + len(tokens) - 1))
+        if self.timed is None:
+            self.timed = (sequencenbr, time.time())
+        self.tunnel.send({
+            'cmd': 'TOKEN_BATCH',
+            'tokens': tokens,
+            'peer_port_id': self.peer_id,
+            'sequencenbr': sequencenbr,
+            'port_id': self.port.id
+        })
+
     def communicate(self, *args, **kwargs):
         sent = False
         if self.bulk:
-            # Send all we have, since other side seems to keep up
-            while self.port.fifo.can_read(self.peer_id):
+            # Send all we have (and have credit for), since other side seems to keep up
+            window = self._window()
+            while window > 0:
                 sent = True
+                if self.batch_size > 1 and window > 1:
+                    count = min(window, self.batch_size)
+                    self._send_token_batch(count)
+                    window -= count
+                else:
+                    self._send_one_token()
+                    window -= 1
+        elif (self._window() > 0 and
+              self.port.fifo.tentative_read_pos[self.peer_id] == self.port.fifo.read_pos[self.peer_id]):
+            if time.time() >= self.time_cont:
+                # Send only one since other side sent NACK likely due to their FIFO is full
+                # Something to read and last (N)ACK recived
                 self._send_one_token()
-        elif (self.port.fifo.can_read(self.peer_id) and
-              self.port.fifo.tentative_read_pos[self.peer_id] == self.port.fifo.read_pos[self.peer_id] and
-              time.time() >= self.time_cont):
-            # Send only one since other side sent NACK likely due to their FIFO is full
-            # Something to read and last (N)ACK recived
-            self._send_one_token()
-            sent = True
-            self.time_cont = time.time() + self.backoff
-            # Make sure that resend will be tried in backoff seconds
-            self.trigger_loop(self.backoff)
+                sent = True
+                self.time_cont = time.time() + self.backoff
+                # Make sure that resend will be tried in backoff seconds
+                self.trigger_loop(self.backoff)
+            elif self.monitor is not None:
+                # Try again when the backoff has passed
+                self.monitor.mark_dirty_at(self, self.time_cont)
         return sent
 
     def get_peer(self):
@@ -14,6 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import heapq
+import time
+
 from calvin.utilities.calvinlogger import get_logger
 
 _log = get_logger(__name__)
@@ -21,18 +24,56 @@ _log = get_logger(__name__)
 
 class Event_Monitor(object):
 
+    """
+    Lets the out endpoints communicate, i.e. send their tokens, in the scheduler loop. Only the endpoints
+    that are dirty are visited. An endpoint is dirty when registered, when a token is written to its
+    port and when an ACK, NACK or credit arrives (see mark_dirty). An endpoint waiting out a backoff
+    is kept in a heap until its time (see mark_dirty_at).
+    """
+
     def __init__(self):
         super(Event_Monitor, self).__init__()
-        """docstring for __init__"""
-
         self.out_endpoints = []
+        self._registered = set()
+        self._dirty = set()
+        # (time, endpoint) of endpoints that become dirty at time
+        self._delayed = []
 
     def register_out_endpoint(self, endpoint):
         self.out_endpoints.append(endpoint)
+        self._registered.add(endpoint)
+        endpoint.monitor = self
+        # There might already be tokens to send, e.g. after a migration
+        self._dirty.add(endpoint)
 
     def unregister_out_endpoint(self, endpoint):
         self.out_endpoints.remove(endpoint)
+        self._registered.discard(endpoint)
+        self._dirty.discard(endpoint)
+        endpoint.monitor = None
+
+    def mark_dirty(self, endpoint):
+        self._dirty.add(endpoint)
+
+    def mark_dirty_at(self, endpoint, when):
+        heapq.heappush(self._delayed, (when, endpoint))
+
+    def next_due(self):
+        """ The time the first delayed endpoint becomes dirty, None when there is none """
+        return self._delayed[0][0] if self._delayed else None
 
     def loop(self, scheduler):
-        # Communicate endpoint, see if anyone sent anything
-        return any([endp.communicate() for endp in self.out_endpoints])
+        if self._delayed:
+            now = time.time()
+            while self._delayed and self._delayed[0][0] <= now:
+                _, endpoint = heapq.heappop(self._delayed)
+                if endpoint in self._registered:
+                    self._dirty.add(endpoint)
+        if not self._dirty:
+            return False
+        # Communicate endpoint, see if anyone sent anything. Endpoints marked during this go to the next loop.
+        dirty, self._dirty = self._dirty, set()
+        sent = False
+        for endp in dirty:
+            sent = endp.communicate() or sent
+        return sent
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+
+import trollius as asyncio
+
+from calvin.runtime.south.plugins.async import timerwheel
+from calvin.utilities.calvinlogger import get_logger
+from calvin.utilities import calvinconfig
+
+_log = get_logger(__name__)
+_conf = calvinconfig.get()
+
+# The runtime's event loop, set an event loop policy before the runtime starts to use another loop
+_loop = asyncio.get_event_loop()
+
+
+class TimerWheel(timerwheel.TimerWheel):
+
+    """ The runtime's timer wheel on the event loop """
+
+    def _call_later(self, delay, callback):
+        return _loop.call_later(delay, callback)
+
+
+_wheel = TimerWheel(_conf.get(None, 'timer_tick') or 0.01)
+
+
+class DelayedCall(object):
+
+    """
+    Calls callback after delay seconds, unless cancelled. Delays from a timer tick are kept in the
+    runtime's timer wheel (and rounded up to a whole tick), shorter ones get an event loop timer of their own.
+    """
+
+    def __init__(self, delay, callback, *args, **kwargs):
+        self._args = args
+        self._kwargs = kwargs
+        self.delay = delay
+        self.callback = callback
+        self.delayedCall = None
+        self._slot = None
+        self.reset()
+
+    def reset(self):
+        """ (Re)start the delay from now """
+        self.cancel()
+        if self.delay < _wheel.tick:
+            self.delayedCall = _loop.call_later(self.delay, self._fire_handle)
+        else:
+            _wheel.add(self, self.delay)
+
+    def _fire_handle(self):
+        # The event loop's handles can't tell if they have run
+        self.delayedCall = None
+        self._fire()
+
+    def _fire(self):
+        self.callback(*self._args, **self._kwargs)
+
+    def active(self):
+        if self.delayedCall is not None:
+            return True
+        return self._slot is not None
+
+    def cancel(self):
+        if self.delayedCall is not None:
+            self.delayedCall.cancel()
+            self.delayedCall = None
+        else:
+            _wheel.remove(self)
+
+
+def run_ioloop():
+    _loop.run_forever()
+
+
+def stop_ioloop():
+    _loop.stop()
+
+
+# Thread function
+call_from_thread = _loop.call_soon_threadsafe
+
+
+def _bind(type_, host, port):
+    # Bound at once, like the reactor's listen, so the port is known when this returns
+    family = socket.AF_INET6 if ':' in (host or '') else socket.AF_INET
+    sock = socket.socket(family, type_)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host or '', port))
+        sock.setblocking(False)
+    except:
+        sock.close()
+        raise
+    return sock
+
+
+class Listener(object):
+
+    """ A TCP server on the event loop, listening when created """
+
+    def __init__(self, protocol_factory, port, interface=''):
+        super(Listener, self).__init__()
+        sock = _bind(socket.SOCK_STREAM, interface, port)
+        self.port = sock.getsockname()[1]
+        self.path = None
+        self._server = None
+        self._stopped = False
+        starting = asyncio.ensure_future(_loop.create_server(protocol_factory, sock=sock), loop=_loop)
+        starting.add_done_callback(self._started)
+
+    def _started(self, starting):
+        if starting.cancelled():
+            return
+        if starting.exception() is not None:
+            _log.error("Failed to start listening on %s: %s" % (self.path or self.port, starting.exception()))
+            return
+        self._server = starting.result()
+        if self._stopped:
+            self._server.close()
+
+    def stop(self):
+        """ Stop listening, the connections already accepted are kept """
+        self._stopped = True
+        if self._server is not None:
+            self._server.close()
+
+
+class UnixListener(Listener):
+
+    """ A Unix domain socket server on the event loop, listening on path when created """
+
+    def __init__(self, protocol_factory, path):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.bind(path)
+            sock.setblocking(False)
+        except:
+            sock.close()
+            raise
+        self.port = None
+        self.path = path
+        self._server = None
+        self._stopped = False
+        starting = asyncio.ensure_future(_loop.create_unix_server(protocol_factory, sock=sock), loop=_loop)
+        starting.add_done_callback(self._started)
+
+    def stop(self):
+        """ Stop listening and remove the socket file, the connections already accepted are kept """
+        super(UnixListener, self).stop()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+def _report(what, failed):
+    def done(future):
+        if future.cancelled() or future.exception() is None:
+            return
+        if failed is None:
+            _log.error("%s failed: %s" % (what, future.exception()))
+        else:
+            failed(future.exception())
+    return done
+
+
+def connect_tcp(protocol_factory, host, port, failed=None, ssl=None):
+    """
+    Connect to host:port, returns the future of the (transport, protocol) pair. The connection error
+    is passed to failed, when given, else logged.
+    """
+    connecting = asyncio.ensure_future(_loop.create_connection(protocol_factory, host, port, ssl=ssl), loop=_loop)
+    connecting.add_done_callback(_report("Connect to %s:%s" % (host, port), failed))
+    return connecting
+
+
+def connect_unix(protocol_factory, path, failed=None):
+    """ Connect to the Unix domain socket path, as connect_tcp """
+    connecting = asyncio.ensure_future(_loop.create_unix_connection(protocol_factory, path), loop=_loop)
+    connecting.add_done_callback(_report("Connect to %s" % path, failed))
+    return connecting
+
+
+def open_udp(protocol_factory, local_addr=None, remote_addr=None):
+    """ Returns the future of the (transport, protocol) pair of a datagram endpoint """
+    opening = asyncio.ensure_future(_loop.create_datagram_endpoint(protocol_factory, local_addr=local_addr,
+                                                                   remote_addr=remote_addr), loop=_loop)
+    opening.add_done_callback(_report("Datagram endpoint %s %s" % (local_addr, remote_addr), None))
+    return opening
+
+
+def close_transport(future):
+    """ Close the transport of a (transport, protocol) future, when it is done """
+    def close(future):
+        if not future.cancelled() and future.exception() is None:
+            future.result()[0].close()
+    if future.done():
+        close(future)
+    else:
+        future.add_done_callback(close)
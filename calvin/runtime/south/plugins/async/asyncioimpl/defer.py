@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# The deferreds are plain callback chains, they don't use the reactor and are shared with twistedimpl
+from twisted.internet import defer
+
+# Some callbacks functionallity
+# Defereds
+Deferred = defer.Deferred
+DeferredList = defer.DeferredList
+
+inline_callbacks = defer.inlineCallbacks
+maybe_deferred = defer.maybeDeferred
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import errno
+import fcntl
+import os
+import stat
+import sys
+
+from calvin.runtime.south.plugins.async.asyncioimpl.async import _loop
+
+# Regular files can't be watched by the selector, they are always ready and are polled instead
+_POLL_INTERVAL = 0.01
+_READ_SIZE = 8192
+
+
+class FD(object):
+    """A Calvin file object"""
+    def __init__(self, trigger, fname, mode):
+        super(FD, self).__init__()
+        self.trigger = trigger
+        self.connected = True
+        self.data = b""
+        self._buffer = b""
+        self._reading = None
+        self._writing = None
+        self._closing = False
+        self._init_fp(fname, mode)
+        fd = self.fileno()
+        fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+
+    def _init_fp(self, fname, mode):
+        self.fp = open(fname, mode, buffering=2048)
+        self._regular = stat.S_ISREG(os.fstat(self.fp.fileno()).st_mode)
+
+        if "r" in mode:
+            # In order to determine when we have reached EOF
+            self.filelen = os.path.getsize(fname)
+            self.totalread = 0
+            self.startReading()
+
+    def fileno(self):
+        return self.fp.fileno()
+
+    def startReading(self):
+        if self._reading is not None:
+            return
+        if self._regular:
+            self._reading = _loop.call_soon(self._poll)
+        else:
+            self._reading = True
+            _loop.add_reader(self.fileno(), self.doRead)
+
+    def stopReading(self):
+        if self._reading is None:
+            return
+        if self._regular:
+            self._reading.cancel()
+        else:
+            _loop.remove_reader(self.fileno())
+        self._reading = None
+
+    def _poll(self):
+        self._reading = _loop.call_later(_POLL_INTERVAL, self._poll)
+        self.doRead()
+
+    def startWriting(self):
+        if self._writing is not None:
+            return
+        if self._regular:
+            self._writing = _loop.call_soon(self._flush)
+        else:
+            self._writing = True
+            _loop.add_writer(self.fileno(), self.doWrite)
+
+    def stopWriting(self):
+        if self._writing is None:
+            return
+        if self._regular:
+            self._writing.cancel()
+        else:
+            _loop.remove_writer(self.fileno())
+        self._writing = None
+
+    def _flush(self):
+        self._writing = None
+        self.doWrite()
+        if self._buffer:
+            self.startWriting()
+
+    def write(self, data):
+        if not self.connected or self._closing:
+            return
+        self._buffer += data
+        self.startWriting()
+
+    def writeSomeData(self, data):
+        try:
+            return os.write(self.fileno(), data)
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EINTR):
+                return 0
+            raise
+
+    def doWrite(self):
+        written = self.writeSomeData(self._buffer)
+        self._buffer = self._buffer[written:]
+        if not self._buffer:
+            self.stopWriting()
+            if self._closing:
+                self._close()
+
+    def writeLine(self, data):
+        self.write(data + "\n")
+
+    def dataRead(self, data):
+        self.totalread += len(data)
+        self.data += data
+
+    def doRead(self):
+        self.trigger()
+        try:
+            data = os.read(self.fileno(), _READ_SIZE)
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EINTR):
+                return
+            raise
+        if not data:
+            # End of file, nothing more to read
+            self.stopReading()
+            return
+        self.dataRead(data)
+
+    def hasData(self):
+        return len(self.data)
+
+    def endOfFile(self):
+        """No buffered data, and we have read the entire file, EOF"""
+        return len(self.data) == 0 and self.totalread == self.filelen
+
+    def readLine(self):
+        """Return the first line of the buffer"""
+        line, _, self.data = self.data.partition("\n")
+        return line
+
+    def close(self):
+        """Close when all written data is flushed"""
+        self.stopReading()
+        if self._buffer:
+            self._closing = True
+        else:
+            self._close()
+
+    def _close(self):
+        self.stopWriting()
+        self.connected = False
+        self.fp.close()
+
+    def read(self):
+        """Get buffered data"""
+        data = self.data
+        self.data = b""
+        return data
+
+
+class FDStdIn(FD):
+    def __init__(self, trigger):
+        super(FDStdIn, self).__init__(trigger, None, None)
+
+    def _init_fp(self, *args):
+        self.fp = sys.stdin
+        self._regular = stat.S_ISREG(os.fstat(self.fp.fileno()).st_mode)
+        self.totalread = 0
+        self.startReading()
+
+    def endOfFile(self):
+        """Continue listening on StdIn"""
+        return False
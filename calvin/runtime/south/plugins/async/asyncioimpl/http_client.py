@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from urllib import urlencode
+from urlparse import urlsplit
+try:
+    import ssl
+    HAS_OPENSSL = True
+except:
+    # Probably no OpenSSL available.
+    HAS_OPENSSL = False
+
+from calvin.runtime.south.plugins.async.asyncioimpl import async
+from calvin.runtime.south.plugins.async.asyncioimpl.protocol import Protocol, Adapter
+from calvin.utilities.calvin_callback import CalvinCBClass
+
+
+class HTTPRequest(object):
+    def __init__(self):
+        self._response = {}
+
+    def parse_headers(self, head):
+        """ Parse the status line and the headers of a response """
+        lines = head.split("\r\n")
+        version, status, phrase = (lines[0].split(" ", 2) + [""])[:3]
+        self._response = {}
+        self._response['version'] = version
+        self._response['status'] = int(status)
+        self._response['phrase'] = phrase
+        self._response['headers'] = {}
+        for line in lines[1:]:
+            hdr, _, val = line.partition(":")
+            self._response['headers'].setdefault(hdr.strip().lower(), val.strip())
+
+    def parse_body(self, body):
+        self._response['body'] = body
+
+    def body(self):
+        return self._response.get('body', None)
+
+    def headers(self):
+        return self._response.get('headers', None)
+
+    def status(self):
+        return self._response.get('status', None)
+
+    def version(self):
+        return self._response.get('version', None)
+
+    def phrase(self):
+        return self._response.get('phrase', None)
+
+
+def encode_params(params):
+    if params:
+        return "?" + urlencode(params)
+    return ""
+
+
+def encode_headers(headers):
+    lines = []
+    for k, v in headers.items():
+        key = k.encode('ascii', 'ignore')
+        val = v.encode('ascii', 'ignore')
+        lines.append("%s: %s\r\n" % (key, val))
+    return "".join(lines)
+
+
+def encode_body(data):
+    if not data:
+        return ""
+    if not isinstance(data, str):
+        return ""
+    return data
+
+
+class ResponseReader(Protocol):
+
+    """ Sends a request and reads the response, the body ends when the server closes the connection """
+
+    def __init__(self, message, request, receive_headers, receive_body):
+        self.message = message
+        self.request = request
+        self.receive_headers = receive_headers
+        self.receive_body = receive_body
+        self.data = ""
+        self.head = None
+
+    def connectionMade(self):
+        self.transport.write(self.message)
+
+    def dataReceived(self, bytes):
+        self.data += bytes
+        if self.head is None:
+            head, delimiter, body = self.data.partition("\r\n\r\n")
+            if delimiter:
+                self.head = head
+                self.data = body
+                self.receive_headers(head, self.request)
+
+    def connectionLost(self, reason):
+        if self.head is not None:
+            self.receive_body(self.data, self.request)
+
+
+class HTTPClient(CalvinCBClass):
+
+    def __init__(self, callbacks=None):
+        super(HTTPClient, self).__init__(callbacks)
+        # TODO: enable certificate verification, hostname checking
+        self._ssl = ssl.SSLContext(ssl.PROTOCOL_SSLv23) if HAS_OPENSSL else None
+
+    def _receive_headers(self, head, request):
+        request.parse_headers(head)
+        self._callback_execute('receive-headers', request)
+
+    def _receive_body(self, body, request):
+        request.parse_body(body)
+        self._callback_execute('receive-body', request)
+
+    def request(self, command, url, params, headers, data):
+        url += encode_params(params)
+        parts = urlsplit(url)
+        secure = parts.scheme == "https"
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        body = encode_body(data)
+        # HTTP/1.0, hence the response is neither chunked nor kept alive
+        message = "%s %s HTTP/1.0\r\nHost: %s\r\n" % (command, path, parts.netloc)
+        message += encode_headers(headers)
+        if body:
+            message += "Content-Length: %d\r\n" % len(body)
+        message += "\r\n" + body
+        request = HTTPRequest()
+        reader = ResponseReader(message, request, self._receive_headers, self._receive_body)
+        async.connect_tcp(lambda: Adapter(lambda addr: reader), parts.hostname, parts.port or (443 if secure else 80),
+                          ssl=self._ssl if secure else None)
+        return request
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Twisted style protocols on the event loop.
+
+The runtime's protocols are written against twisted's protocol callbacks (connectionMade, dataReceived,
+connectionLost, ...), here they get them from the event loop through an Adapter. The transport of a
+protocol is the event loop's transport (write, writelines, close and get_extra_info), with the writes
+of a loop iteration sent together as the reactor does.
+As twisted's, the protocols and factories are classic classes.
+"""
+
+import struct
+
+import trollius as asyncio
+
+from calvin.runtime.south.plugins.async.asyncioimpl.async import _loop
+
+
+class Protocol:
+
+    transport = None
+
+    def makeConnection(self, transport):
+        self.transport = transport
+        self.connectionMade()
+
+    def connectionMade(self):
+        pass
+
+    def dataReceived(self, data):
+        pass
+
+    def connectionLost(self, reason):
+        pass
+
+
+class Factory:
+
+    def buildProtocol(self, addr):
+        raise NotImplementedError()
+
+
+class BufferedTransport(object):
+
+    """ Collects the writes to transport and sends them in one write when the loop gets to it """
+
+    def __init__(self, transport):
+        super(BufferedTransport, self).__init__()
+        self._transport = transport
+        self._parts = []
+
+    def write(self, data):
+        if not self._parts:
+            _loop.call_soon(self._flush)
+        self._parts.append(data)
+
+    def writelines(self, parts):
+        if not self._parts:
+            _loop.call_soon(self._flush)
+        self._parts.extend(parts)
+
+    def _flush(self):
+        if self._parts:
+            data = b''.join(self._parts)
+            self._parts = []
+            self._transport.write(data)
+
+    def close(self):
+        self._flush()
+        self._transport.close()
+
+    def get_extra_info(self, name, default=None):
+        return self._transport.get_extra_info(name, default)
+
+
+class Adapter(asyncio.Protocol):
+
+    """ Passes the event loop's callbacks on to the protocol built by build(addr) when connected """
+
+    def __init__(self, build):
+        super(Adapter, self).__init__()
+        self._build = build
+        self.protocol = None
+
+    def connection_made(self, transport):
+        self.protocol = self._build(transport.get_extra_info('peername'))
+        self.protocol.makeConnection(BufferedTransport(transport))
+
+    def data_received(self, data):
+        self.protocol.dataReceived(data)
+
+    def connection_lost(self, exc):
+        self.protocol.connectionLost(exc)
+
+
+class DatagramAdapter(asyncio.DatagramProtocol):
+
+    """ Passes the received datagrams on to protocol.datagramReceived """
+
+    def __init__(self, protocol):
+        super(DatagramAdapter, self).__init__()
+        self.protocol = protocol
+
+    def connection_made(self, transport):
+        self.protocol.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.protocol.datagramReceived(data, addr[:2])
+
+    def connection_lost(self, exc):
+        self.protocol.transport = None
+        self.protocol.connectionLost(exc)
+
+
+class LineReceiver(Protocol):
+
+    """ Receives lines ending with delimiter, or raw data in raw mode """
+
+    line_mode = 1
+    delimiter = b'\r\n'
+    MAX_LENGTH = 16384
+    _buffer = b''
+
+    def clearLineBuffer(self):
+        data, self._buffer = self._buffer, b''
+        return data
+
+    def dataReceived(self, data):
+        self._buffer += data
+        while self._buffer:
+            if not self.line_mode:
+                self.rawDataReceived(self.clearLineBuffer())
+                return
+            line, delimiter, rest = self._buffer.partition(self.delimiter)
+            if not delimiter:
+                if len(self._buffer) > self.MAX_LENGTH:
+                    self.lineLengthExceeded(self.clearLineBuffer())
+                return
+            self._buffer = rest
+            if len(line) > self.MAX_LENGTH:
+                self.lineLengthExceeded(line)
+                return
+            self.lineReceived(line)
+
+    def setLineMode(self, extra=b''):
+        self.line_mode = 1
+        if extra:
+            self.dataReceived(extra)
+
+    def setRawMode(self):
+        self.line_mode = 0
+
+    def rawDataReceived(self, data):
+        raise NotImplementedError()
+
+    def lineReceived(self, line):
+        raise NotImplementedError()
+
+    def sendLine(self, line):
+        self.transport.write(line + self.delimiter)
+
+    def lineLengthExceeded(self, line):
+        self.transport.close()
+
+
+class IntNStringReceiver(Protocol):
+
+    """
+    Receives strings prefixed by their length. The data of a string is collected until it is complete,
+    and joined once, hence large strings arriving in many pieces are not copied over and over.
+    """
+
+    structFormat = None
+    prefixLength = None
+    MAX_LENGTH = 99999
+
+    def makeConnection(self, transport):
+        self._chunks = []
+        self._size = 0
+        self._needed = self.prefixLength
+        Protocol.makeConnection(self, transport)
+
+    def dataReceived(self, data):
+        self._chunks.append(data)
+        self._size += len(data)
+        if self._size < self._needed:
+            return
+        data = b''.join(self._chunks) if len(self._chunks) > 1 else self._chunks[0]
+        offset = 0
+        end = len(data)
+        prefix = self.prefixLength
+        self._needed = prefix
+        while end - offset >= prefix:
+            length, = struct.unpack_from(self.structFormat, data, offset)
+            if length > self.MAX_LENGTH:
+                self._chunks = []
+                self._size = 0
+                self.lengthLimitExceeded(length)
+                return
+            if end - offset - prefix < length:
+                self._needed = prefix + length
+                break
+            offset += prefix
+            self.stringReceived(data[offset:offset + length])
+            offset += length
+        rest = data[offset:] if offset else data
+        self._chunks = [rest] if rest else []
+        self._size = len(rest)
+
+    def stringReceived(self, string):
+        raise NotImplementedError()
+
+    def lengthLimitExceeded(self, length):
+        self.transport.close()
+
+    def sendString(self, string):
+        self.transport.write(struct.pack(self.structFormat, len(string)) + string)
+
+
+class Int32StringReceiver(IntNStringReceiver):
+    structFormat = "!I"
+    prefixLength = struct.calcsize(structFormat)
+
+
+class Int16StringReceiver(IntNStringReceiver):
+    structFormat = "!H"
+    prefixLength = struct.calcsize(structFormat)
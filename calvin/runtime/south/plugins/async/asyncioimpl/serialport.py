@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import serial
+
+from calvin.runtime.south.plugins.async.asyncioimpl.async import _loop
+
+_READ_SIZE = 1024
+
+
+class SP(object):
+
+    """A Calvin serialport object"""
+
+    def __init__(self, devicename, baudrate, bytesize, parity, stopbits, timeout, xonxoff, rtscts, trigger, actor_id):
+        self._trigger  = trigger
+        self._actor_id = actor_id
+        self._data = b""
+        # Non blocking, the event loop tells when there is data
+        self._port = serial.Serial(devicename, baudrate, bytesize, parity, stopbits, 0, xonxoff, rtscts)
+        _loop.add_reader(self._port.fileno(), self._read)
+
+    def _read(self):
+        self._data += self._port.read(_READ_SIZE)
+        self.trigger()
+
+    def trigger(self):
+        self._trigger(actor_ids=[self._actor_id])
+
+    def write(self, data):
+        self._port.write(data)
+
+    def read(self):
+        data = self._data
+        self._data = b""
+        return data
+
+    def hasData(self):
+        return len(self._data)
+
+    def close(self):
+        _loop.remove_reader(self._port.fileno())
+        self._port.close()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+
+import pytest
+
+from calvin.runtime.south.plugins.async.asyncioimpl import async, threads
+from calvin.runtime.south.plugins.async.asyncioimpl import server_connection, client_connection
+from calvin.runtime.south.plugins.async.asyncioimpl.protocol import LineReceiver, Int32StringReceiver
+from calvin.utilities.calvin_callback import CalvinCB
+
+pytestmark = pytest.mark.unittest
+
+
+class Transport(object):
+
+    def __init__(self):
+        self.written = []
+        self.closed = False
+
+    def write(self, data):
+        self.written.append(data)
+
+    def close(self):
+        self.closed = True
+
+
+class Lines(LineReceiver):
+
+    def __init__(self):
+        self.lines = []
+        self.raw = []
+
+    def lineReceived(self, line):
+        self.lines.append(line)
+        if line == "raw":
+            self.setRawMode()
+
+    def rawDataReceived(self, data):
+        self.raw.append(data)
+
+
+class Strings(Int32StringReceiver):
+
+    def __init__(self):
+        self.strings = []
+
+    def stringReceived(self, string):
+        self.strings.append(string)
+
+
+def run_loop(seconds, until):
+    """ Run the event loop until until() is true, or for at most seconds """
+    def check():
+        if until():
+            async.stop_ioloop()
+        else:
+            async.DelayedCall(0.01, check)
+    async.DelayedCall(0.01, check)
+    timeout = async.DelayedCall(seconds, async.stop_ioloop)
+    async.run_ioloop()
+    timeout.cancel()
+
+
+def test_line_receiver():
+    lines = Lines()
+    lines.makeConnection(Transport())
+    lines.dataReceived("a\r\nb")
+    assert lines.lines == ["a"]
+    lines.dataReceived("\r\nraw\r\nc\r\n")
+    assert lines.lines == ["a", "b", "raw"]
+    assert lines.raw == ["c\r\n"]
+    lines.setLineMode("d\r\n")
+    assert lines.lines == ["a", "b", "raw", "d"]
+
+
+def test_string_receiver_in_pieces():
+    strings = Strings()
+    strings.makeConnection(Transport())
+    frames = struct.pack("!I", 3) + "abc" + struct.pack("!I", 50000) + "x" * 50000 + struct.pack("!I", 0)
+    for i in range(0, len(frames), 1000):
+        strings.dataReceived(frames[i:i + 1000])
+    assert strings.strings == ["abc", "x" * 50000, ""]
+
+
+def test_string_receiver_limit():
+    strings = Strings()
+    strings.makeConnection(Transport())
+    strings.dataReceived(struct.pack("!I", strings.MAX_LENGTH + 1))
+    assert strings.transport.closed
+
+
+def test_timers_and_threads():
+    fired = []
+    async.DelayedCall(0, fired.append, "short")
+    async.DelayedCall(0.05, fired.append, "wheel")
+    cancelled = async.DelayedCall(0.05, fired.append, "cancelled")
+    cancelled.cancel()
+    threads.defer_to_thread(lambda: 6 * 7).addCallback(fired.append)
+    run_loop(2, lambda: len(fired) == 3)
+    assert sorted(fired) == [42, "short", "wheel"]
+    assert not cancelled.active()
+
+
+def test_line_server_and_client():
+    server = server_connection.ServerProtocolFactory(lambda actor_ids: None, 'line', actor_id="actor")
+    server.start('127.0.0.1', 0)
+    received = []
+    client = client_connection.TCPClientProtocolFactory('delimiter', callbacks={
+        'data_received': [CalvinCB(received.append)]})
+    client.callback_register('connected', CalvinCB(lambda addr: client.send("hello")))
+    client.connect('127.0.0.1', server._port.port)
+
+    def echo():
+        for _, connection in server.pending_connections:
+            if connection.data_available:
+                connection.send(connection.data_get().upper())
+        return received
+    try:
+        run_loop(5, echo)
+        assert received == ["HELLO"]
+    finally:
+        client.disconnect()
+        server.stop()
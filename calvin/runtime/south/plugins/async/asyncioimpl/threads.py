@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent import futures
+
+from twisted.python.failure import Failure
+
+from calvin.runtime.south.plugins.async.asyncioimpl.async import call_from_thread
+from calvin.runtime.south.plugins.async.asyncioimpl.defer import Deferred
+
+
+def _run(executor, f, *args, **kwargs):
+    # The result is delivered on the event loop, as a deferred
+    deferred = Deferred()
+
+    def call():
+        try:
+            result = f(*args, **kwargs)
+        except:
+            call_from_thread(deferred.errback, Failure())
+        else:
+            call_from_thread(deferred.callback, result)
+    executor.submit(call)
+    return deferred
+
+
+_executor = None
+
+
+def defer_to_thread(f, *args, **kwargs):
+    global _executor
+    if _executor is None:
+        _executor = futures.ThreadPoolExecutor(max_workers=10)
+    return _run(_executor, f, *args, **kwargs)
+
+
+def call_multiple_in_thread(tupleList):
+    def call():
+        for f, args, kwargs in tupleList:
+            f(*args, **kwargs)
+    defer_to_thread(call)
+
+
+class ThreadPool(object):
+
+    """ A pool of at most size worker threads, started on first use """
+
+    def __init__(self, size, name=None):
+        super(ThreadPool, self).__init__()
+        self._size = size
+        self._executor = None
+
+    def defer_to_thread(self, f, *args, **kwargs):
+        """ Returns a deferred firing with the result of f(*args, **kwargs) run in one of the pool's threads """
+        if self._executor is None:
+            self._executor = futures.ThreadPoolExecutor(max_workers=self._size)
+        return _run(self._executor, f, *args, **kwargs)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import math
+import time
+
+from calvin.utilities.calvinlogger import get_logger
+
+_log = get_logger(__name__)
+
+# Slots per level of the timer wheel, level n slots are 64**n ticks
+_BITS = 6
+_SLOTS = 1 << _BITS
+_MASK = _SLOTS - 1
+_LEVELS = 4
+_SPAN = [_SLOTS ** level for level in range(_LEVELS + 1)]
+
+
+class TimerWheel(object):
+
+    """
+    Hierarchical timer wheel shared by all the runtime's timers, with one event loop timer for the next tick
+    that has timers due, i.e. at most one event loop callback per tick. The frameworks provide the event
+    loop timer, see _call_later.
+    A timer is placed by its expiry tick in the lowest level that covers it. Level 0 has a slot per tick,
+    the slots of a higher level are moved down (cascaded) a level when the wheel turns to them. Timers
+    fire in the order they were added within a tick, rounded up to whole ticks, never early.
+    """
+
+    def __init__(self, tick, clock=time.time):
+        super(TimerWheel, self).__init__()
+        self.tick = tick
+        self.clock = clock
+        self.current = 0
+        self.count = 0
+        self._levels = [[set() for _ in xrange(_SLOTS)] for _ in xrange(_LEVELS)]
+        self._sequence = itertools.count()
+        # The event loop timer and the tick it is set for
+        self._call = None
+        self._wake = None
+        # The timer being fired, a repeating timer is added again from its callback
+        self._firing = None
+
+    def add(self, timer, delay):
+        if timer is self._firing:
+            # Keep the pace of a repeating timer, counting from when it was due
+            now = timer._expires
+        else:
+            now = self.clock() / self.tick
+        if not self.count:
+            # Nothing to keep the position for
+            self.current = int(now)
+        timer._expires = max(int(math.ceil(now + delay / self.tick)), self.current + 1)
+        timer._order = next(self._sequence)
+        self._place(timer)
+        self.count += 1
+        self._schedule()
+
+    def remove(self, timer):
+        if timer._slot is None:
+            return
+        timer._slot.discard(timer)
+        timer._slot = None
+        self.count -= 1
+        if not self.count and self._call is not None:
+            self._call.cancel()
+            self._call = None
+
+    def _place(self, timer):
+        delta = timer._expires - self.current
+        for level in xrange(_LEVELS):
+            if delta < _SPAN[level + 1]:
+                expires = timer._expires
+                break
+        else:
+            # Beyond the wheel, placed at its far end and placed again from there
+            expires = self.current + _SPAN[_LEVELS] - 1
+        timer._slot = self._levels[level][(expires >> (_BITS * level)) & _MASK]
+        timer._slot.add(timer)
+
+    def _lowest_level(self):
+        for level in xrange(_LEVELS):
+            if any(self._levels[level]):
+                return level
+        return None
+
+    def advance(self, tick):
+        """ Turn the wheel up to tick, firing the timers due """
+        while self.current < tick:
+            level = self._lowest_level()
+            if level is None:
+                self.current = tick
+                return
+            if level:
+                # Nothing due before the next cascade from that level
+                self.current = min(tick, self.current | (_SPAN[level] - 1))
+                if self.current == tick:
+                    return
+            self.current += 1
+            if not self.current & _MASK:
+                for level in xrange(1, _LEVELS):
+                    index = (self.current >> (_BITS * level)) & _MASK
+                    self._cascade(level, index)
+                    if index:
+                        break
+            slot = self._levels[0][self.current & _MASK]
+            if not slot:
+                continue
+            timers = sorted(slot, key=lambda timer: timer._order)
+            slot.clear()
+            self.count -= len(timers)
+            for timer in timers:
+                timer._slot = None
+                self._firing = timer
+                try:
+                    timer._fire()
+                except Exception:
+                    _log.exception("Timer callback failed")
+            self._firing = None
+
+    def _cascade(self, level, index):
+        slot = self._levels[level][index]
+        timers = list(slot)
+        slot.clear()
+        for timer in timers:
+            self._place(timer)
+
+    def _cascades(self, tick):
+        # Does turning to tick move any timers down
+        for level in xrange(1, _LEVELS):
+            index = (tick >> (_BITS * level)) & _MASK
+            if self._levels[level][index]:
+                return True
+            if index:
+                return False
+        return False
+
+    def _next_tick(self):
+        # The next tick with timers in level 0 or timers to cascade, else the next cascade of the lowest level
+        for tick in xrange(self.current + 1, self.current + _SLOTS + 1):
+            if self._levels[0][tick & _MASK] or (not tick & _MASK and self._cascades(tick)):
+                return tick
+        level = self._lowest_level() or 1
+        return (self.current | (_SPAN[level] - 1)) + 1
+
+    def _schedule(self):
+        wake = self._next_tick()
+        if self._call is not None:
+            if self._wake <= wake:
+                return
+            self._call.cancel()
+        self._wake = wake
+        self._call = self._call_later(max(0.0, wake * self.tick - self.clock()), self._run)
+
+    def _call_later(self, delay, callback):
+        """ Returns an event loop timer calling callback after delay seconds, with a cancel method """
+        raise NotImplementedError()
+
+    def _run(self):
+        self._call = None
+        self.advance(max(int(self.clock() / self.tick), self._wake))
+        if self.count:
+            self._schedule()
@@ -15,23 +15,62 @@
 # limitations under the License.
 
 from twisted.internet import reactor
+from calvin.runtime.south.plugins.async import timerwheel
+from calvin.utilities import calvinconfig
+
+_conf = calvinconfig.get()
+
+
+class TimerWheel(timerwheel.TimerWheel):
+
+    """ The runtime's timer wheel on the reactor """
+
+    def _call_later(self, delay, callback):
+        return reactor.callLater(delay, callback)
+
+
+_wheel = TimerWheel(_conf.get(None, 'timer_tick') or 0.01)
 
 
 class DelayedCall(object):
 
+    """
+    Calls callback after delay seconds, unless cancelled. Delays from a timer tick are kept in the
+    runtime's timer wheel (and rounded up to a whole tick), shorter ones get a reactor timer of their own.
+    """
+
     def __init__(self, delay, callback, *args, **kwargs):
         self._args = args
         self._kwargs = kwargs
         self.delay = delay
         self.callback = callback
+        self.delayedCall = None
+        self._slot = None
         self.reset()
 
     def reset(self):
-        self.delayedCall = reactor.callLater(self.delay, self.callback, *self._args, **self._kwargs)
+        """ (Re)start the delay from now """
+        self.cancel()
+        if self.delay < _wheel.tick:
+            self.delayedCall = reactor.callLater(self.delay, self.callback, *self._args, **self._kwargs)
+        else:
+            _wheel.add(self, self.delay)
+
+    def _fire(self):
+        self.callback(*self._args, **self._kwargs)
+
+    def active(self):
+        if self.delayedCall is not None:
+            return self.delayedCall.active()
+        return self._slot is not None
 
     def cancel(self):
-        if self.delayedCall.active():
-            self.delayedCall.cancel()
+        if self.delayedCall is not None:
+            if self.delayedCall.active():
+                self.delayedCall.cancel()
+            self.delayedCall = None
+        else:
+            _wheel.remove(self)
 
 
 def run_ioloop():
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from calvin.runtime.south.plugins.async.twistedimpl.async import TimerWheel
+
+pytestmark = pytest.mark.unittest
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Timer(object):
+
+    def __init__(self, name, fired):
+        self.name = name
+        self.fired = fired
+        self._slot = None
+
+    def _fire(self):
+        self.fired.append(self.name)
+
+
+@pytest.fixture
+def wheel(request):
+    wheel = TimerWheel(0.01, Clock())
+    request.addfinalizer(lambda: wheel._call and wheel._call.cancel())
+    return wheel
+
+
+def turn(wheel, seconds):
+    """ Move the clock and the wheel seconds ahead """
+    wheel.clock.now += seconds
+    wheel.advance(int(wheel.clock.now / wheel.tick))
+
+
+def test_timers_fire_in_order_and_never_early(wheel):
+    fired = []
+    timers = [Timer(name, fired) for name in ("a", "b", "c", "d", "e")]
+    wheel.add(timers[0], 0.05)
+    wheel.add(timers[1], 0.05)
+    wheel.add(timers[2], 1.0)
+    # Level 2 of the wheel
+    wheel.add(timers[3], 100.0)
+    # Beyond the wheel
+    wheel.add(timers[4], 200000.0)
+    assert wheel.count == 5
+
+    turn(wheel, 0.04)
+    assert fired == []
+    turn(wheel, 0.01)
+    assert fired == ["a", "b"]
+    turn(wheel, 0.94)
+    assert fired == ["a", "b"]
+    turn(wheel, 0.01)
+    assert fired == ["a", "b", "c"]
+    turn(wheel, 98.99)
+    assert fired == ["a", "b", "c"]
+    turn(wheel, 0.02)
+    assert fired == ["a", "b", "c", "d"]
+    turn(wheel, 199899.0)
+    assert fired == ["a", "b", "c", "d"]
+    turn(wheel, 1.0)
+    assert fired == ["a", "b", "c", "d", "e"]
+    assert wheel.count == 0
+
+
+def test_removed_timer_does_not_fire(wheel):
+    fired = []
+    timers = [Timer(name, fired) for name in ("a", "b")]
+    wheel.add(timers[0], 3.0)
+    wheel.add(timers[1], 3.0)
+    wheel.remove(timers[0])
+    wheel.remove(timers[0])
+    assert wheel.count == 1
+    turn(wheel, 3.0)
+    assert fired == ["b"]
+    assert wheel._call is not None
+
+
+def test_one_reactor_timer_for_the_next_tick(wheel):
+    fired = []
+    wheel.add(Timer("a", fired), 0.5)
+    call = wheel._call
+    assert wheel._wake == wheel.current + 50
+    # Long timers need a wake up when they move down the wheel only
+    wheel.add(Timer("d", fired), 100.0)
+    assert wheel._call is call
+    # A later timer keeps the reactor timer, an earlier one replaces it
+    wheel.add(Timer("b", fired), 0.6)
+    assert wheel._call is call
+    wheel.add(Timer("c", fired), 0.1)
+    assert wheel._call is not call
+    assert wheel._wake == wheel.current + 10
+
+
+def test_repeating_timer_keeps_pace(wheel):
+    fired = []
+
+    class Repeating(Timer):
+        def _fire(self):
+            self.fired.append(wheel.current)
+            wheel.add(self, 0.1)
+
+    wheel.add(Repeating("a", fired), 0.1)
+    start = wheel.current
+    # The wheel turns late
+    turn(wheel, 0.125)
+    turn(wheel, 0.125)
+    turn(wheel, 0.125)
+    assert [tick - start for tick in fired] == [10, 20, 30]
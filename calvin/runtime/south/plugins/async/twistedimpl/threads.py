@@ -14,10 +14,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from twisted.internet import threads
+from twisted.internet import reactor, threads
+from twisted.python import threadpool
 
 # Some callbacks functionallity
 # Thread function
 defer_to_thread = threads.deferToThread
 call_multiple_in_thread = threads.callMultipleInThread
 
+
+class ThreadPool(object):
+
+    """ A pool of at most size worker threads, started on first use and stopped with the reactor """
+
+    def __init__(self, size, name=None):
+        super(ThreadPool, self).__init__()
+        self._pool = threadpool.ThreadPool(minthreads=0, maxthreads=size, name=name)
+
+    def defer_to_thread(self, f, *args, **kwargs):
+        """ Returns a deferred firing with the result of f(*args, **kwargs) run in one of the pool's threads """
+        if not self._pool.started:
+            self._pool.start()
+            reactor.addSystemEventTrigger('during', 'shutdown', self._pool.stop)
+        return threads.deferToThreadPool(reactor, self._pool, f, *args, **kwargs)
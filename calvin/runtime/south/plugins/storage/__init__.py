@@ -37,12 +37,20 @@ if not fw_modules:
 _conf = calvinconfig.get()
 fw_path = _conf.get(None, 'framework')
 
-if not fw_path in fw_modules:
-    raise Exception("No framework '%s' with that name, avalible ones are '%s'" % (fw_path, fw_modules))
+# Frameworks without storages, only the local and the proxy storage can be used
+_NO_STORAGES = ['asyncioimpl']
+
+if fw_path in _NO_STORAGES:
+    fw_path = None
+elif not fw_path in fw_modules:
+    raise Exception("No framework '%s' with that name, avalible ones are '%s'" % (fw_path, fw_modules + _NO_STORAGES))
 
 
 for module, _classes in _modules.items():
     for _name, _module in _classes.items():
+        if fw_path is None:
+            globals()[_name] = None
+            continue
         module_obj = __import__("%s.%s.%s" % (fw_path, module, _module), globals=globals(), fromlist=[''])
         globals()[_name] = module_obj
         __all__.append(module_obj)
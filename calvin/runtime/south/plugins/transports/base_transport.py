@@ -24,6 +24,7 @@ class URI(object):
     def __init__(self, uri):
         self.uri = uri
         self.port = None
+        self.path = None
         schema, peer_addr = uri.split(':', 1)
         if schema == 'calvinbt':
             data = uri.split(":")
@@ -36,6 +37,7 @@ class URI(object):
             self.scheme = url.scheme
             self.port = url.port
             self.hostname = url.hostname
+            self.path = url.path
 
     def geturl(self):
         return self.uri
@@ -57,6 +59,7 @@ class BaseTransport(CalvinCBClass):
         # Override the setting of these in subclass
         self._coder = None                     # Active coder set for transport
         self._rtt = 2000                       # round trip time on ms
+        self._rttvar = None                    # mean deviation of the rtt in ms, None until measured
         self._timeout = self._rtt * 2          # Time out for connect and replys
         self._uri = split_uri(remote_uri)      # get a URI object
         self._rt_id = local_id
@@ -93,6 +96,24 @@ class BaseTransport(CalvinCBClass):
         """
         return self._rtt
 
+    def get_rttvar(self):
+        """
+            Return the mean deviation of the rtt, None until the rtt has been measured
+        """
+        return self._rttvar
+
+    def update_rtt(self, rtt):
+        """
+            A measured round trip time rtt in ms, smoothed as in TCP (RFC 6298)
+        """
+        if self._rttvar is None:
+            self._rtt = rtt
+            self._rttvar = rtt / 2.0
+        else:
+            self._rttvar = 0.75 * self._rttvar + 0.25 * abs(self._rtt - rtt)
+            self._rtt = 0.875 * self._rtt + 0.125 * rtt
+        self._timeout = self._rtt + 4 * self._rttvar
+
     def get_coder(self):
         """
             Return the current coder used or none if none set
@@ -158,5 +179,11 @@ class BaseTransportFactory(CalvinCBClass):
         """
         raise NotImplemented()
 
+    def reachable(self, uri):
+        """
+            Returns if a peer's uri can be joined from this runtime
+        """
+        return True
+
 def register(_id, callbacks, schemas, formats):
     return {}
@@ -126,7 +126,8 @@ class TwistedCalvinTransport(base_transport.CalvinTransportBase):
 
     def send(self, data):
         if self._proto:
-            self._proto.sendString(data)
+            # A frame with binary segments comes as a list of parts
+            self._proto.sendString(''.join(data) if isinstance(data, list) else data)
 
     def join(self):  # , callbacks):
         if self._proto:
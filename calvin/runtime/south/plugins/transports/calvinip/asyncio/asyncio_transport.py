@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+
+from calvin.utilities.calvin_callback import CalvinCB, CalvinCBClass
+from calvin.utilities import calvinlogger
+from calvin.runtime.south.plugins.transports.lib.twisted import base_transport
+from calvin.runtime.south.plugins.async.asyncioimpl import async
+from calvin.runtime.south.plugins.async.asyncioimpl.protocol import Int32StringReceiver, Adapter
+
+_log = calvinlogger.get_logger(__name__)
+
+
+def create_uri(ip, port):
+    return "%s://%s:%s" % ("calvinip", ip, port)
+
+
+# Server
+class AsyncioCalvinServer(base_transport.CalvinServerBase):
+    """
+    """
+
+    def __init__(self, iface='', port=0, callbacks=None, *args, **kwargs):
+        super(AsyncioCalvinServer, self).__init__(callbacks=callbacks)
+        self._iface = iface
+        self._port = port
+        self._addr = None
+        self._tcp_server = None
+        self._callbacks = callbacks
+
+    def start(self):
+        callbacks = {'connected': [CalvinCB(self._connected)]}
+
+        self._tcp_server = async.Listener(lambda: Adapter(lambda addr: StringProtocol(callbacks)), self._port,
+                                          interface=self._iface)
+        self._port = self._tcp_server.port
+        self._callback_execute('server_started', self._port)
+        return self._port
+
+    def stop(self):
+        if self._tcp_server:
+            self._tcp_server.stop()
+            self._tcp_server = None
+            self._callback_execute('server_stopped')
+
+    def is_listening(self):
+        return self._tcp_server is not None
+
+    def _connected(self, proto):
+        host, port = proto.transport.get_extra_info('peername')[:2]
+        self._callback_execute('client_connected', create_uri(host, port), proto)
+
+
+class StringProtocol(CalvinCBClass, Int32StringReceiver):
+    # Frames carry binary segments such as camera images
+    MAX_LENGTH = 64 * 1024 * 1024
+
+    def __init__(self, callbacks):
+        super(StringProtocol, self).__init__(callbacks)
+        self._callback_execute('set_proto', self)
+
+    def sendParts(self, parts):
+        """ Send the parts as one string without joining them first """
+        length = sum(len(part) for part in parts)
+        if length >= self.MAX_LENGTH:
+            raise ValueError("Frame of %d bytes is too long" % length)
+        self.transport.writelines([struct.pack(self.structFormat, length)] + parts)
+
+    def connectionMade(self):
+        self._callback_execute('connected', self)
+
+    def connectionLost(self, reason):
+        self._callback_execute('disconnected', reason)
+        # TODO: Remove all callbacks
+
+    def stringReceived(self, data):
+        "As soon as any data is received, send it to callback"
+        self._callback_execute('data', data)
+
+
+# Client
+class AsyncioCalvinTransport(base_transport.CalvinTransportBase):
+    def __init__(self, host, port, callbacks=None, proto=None, *args, **kwargs):
+        super(AsyncioCalvinTransport, self).__init__(host, port, callbacks=callbacks)
+        self._host_ip = host
+        self._host_port = port
+        self._proto = proto
+
+        # Server created us already have a proto
+        if proto:
+            proto.callback_register('connected', CalvinCB(self._connected))
+            proto.callback_register('disconnected', CalvinCB(self._disconnected))
+            proto.callback_register('data', CalvinCB(self._data))
+
+        self._callbacks = callbacks
+
+    def is_connected(self):
+        return self._proto is not None
+
+    def disconnect(self):
+        if self._proto:
+            self._proto.transport.close()
+
+    def send(self, data):
+        if self._proto:
+            if isinstance(data, list):
+                self._proto.sendParts(data)
+            else:
+                self._proto.sendString(data)
+
+    def join(self):  # , callbacks):
+        if self._proto:
+            raise Exception("Already connected")
+
+        # Own callbacks
+        callbacks = {'connected': [CalvinCB(self._connected)],
+                     'disconnected': [CalvinCB(self._disconnected)],
+                     'data': [CalvinCB(self._data)],
+                     'set_proto': [CalvinCB(self._set_proto)]}
+
+        async.connect_tcp(lambda: Adapter(lambda addr: StringProtocol(callbacks)), self._host_ip, int(self._host_port))
+
+    def _set_proto(self, proto):
+        _log.debug("%s, %s, %s" % (self, '_set_proto', proto))
+        if self._proto:
+            _log.error("_set_proto: Already connected")
+            return
+        self._proto = proto
+
+    def _connected(self, proto):
+        _log.debug("%s, %s" % (self, 'connected'))
+        self._callback_execute('connected')
+
+    def _disconnected(self, reason):
+        _log.debug("%s, %s, %s" % (self, 'disconnected', reason))
+        self._callback_execute('disconnected', str(reason))
+
+    def _data(self, data):
+        _log.debug("%s, %s, %s" % (self, '_data', data))
+        self._callback_execute('data', data)
@@ -15,12 +15,19 @@
 # limitations under the License.
 
 from calvin.utilities import calvinlogger
-from twisted.twisted_transport import TwistedCalvinServer, TwistedCalvinTransport
 from calvin.runtime.south.plugins.transports import base_transport
 from calvin.runtime.south.plugins.transports.lib.twisted import twisted_transport
 from calvin.utilities import calvinconfig
 _log = calvinlogger.get_logger(__name__)
 
+# The sockets of the framework the runtime runs on
+if calvinconfig.get().get(None, 'framework') == 'asyncioimpl':
+    from asyncio.asyncio_transport import AsyncioCalvinServer as CalvinServer
+    from asyncio.asyncio_transport import AsyncioCalvinTransport as CalvinClient
+else:
+    from twisted.twisted_transport import TwistedCalvinServer as CalvinServer
+    from twisted.twisted_transport import TwistedCalvinTransport as CalvinClient
+
 
 class CalvinTransportFactory(base_transport.BaseTransportFactory):
 
@@ -41,13 +48,13 @@ class CalvinTransportFactory(base_transport.BaseTransportFactory):
 
         try:
             tp = twisted_transport.CalvinTransport(self._rt_id, uri, self._callbacks,
-                                                   TwistedCalvinTransport)
+                                                   CalvinClient)
             self._peers[peer_addr] = tp
             tp.connect()
             # self._callback_execute('join_finished', peer_id, tp)
             return True
         except:
-            _log.exception("Error creating TwistedCalvinTransport")
+            _log.exception("Error creating CalvinTransport")
             raise
 
     def listen(self, uri):
@@ -68,7 +75,7 @@ class CalvinTransportFactory(base_transport.BaseTransportFactory):
             raise Exception("Server already started!!" % uri)
         try:
             tp = twisted_transport.CalvinServer(
-                self._rt_id, uri, self._callbacks, TwistedCalvinServer, TwistedCalvinTransport)
+                self._rt_id, uri, self._callbacks, CalvinServer, CalvinClient)
             self._servers[uri] = tp
             tp.start()
         except:
@@ -14,6 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import struct
+
 from calvin.utilities.calvin_callback import CalvinCB, CalvinCBClass
 from calvin.utilities import calvinlogger
 from calvin.runtime.south.plugins.transports.lib.twisted import base_transport
@@ -67,10 +69,20 @@ class TwistedCalvinServer(base_transport.CalvinServerBase):
 
 
 class StringProtocol(CalvinCBClass, Int32StringReceiver):
+    # Frames carry binary segments such as camera images
+    MAX_LENGTH = 64 * 1024 * 1024
+
     def __init__(self, callbacks):
         super(StringProtocol, self).__init__(callbacks)
         self._callback_execute('set_proto', self)
 
+    def sendParts(self, parts):
+        """ Send the parts as one string without joining them first """
+        length = sum(len(part) for part in parts)
+        if length >= self.MAX_LENGTH:
+            raise ValueError("Frame of %d bytes is too long" % length)
+        self.transport.writeSequence([struct.pack(self.structFormat, length)] + parts)
+
     def connectionMade(self):
         self._callback_execute('connected', self)
 
@@ -122,7 +134,10 @@ class TwistedCalvinTransport(base_transport.CalvinTransportBase):
 
     def send(self, data):
         if self._proto:
-            self._proto.sendString(data)
+            if isinstance(data, list):
+                self._proto.sendParts(data)
+            else:
+                self._proto.sendString(data)
 
     def join(self):  # , callbacks):
         if self._proto:
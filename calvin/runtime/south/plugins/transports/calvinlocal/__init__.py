@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import errno
+import socket
+import tempfile
+import traceback
+import uuid
+
+factories = {}
+
+
+
+def _host_id():
+    """
+    The id of this host in calvinlocal uris. Host names are not unique (e.g. devices left with
+    the default name) and neither is the machine id of cloned images, the boot id is.
+    """
+    for path in ('/proc/sys/kernel/random/boot_id', '/etc/machine-id', '/var/lib/dbus/machine-id'):
+        try:
+            with open(path) as f:
+                host_id = f.read().strip().replace('-', '')
+        except IOError:
+            continue
+        if host_id:
+            return host_id.lower()
+    return ("%012x-%s" % (uuid.getnode(), socket.gethostname())).lower()
+
+# Peers on the same host advertise the host id in their calvinlocal uri
+HOST = _host_id()
+
+# The default Unix socket buffers hold a few frames with binary segments, a window of
+# such tokens then stalls the sender while loopback TCP grows its buffers
+BUFFER_SIZE = 1024 * 1024
+
+
+def supported():
+    return hasattr(socket, 'AF_UNIX')
+
+
+def create_uri(path):
+    return "%s://%s%s" % ("calvinlocal", HOST, path)
+
+
+def default_uri(port):
+    """ The uri of the runtime with calvinip port number port """
+    return create_uri(os.path.join(tempfile.gettempdir(), "calvin-%d.sock" % port))
+
+
+def remove_stale(path):
+    """ Remove the socket file at path left by a runtime that is gone, raises when it is in use """
+    if not os.path.exists(path):
+        return
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except socket.error as e:
+        if e.errno == errno.ENOENT:
+            return
+        if e.errno != errno.ECONNREFUSED:
+            raise
+        os.unlink(path)
+        return
+    finally:
+        sock.close()
+    raise Exception("Socket %s is in use" % path)
+
+
+def set_buffers(sock):
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, BUFFER_SIZE)
+
+
+def register(_id, callbacks, schemas, formats):
+    ret = {}
+    if 'calvinlocal' in schemas and supported():
+        try:
+            import calvinlocal_transport
+            f = calvinlocal_transport.CalvinTransportFactory(_id, callbacks)
+            factories[_id] = f
+            ret['calvinlocal'] = f
+        except ImportError:
+            traceback.print_exc()
+    return ret
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+
+from calvin.utilities import calvinlogger
+from calvin.runtime.south.plugins.transports import base_transport
+from calvin.runtime.south.plugins.transports.lib.twisted import twisted_transport
+from calvin.runtime.south.plugins.transports import calvinlocal
+from calvin.utilities import calvinconfig
+_log = calvinlogger.get_logger(__name__)
+
+# The sockets of the framework the runtime runs on
+if calvinconfig.get().get(None, 'framework') == 'asyncioimpl':
+    from asyncio.asyncio_transport import AsyncioLocalServer as LocalServer
+    from asyncio.asyncio_transport import AsyncioLocalTransport as LocalClient
+else:
+    from twisted.twisted_transport import TwistedLocalServer as LocalServer
+    from twisted.twisted_transport import TwistedLocalTransport as LocalClient
+
+
+class CalvinTransportFactory(base_transport.BaseTransportFactory):
+
+    """
+    Links to runtimes on the same host over Unix domain sockets, the uri is
+    calvinlocal://<host id><socket path>. The frames and the join are the same as for calvinip.
+    """
+
+    def __init__(self, rt_id, callbacks):
+        super(CalvinTransportFactory, self).__init__(rt_id, callbacks=callbacks)
+        self._peers = {}
+        self._servers = {}
+        self._callbacks = callbacks
+
+    def reachable(self, uri):
+        """ A peer is reachable when it is on this host and its socket exists """
+        addr = base_transport.split_uri(uri)
+        return addr.hostname == calvinlocal.HOST and os.path.exists(addr.path)
+
+    def join(self, uri):
+        schema, peer_addr = uri.split(':', 1)
+        if schema != 'calvinlocal':
+            raise Exception("Cant handle schema %s!!" % schema)
+
+        try:
+            tp = twisted_transport.CalvinTransport(self._rt_id, uri, self._callbacks, LocalClient)
+            self._peers[peer_addr] = tp
+            tp.connect()
+            return True
+        except:
+            _log.exception("Error creating CalvinTransport")
+            raise
+
+    def listen(self, uri):
+        if uri == "calvinlocal:default":
+            uri = calvinlocal.create_uri(os.path.join(tempfile.gettempdir(), "calvin-%s.sock" % self._rt_id))
+
+        schema, _addr = uri.split(':', 1)
+        if schema != 'calvinlocal':
+            raise Exception("Cant handle schema %s!!" % schema)
+
+        if uri in self._servers:
+            raise Exception("Server %s already started!!" % uri)
+        try:
+            tp = twisted_transport.CalvinServer(self._rt_id, uri, self._callbacks, LocalServer, LocalClient)
+            self._servers[uri] = tp
+            tp.start()
+        except:
+            _log.exception("Error starting server")
+            raise
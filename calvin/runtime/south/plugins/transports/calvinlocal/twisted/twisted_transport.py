@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from calvin.utilities.calvin_callback import CalvinCB
+from calvin.utilities import calvinlogger
+from calvin.runtime.south.plugins.transports import calvinlocal
+from calvin.runtime.south.plugins.transports.calvinip.twisted import twisted_transport
+
+from twisted.internet import reactor
+
+_log = calvinlogger.get_logger(__name__)
+
+
+# Server
+class TwistedLocalServer(twisted_transport.TwistedCalvinServer):
+
+    """ Listens on the Unix domain socket path, the framing is calvinip's """
+
+    def __init__(self, iface='', port=0, callbacks=None, path=None, *args, **kwargs):
+        super(TwistedLocalServer, self).__init__(iface=iface, port=port, callbacks=callbacks)
+        self._path = path
+        self._accepted = 0
+
+    def start(self):
+        callbacks = {'connected': [CalvinCB(self._connected)]}
+        calvinlocal.remove_stale(self._path)
+        # The socket file is removed when the server stops listening
+        self._tcp_server = reactor.listenUNIX(self._path, twisted_transport.TCPServerFactory(callbacks))
+        self._callback_execute('server_started', self._path)
+        return self._path
+
+    def _connected(self, proto):
+        calvinlocal.set_buffers(proto.transport.socket)
+        # The clients are unnamed, number them to tell them apart
+        self._accepted += 1
+        self._callback_execute('client_connected', "%s#%d" % (calvinlocal.create_uri(self._path), self._accepted),
+                               proto)
+
+
+# Client
+class TwistedLocalTransport(twisted_transport.TwistedCalvinTransport):
+
+    def __init__(self, host, port, callbacks=None, proto=None, path=None, *args, **kwargs):
+        super(TwistedLocalTransport, self).__init__(host, port, callbacks=callbacks, proto=proto)
+        self._path = path
+
+    def join(self):
+        if self._proto:
+            raise Exception("Already connected")
+
+        # Own callbacks
+        callbacks = {'connected': [CalvinCB(self._connected)],
+                     'disconnected': [CalvinCB(self._disconnected)],
+                     'data': [CalvinCB(self._data)],
+                     'set_proto': [CalvinCB(self._set_proto)]}
+
+        self._factory = twisted_transport.TCPClientFactory(callbacks)
+        reactor.connectUNIX(self._path, self._factory)
+
+    def _connected(self, proto):
+        calvinlocal.set_buffers(proto.transport.socket)
+        super(TwistedLocalTransport, self)._connected(proto)
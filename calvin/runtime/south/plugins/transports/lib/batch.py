@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Frames carrying several messages.
+
+The coded messages sent on a link during a reactor turn are collected into
+one frame, each prefixed by its length:
+
+    length (4 bytes) | coded message | length (4 bytes) | coded message | ...
+
+A coded message is the coder's string or the parts of a frame with
+segments, see segments.py. They are sent as one list of parts, hence
+they are not joined or copied before they are written.
+"""
+
+import struct
+
+_length = struct.Struct('>I')
+
+
+class Batch(object):
+
+    """ The parts of a frame being collected """
+
+    def __init__(self):
+        super(Batch, self).__init__()
+        self.parts = []
+        self.size = 0
+        self.count = 0
+
+    def add(self, message):
+        """ Add a coded message, a str or a list of str parts """
+        parts = message if isinstance(message, list) else [message]
+        length = sum(len(part) for part in parts)
+        self.parts.append(_length.pack(length))
+        self.parts.extend(parts)
+        self.size += _length.size + length
+        self.count += 1
+
+    def take(self):
+        """ Returns the parts of the frame and starts a new one """
+        parts = self.parts
+        self.parts = []
+        self.size = 0
+        self.count = 0
+        return parts
+
+
+def split(data):
+    """ Returns the coded messages of a frame """
+    messages = []
+    pos = 0
+    end = len(data)
+    while pos < end:
+        if pos + _length.size > end:
+            raise ValueError("Truncated length at %d in frame of %d bytes" % (pos, end))
+        length = _length.unpack_from(data, pos)[0]
+        pos += _length.size
+        if pos + length > end:
+            raise ValueError("Truncated message of %d bytes at %d in frame of %d bytes" % (length, pos, end))
+        messages.append(data[pos:pos + length])
+        pos += length
+    return messages
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Per link compression of coded messages.
+
+A link that negotiated compression codes its messages with a Compression,
+wrapping the link's message coder. Coded messages from min_size bytes are
+deflated, each message is flushed to a byte boundary but the compression
+context is kept for the life of the link. Hence field names and values
+repeated between messages compress well. Every coded message starts with
+a flag byte:
+
+    '\\x00' | coded message
+    '\\x01' | deflated coded message
+
+With segments only the coded message is compressed, the binary segments
+are sent as is (images and the like are usually compressed already).
+Since the contexts are shared by the messages of a link, the messages
+must be decoded in the order they were coded, as they are over a stream.
+"""
+
+import time
+import zlib
+
+from calvin.runtime.north.plugins.coders.messages.message_coder import MessageCoderBase
+
+_PLAIN = '\x00'
+_DEFLATED = '\x01'
+
+
+class Compression(MessageCoderBase):
+
+    def __init__(self, coder, min_size, level=6):
+        super(Compression, self).__init__()
+        self.coder = coder
+        self.min_size = min_size
+        # Raw deflate, the flag byte tells what a message is
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        self.messages = 0
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.compress_time = 0.0
+        self.decompress_time = 0.0
+
+    def encode(self, data):
+        coded = self.coder.encode(data)
+        self.messages += 1
+        if len(coded) < self.min_size:
+            return _PLAIN + coded
+        start = time.time()
+        deflated = self._compressor.compress(coded) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        self.compress_time += time.time() - start
+        self.compressed += 1
+        self.bytes_in += len(coded)
+        self.bytes_out += len(deflated)
+        return _DEFLATED + deflated
+
+    def decode(self, data):
+        if data[:1] == _DEFLATED:
+            start = time.time()
+            coded = self._decompressor.decompress(buffer(data, 1))
+            self.decompress_time += time.time() - start
+            return self.coder.decode(coded)
+        return self.coder.decode(data[1:])
+
+    def stats(self):
+        """ The compression ratio (compressed over original size) and the time spent (de)compressing """
+        return {'messages': self.messages, 'compressed': self.compressed,
+                'bytes_in': self.bytes_in, 'bytes_out': self.bytes_out,
+                'ratio': float(self.bytes_out) / self.bytes_in if self.bytes_in else None,
+                'compress_time': self.compress_time, 'decompress_time': self.decompress_time}
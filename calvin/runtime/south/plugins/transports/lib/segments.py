@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Out-of-band binary segments in transport frames.
+
+Binary values in a message (bytearray, memoryview, buffer and large str) are
+moved out of the message before it is coded, and travel as raw segments
+after the coded message in the same frame:
+
+    count (2 bytes) | count * (type (1 byte), length (4 bytes)) | coded message | segments
+
+In the message a segment is replaced by {'__segment__': index}. Hence the
+coder never escapes or copies the binary data. On the receiving side
+memoryview and buffer segments are views into the received frame, str and
+bytearray segments are copied once since they own their data.
+"""
+
+import struct
+
+SEGMENT_KEY = '__segment__'
+
+_STR = 0
+_BYTEARRAY = 1
+_MEMORYVIEW = 2
+_BUFFER = 3
+
+_count = struct.Struct('>H')
+_entry = struct.Struct('>BI')
+
+
+def _extract(value, segments, min_size):
+    type_ = type(value)
+    if type_ is dict:
+        new = None
+        for key, item in value.iteritems():
+            new_item = _extract(item, segments, min_size)
+            if new_item is not item:
+                if new is None:
+                    # Copy on write, the message belongs to the caller
+                    new = dict(value)
+                new[key] = new_item
+        return value if new is None else new
+    if type_ is list or type_ is tuple:
+        new = None
+        for index, item in enumerate(value):
+            new_item = _extract(item, segments, min_size)
+            if new_item is not item:
+                if new is None:
+                    new = list(value)
+                new[index] = new_item
+        return value if new is None else new
+    if type_ is str:
+        if len(value) < min_size:
+            return value
+        segments.append((_STR, value))
+    elif type_ is bytearray:
+        segments.append((_BYTEARRAY, value))
+    elif type_ is memoryview:
+        segments.append((_MEMORYVIEW, value))
+    elif type_ is buffer:
+        segments.append((_BUFFER, value))
+    else:
+        return value
+    return {SEGMENT_KEY: len(segments) - 1}
+
+
+def _as_str(value):
+    # The transports write str
+    if type(value) is str:
+        return value
+    if type(value) is memoryview:
+        return value.tobytes()
+    return str(value)
+
+
+def encode(payload, coder, min_size):
+    """ Returns the list of str parts making up the frame of payload """
+    segments = []
+    payload = _extract(payload, segments, min_size)
+    parts = [_count.pack(len(segments))]
+    parts.extend(_entry.pack(type_, len(value)) for type_, value in segments)
+    parts.append(coder.encode(payload))
+    parts.extend(_as_str(value) for _, value in segments)
+    return parts
+
+
+def _restore(value, segments):
+    type_ = type(value)
+    if type_ is dict:
+        if SEGMENT_KEY in value and len(value) == 1:
+            return segments[value[SEGMENT_KEY]]
+        for key, item in value.iteritems():
+            if type(item) is dict or type(item) is list:
+                value[key] = _restore(item, segments)
+        return value
+    if type_ is list:
+        for index, item in enumerate(value):
+            if type(item) is dict or type(item) is list:
+                value[index] = _restore(item, segments)
+    return value
+
+
+def decode(data, coder):
+    """ Decodes a frame created by encode """
+    count = _count.unpack_from(data, 0)[0]
+    pos = _count.size
+    entries = []
+    for _ in xrange(count):
+        entries.append(_entry.unpack_from(data, pos))
+        pos += _entry.size
+    if not entries:
+        return coder.decode(data[pos:])
+    end = len(data) - sum(length for _, length in entries)
+    payload = coder.decode(data[pos:end])
+    segments = []
+    view = None
+    for type_, length in entries:
+        if type_ == _STR:
+            segments.append(data[end:end + length])
+        elif type_ == _BYTEARRAY:
+            segments.append(bytearray(buffer(data, end, length)))
+        elif type_ == _MEMORYVIEW:
+            view = view or memoryview(data)
+            segments.append(view[end:end + length])
+        else:
+            segments.append(buffer(data, end, length))
+        end += length
+    return _restore(payload, segments)
@@ -14,17 +14,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+
 from calvin.utilities.calvin_callback import CalvinCB
 from calvin.utilities import calvinlogger
 from calvin.utilities import calvinuuid
 from calvin.runtime.south.plugins.transports import base_transport
+from calvin.runtime.south.plugins.transports.lib import segments
+from calvin.runtime.south.plugins.transports.lib import batch
+from calvin.runtime.south.plugins.transports.lib import compression
+from calvin.runtime.south.plugins.async import async
+from calvin.runtime.north.plugins.coders.negotiators import negotiator_factory
 from calvin.utilities import calvinconfig
 _conf = calvinconfig.get()
 
 _log = calvinlogger.get_logger(__name__)
 
-_join_request_reply = {'cmd': 'JOIN_REPLY', 'id': None, 'sid': None, 'serializer': None}
-_join_request = {'cmd': 'JOIN_REQUEST', 'id': None, 'sid': None, 'serializers': []}
+_join_request_reply = {'cmd': 'JOIN_REPLY', 'id': None, 'sid': None, 'serializer': None, 'features': []}
+_join_request = {'cmd': 'JOIN_REQUEST', 'id': None, 'sid': None, 'serializers': [], 'features': []}
+
+# Frame features negotiated in the join, older peers don't send any
+FEATURES = ['segments', 'batch', 'zlib']
 
 def check_list(peer):
     """ This function finds a peer in the list. If it is found, returns True otherwise False.
@@ -50,8 +60,25 @@ class CalvinTransport(base_transport.BaseTransport):
         self._rt_id = rt_id
         self._remote_rt_id = None
         self._coder = None
-        self._transport = transport(self._uri.hostname, self._uri.port, callbacks, proto=proto)
+        # Selects which of the coders to offer and to pick in the join
+        self._negotiator = negotiator_factory.get(_conf.get(None, 'remote_coder_negotiator') or 'static')
+        # Frame features agreed with the peer in the join, and the ones we offer
+        self._features = []
+        self._offered = [f for f in FEATURES if f != 'zlib' or _conf.get(None, 'transport_compression') == 'zlib']
+        self._compress_min_size = _conf.get(None, 'transport_compress_min_size') or 1024
+        self._segment_min_size = _conf.get(None, 'binary_segment_min_size') or 4096
+        # Messages sent on the link during a reactor turn go in one frame, when the peer supports it
+        self._batch = batch.Batch()
+        self._batch_call = None
+        self._batch_size = _conf.get(None, 'transport_batch_size') or 65536
+        self._batch_delay = _conf.get(None, 'transport_batch_delay') or 0.0
+        self._transport = transport(self._uri.hostname, self._uri.port, callbacks, proto=proto, path=self._uri.path)
         self._rtt = 2000  # Init rt in ms
+        # Coded messages and their bytes, the frames' length prefixes are not counted
+        self._messages_sent = 0
+        self._messages_received = 0
+        self._bytes_sent = 0
+        self._bytes_received = 0
         #FAKE TLS ~ TRANSPORT
         self._transport_category=check_list(remote_uri)
         # TODO: This should be incoming param
@@ -78,6 +105,7 @@ class CalvinTransport(base_transport.BaseTransport):
     def disconnect(self, timeout=10):
         # TODO: Set timepout
         if self._transport.is_connected():
+            self.flush()
             self._transport.disconnect()
 
     def is_connected(self):
@@ -86,14 +114,28 @@ class CalvinTransport(base_transport.BaseTransport):
     def send(self, payload, timeout=None, coder=None):
         tcoder = coder or self._coder
         try:
-            _log.debug('send_message %s => %s "%s"' % (self._rt_id, self._remote_rt_id, payload))
+            debug = _log.isEnabledFor(logging.DEBUG)
+            if debug:
+                _log.debug('send_message %s => %s "%s"' % (self._rt_id, self._remote_rt_id, payload))
             self._callback_execute('send_message', self, payload)
-            # Send
-            raw_payload = tcoder.encode(payload)
+            # Send, the join is always a plain coded message
+            if coder is None and 'segments' in self._features:
+                raw_payload = segments.encode(payload, tcoder, self._segment_min_size)
+            else:
+                raw_payload = tcoder.encode(payload)
 
-            _log.debug('raw_send_message %s => %s "%s"' % (self._rt_id, self._remote_rt_id, raw_payload))
+            if debug:
+                _log.debug('raw_send_message %s => %s "%s"' % (self._rt_id, self._remote_rt_id, raw_payload))
             self._callback_execute('raw_send_message', self, raw_payload)
-            self._transport.send(raw_payload)
+            self._messages_sent += 1
+            if isinstance(raw_payload, list):
+                self._bytes_sent += sum(len(part) for part in raw_payload)
+            else:
+                self._bytes_sent += len(raw_payload)
+            if coder is None and 'batch' in self._features:
+                self._add_to_batch(raw_payload)
+            else:
+                self._transport.send(raw_payload)
             # TODO: Set timeout of send
             return True
         except:
@@ -101,18 +143,36 @@ class CalvinTransport(base_transport.BaseTransport):
             _log.error("Payload = '%s'" % repr(payload))
         return False
 
+    def _add_to_batch(self, raw_payload):
+        self._batch.add(raw_payload)
+        if self._batch.size >= self._batch_size:
+            self.flush()
+        elif self._batch_call is None:
+            self._batch_call = async.DelayedCall(self._batch_delay, self.flush)
+
+    def flush(self):
+        """ Send the messages collected for the frame being batched """
+        if self._batch_call is not None:
+            self._batch_call.cancel()
+            self._batch_call = None
+        if self._batch.size:
+            parts = self._batch.take()
+            if self._transport.is_connected():
+                self._transport.send(parts)
+
     def _get_join_coder(self):
         return self.get_coders()['json']
 
     def _get_msg_uuid(self):
-        return calvinuuid.uuid("MSGID")
+        return calvinuuid.ephemeral("MSGID")
 
     def _send_join(self):
         self._callback_execute('peer_connected', self, self.get_uri())
         msg = _join_request
         msg['id'] = self._rt_id
         msg['sid'] = self._get_msg_uuid()
-        msg['serializers'] = self.get_coders().keys()
+        msg['serializers'] = self._negotiator.get_list()
+        msg['features'] = self._offered
         self.send(msg, coder=self._get_join_coder())
 
     def _send_join_reply(self, _id, serializer, sid):
@@ -120,6 +180,7 @@ class CalvinTransport(base_transport.BaseTransport):
         msg['id'] = self._rt_id
         msg['sid'] = sid
         msg['serializer'] = serializer
+        msg['features'] = self._features
         self.send(msg, coder=self._get_join_coder())
 
     def _handle_join(self, data):
@@ -133,12 +194,16 @@ class CalvinTransport(base_transport.BaseTransport):
 
             sid = data_obj['sid']
 
-            for coder in self.get_coders():
-                if coder in data_obj['serializers']:
-                    self._coder = self.get_coders()[coder]
+            # Our most prefered coder that the peer also supports
+            coders = self.get_coders()
+            for coder in self._negotiator.get_list():
+                if coder in data_obj['serializers'] and coder in coders:
+                    self._coder = coders[coder]
                     coder_name = coder
                     break
 
+            self._set_features(data_obj.get('features', []))
+
             # Verify remote
             valid = self._verify_client(data_obj)
             # TODO: Callback or use join_finished
@@ -153,6 +218,27 @@ class CalvinTransport(base_transport.BaseTransport):
         self._send_join_reply(not valid or self._rt_id, coder_name, sid)
         self._joined(False)
 
+    def _set_features(self, features):
+        """ Use the frame features both we and the peer support """
+        self._features = [f for f in self._offered if f in features]
+        if 'zlib' in self._features and self._coder is not None:
+            # The link's own compression context around the negotiated coder
+            self._coder = compression.Compression(self._coder, self._compress_min_size)
+
+    def compression_stats(self):
+        """ The compression ratio and time of the link, None when it is not compressed """
+        if isinstance(self._coder, compression.Compression):
+            return self._coder.stats()
+        return None
+
+    def stats(self):
+        """ Message and byte counts, round trip time in ms and the messages (and bytes) waiting in the batch """
+        return {'messages_sent': self._messages_sent, 'messages_received': self._messages_received,
+                'bytes_sent': self._bytes_sent, 'bytes_received': self._bytes_received,
+                'rtt': self.get_rtt(), 'rttvar': self.get_rttvar(),
+                'queued': self._batch.count, 'queued_bytes': self._batch.size,
+                'compression': self.compression_stats()}
+
     def _joined(self, is_orginator):
         self._callback_execute('join_finished', self, self._remote_rt_id, self.get_uri(), is_orginator)
 
@@ -168,6 +254,8 @@ class CalvinTransport(base_transport.BaseTransport):
             if data_obj['serializer'] in self.get_coders():
                 self._coder = self.get_coders()[data_obj['serializer']]
 
+            self._set_features(data_obj.get('features', []))
+
             if data_obj['id'] is not None:
                 # Request denied
                 self._remote_rt_id = data_obj['id']
@@ -184,7 +272,9 @@ class CalvinTransport(base_transport.BaseTransport):
 
     def _data_received(self, data):
         self._callback_execute('raw_data_received', self, data)
+        self._bytes_received += len(data)
         if self._remote_rt_id is None:
+            self._messages_received += 1
             if self._incoming:
                 self._handle_join(data)
             else:
@@ -192,14 +282,27 @@ class CalvinTransport(base_transport.BaseTransport):
                 self._handle_join_reply(data)
             return
 
-        # TODO: How to error this
-        data_obj = None
-        # decode
-        try:
-            data_obj = self._coder.decode(data)
-        except:
-            _log.exception("Message decode failed")
-        self._callback_execute('data_received', self, data_obj)
+        if 'batch' in self._features:
+            try:
+                messages = batch.split(data)
+            except:
+                _log.exception("Frame split failed")
+                return
+        else:
+            messages = [data]
+        self._messages_received += len(messages)
+        for message in messages:
+            # TODO: How to error this
+            data_obj = None
+            # decode
+            try:
+                if 'segments' in self._features:
+                    data_obj = segments.decode(message, self._coder)
+                else:
+                    data_obj = self._coder.decode(message)
+            except:
+                _log.exception("Message decode failed")
+            self._callback_execute('data_received', self, data_obj)
 
     def set_transport_category(self,category):
         self._transport_category=category
@@ -219,7 +322,7 @@ class CalvinServer(base_transport.BaseServer):
         # TODO: Get iface from addr and lookup host
         iface = ''
 
-        self._transport = server_transport(iface=iface, port=self._listen_uri.port or 0)
+        self._transport = server_transport(iface=iface, port=self._listen_uri.port or 0, path=self._listen_uri.path)
         self._client_transport = client_transport
 
     def _started(self, port):
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pytest
+from mock import Mock
+
+from calvin.runtime.south.plugins.transports.lib import batch
+from calvin.runtime.south.plugins.transports.lib.twisted import twisted_transport
+from calvin.utilities.calvin_callback import CalvinCB
+
+pytestmark = pytest.mark.unittest
+
+
+def test_split():
+    frame = batch.Batch()
+    frame.add("first")
+    frame.add(["se", "cond"])
+    frame.add("")
+    parts = frame.take()
+    assert frame.size == 0 and frame.parts == []
+    assert batch.split("".join(parts)) == ["first", "second", ""]
+    with pytest.raises(ValueError):
+        batch.split("".join(parts)[:-3])
+
+
+def joined(features, received=None):
+    transport = Mock()
+    transport.is_connected.return_value = True
+    callbacks = {'data_received': [CalvinCB(lambda tp, msg: received.append(msg))]} if received is not None else {}
+    tp = twisted_transport.CalvinTransport("NODE", "calvinip://127.0.0.1:5000", callbacks,
+                                           Mock(return_value=transport), proto=Mock())
+    join = {'cmd': 'JOIN_REQUEST', 'id': "PEER", 'sid': "SID", 'serializers': ['json'], 'features': features}
+    tp._data_received(json.dumps(join))
+    assert json.loads(transport.send.call_args[0][0])['features'] == features
+    transport.send.reset_mock()
+    return tp, transport
+
+
+def test_messages_sent_in_one_frame():
+    tp, transport = joined(['segments', 'batch'])
+    for n in range(3):
+        tp.send({'cmd': 'TOKEN', 'sequencenbr': n})
+    assert not transport.send.called
+    tp.flush()
+    assert transport.send.call_count == 1
+    messages = batch.split("".join(transport.send.call_args[0][0]))
+    assert [tp._coder.decode(m[2:])['sequencenbr'] for m in messages] == [0, 1, 2]
+
+    # A frame is sent when it reaches the batch size
+    tp._batch_size = 100
+    tp.send({'cmd': 'REPLY', 'value': "x" * 100})
+    assert transport.send.call_count == 2
+    assert tp._batch_call is None
+
+
+def test_frame_split_on_receive():
+    received = []
+    tp, transport = joined(['batch'], received)
+    frame = batch.Batch()
+    frame.add(json.dumps({'cmd': 'TOKEN', 'sequencenbr': 1}))
+    frame.add(json.dumps({'cmd': 'TOKEN', 'sequencenbr': 2}))
+    tp._data_received("".join(frame.take()))
+    assert [msg['sequencenbr'] for msg in received] == [1, 2]
+
+
+def test_older_peer_gets_a_frame_per_message():
+    tp, transport = joined([])
+    tp.send({'cmd': 'REPLY', 'value': "data"})
+    assert json.loads(transport.send.call_args[0][0]) == {'cmd': 'REPLY', 'value': "data"}
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+import tempfile
+
+import pytest
+
+from calvin.runtime.north import calvin_network
+from calvin.runtime.north.calvin_network import CalvinNetwork
+from calvin.runtime.south.plugins.transports import base_transport, calvinlocal
+from calvin.runtime.south.plugins.transports.calvinlocal import calvinlocal_transport
+
+pytestmark = pytest.mark.unittest
+
+
+@pytest.fixture
+def path(request):
+    path = os.path.join(tempfile.gettempdir(), "calvin-test-%d.sock" % os.getpid())
+
+    def remove():
+        if os.path.exists(path):
+            os.unlink(path)
+    request.addfinalizer(remove)
+    return path
+
+
+def listening(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.listen(1)
+    return sock
+
+
+def test_reachable(path):
+    factory = calvinlocal_transport.CalvinTransportFactory("NODE", {})
+    uri = calvinlocal.create_uri(path)
+    assert not factory.reachable(uri)
+    sock = listening(path)
+    try:
+        assert factory.reachable(uri)
+        assert not factory.reachable("calvinlocal://other-host%s" % path)
+    finally:
+        sock.close()
+
+
+def test_remove_stale(path):
+    sock = listening(path)
+    with pytest.raises(Exception):
+        calvinlocal.remove_stale(path)
+    sock.close()
+    # Nobody listens anymore
+    calvinlocal.remove_stale(path)
+    assert not os.path.exists(path)
+    calvinlocal.remove_stale(path)
+
+
+class Node(object):
+    id = "NODE"
+
+
+def test_supported_uri_prefers_local(path, monkeypatch):
+    conf = calvin_network._conf
+    get = conf.get
+    monkeypatch.setattr(conf, 'get', lambda section, option: ['calvinlocal', 'calvinip']
+                        if option == 'transports' else get(section, option))
+    network = CalvinNetwork(Node())
+    network.transports = {'calvinlocal': calvinlocal_transport.CalvinTransportFactory("NODE", {}),
+                          'calvinip': base_transport.BaseTransportFactory("NODE", {})}
+    local_uri = calvinlocal.create_uri(path)
+    uris = ["calvinip://10.0.0.1:5000", local_uri]
+    # The peer is gone or on another host
+    assert network.get_supported_uri(uris) == "calvinip://10.0.0.1:5000"
+    sock = listening(path)
+    try:
+        assert network.get_supported_uri(uris) == local_uri
+        del network.transports['calvinlocal']
+        assert network.get_supported_uri(uris) == "calvinip://10.0.0.1:5000"
+    finally:
+        sock.close()
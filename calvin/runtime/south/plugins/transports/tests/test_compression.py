@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pytest
+from mock import Mock
+
+from calvin.runtime.north.plugins.coders.messages import message_coder_factory
+from calvin.runtime.south.plugins.transports.lib import compression, segments
+from calvin.runtime.south.plugins.transports.lib.twisted import twisted_transport
+
+pytestmark = pytest.mark.unittest
+
+
+def state(n):
+    return {'cmd': 'ACTOR_NEW', 'state': {'managed': ['id%d' % i for i in range(200)], 'name': "actor%d" % n}}
+
+
+def link(coder="json"):
+    coder = message_coder_factory.get(coder)
+    return compression.Compression(coder, 1024), compression.Compression(coder, 1024)
+
+
+@pytest.mark.parametrize("coder", ["json", "cbor"])
+def test_messages_over_a_link(coder):
+    sender, receiver = link(coder)
+    sizes = []
+    for n in range(3):
+        data = sender.encode(state(n))
+        sizes.append(len(data))
+        assert receiver.decode(data) == json.loads(json.dumps(state(n)))
+    small = sender.encode({'cmd': 'REPLY'})
+    assert small[0] == '\x00'
+    assert receiver.decode(small) == {'cmd': 'REPLY'}
+    # Repeated content compresses better with the link's context
+    assert sizes[1] < sizes[0] / 2
+    stats = sender.stats()
+    assert stats['messages'] == 4 and stats['compressed'] == 3
+    assert stats['ratio'] < 0.5
+
+
+def test_segments_not_compressed():
+    sender, receiver = link()
+    frame = "".join(chr(n % 256) for n in xrange(10000))
+    msg = state(1)
+    msg['value'] = frame
+    parts = segments.encode(msg, sender, 4096)
+    assert parts[-1] is frame
+    decoded = segments.decode("".join(parts), receiver)
+    assert decoded['value'] == frame and decoded['state'] == state(1)['state']
+
+
+def joined(features):
+    transport = Mock()
+    tp = twisted_transport.CalvinTransport("NODE", "calvinip://127.0.0.1:5000", {}, Mock(return_value=transport),
+                                           proto=Mock())
+    join = {'cmd': 'JOIN_REQUEST', 'id': "PEER", 'sid': "SID", 'serializers': ['json'], 'features': features}
+    tp._data_received(json.dumps(join))
+    return tp, transport
+
+
+def test_join_negotiates_compression():
+    tp, transport = joined(['segments', 'zlib'])
+    assert json.loads(transport.send.call_args[0][0])['features'] == ['segments', 'zlib']
+    tp.send(state(1))
+    sent = "".join(transport.send.call_args[0][0])
+    assert sent[2] == '\x01'
+    assert tp.compression_stats()['compressed'] == 1
+
+    # An older peer
+    tp, transport = joined(['segments'])
+    assert tp.compression_stats() is None
+    tp.send(state(1))
+    assert json.loads("".join(transport.send.call_args[0][0])[2:]) == state(1)
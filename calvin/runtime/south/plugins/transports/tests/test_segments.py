@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pytest
+from mock import Mock
+
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.plugins.coders.messages import message_coder_factory
+from calvin.runtime.south.plugins.transports.lib import segments
+from calvin.runtime.south.plugins.transports.lib.twisted import twisted_transport
+
+pytestmark = pytest.mark.unittest
+
+FRAME = "".join(chr(n % 256) for n in xrange(100000))
+
+
+def token_msg(value):
+    return {'cmd': 'TUNNEL_DATA', 'tunnel_id': 'T1', 'value': {
+        'cmd': 'TOKEN', 'sequencenbr': 7, 'token': Token(value).encode()}}
+
+
+@pytest.mark.parametrize("coder", ["json", "cbor"])
+def test_binary_values(coder):
+    coder = message_coder_factory.get(coder)
+    for value in [FRAME, bytearray(FRAME), memoryview(FRAME), buffer(FRAME)]:
+        msg = token_msg(value)
+        parts = segments.encode(msg, coder, 4096)
+        # The binary data is not coded
+        assert parts[-1] is value or type(value) is not str
+        assert len(parts[-2]) < 200
+        decoded = segments.decode("".join(parts), coder)
+        token = Token.decode(decoded['value']['token'])
+        assert type(token.value) is type(value)
+        assert token.value[:] == FRAME
+        assert decoded['value']['sequencenbr'] == 7
+        # The message is not modified
+        assert msg['value']['token']['data'] is value
+
+
+@pytest.mark.parametrize("coder", ["json", "cbor"])
+def test_plain_values(coder):
+    coder = message_coder_factory.get(coder)
+    msg = token_msg([u"text", "short", 1.5, {'a': None}])
+    parts = segments.encode(msg, coder, 4096)
+    assert len(parts) == 2
+    assert segments.decode("".join(parts), coder) == coder.decode(parts[1])
+
+
+def test_segment_placement():
+    coder = message_coder_factory.get("json")
+    frame = "".join(segments.encode({'a': [memoryview(FRAME), bytearray("xyz")]}, coder, 4096))
+    # The segments follow the coded message as is
+    assert frame.endswith(FRAME + "xyz")
+    decoded = segments.decode(frame, coder)
+    view, data = decoded['a']
+    assert view.readonly and len(view) == len(FRAME)
+    assert data == bytearray("xyz")
+
+
+def test_join_negotiates_segments():
+    transport = Mock()
+    tp = twisted_transport.CalvinTransport("NODE", "calvinip://127.0.0.1:5000", {}, Mock(return_value=transport),
+                                           proto=Mock())
+    join = {'cmd': 'JOIN_REQUEST', 'id': "PEER", 'sid': "SID", 'serializers': ['json'], 'features': ['segments']}
+    tp._data_received(json.dumps(join))
+    reply = json.loads(transport.send.call_args[0][0])
+    assert reply['features'] == ['segments']
+
+    tp.send({'cmd': 'REPLY', 'value': bytearray("data")})
+    assert isinstance(transport.send.call_args[0][0], list)
+
+    # An older peer does not send any features
+    tp = twisted_transport.CalvinTransport("NODE", "calvinip://127.0.0.1:5000", {}, Mock(return_value=transport),
+                                           proto=Mock())
+    del join['features']
+    tp._data_received(json.dumps(join))
+    assert json.loads(transport.send.call_args[0][0])['features'] == []
+    tp.send({'cmd': 'REPLY', 'value': "data"})
+    assert json.loads(transport.send.call_args[0][0]) == {'cmd': 'REPLY', 'value': "data"}
@@ -20,7 +20,11 @@ from mock import Mock
 from calvin.tests import DummyNode
 from calvin.runtime.north.actormanager import ActorManager
 from calvin.runtime.south.endpoint import LocalOutEndpoint, LocalInEndpoint
-from calvin.actor.actor import Actor
+from twisted.internet import defer
+from calvin.actor.actor import Actor, ActionResult, NOT_FIRED, condition, UpTo
+from calvin.actor.actorport import InPort, OutPort
+from calvin.runtime.north.calvin_token import Token, EOSToken
+from calvin.runtime.north import offload
 
 pytestmark = pytest.mark.unittest
 
@@ -46,11 +50,263 @@ def actor():
     ("in", "token", "missing", "", False),
     ("out", "token", "name", "new_name", True),
     ("out", "token", "name", "new_name", True),
+    ("in", "token", "fifo_size", 20, True),
+    ("out", "token", "fifo_size_max", 64, True),
+    ("out", "token", "fifo_size", 1, False),
+    ("in", "token", "fifo_size_min", 0, False),
 ])
 def test_set_port_property(port_type, port_name, port_property, value, expected):
     assert actor().set_port_property(port_type, port_name, port_property, value) is expected
 
 
+def test_condition_compiled_once(actor):
+    inport, outport = actor.inports['token'], actor.outports['token']
+    inport.attach_endpoint(LocalInEndpoint(inport, outport))
+    outport.attach_endpoint(LocalOutEndpoint(outport, inport))
+    action = actor.__class__.action_priority[0]
+    # Nothing to read, answered without allocating a result
+    assert action(actor) is NOT_FIRED
+    assert action(actor) is NOT_FIRED
+    inputs, outputs = actor._conditions[action]
+    assert inputs[0][0] is actor.inports['token']
+    assert outputs[0][0] is actor.outports['token']
+
+
+def test_fire_skips_actions_missing_tokens():
+    actor_manager = ActorManager(DummyNode())
+    actor = actor_manager.actors[actor_manager.new('std.Select', {})]
+    actor._calvinsys = Mock()
+    peers = {}
+    for name, inport in actor.inports.items():
+        peers[name] = OutPort(name, Mock())
+        inport.attach_endpoint(LocalInEndpoint(inport, peers[name]))
+        peers[name].attach_endpoint(LocalOutEndpoint(peers[name], inport))
+    for name, outport in actor.outports.items():
+        peers[name] = InPort(name, Mock())
+        peers[name].attach_endpoint(LocalInEndpoint(peers[name], outport))
+        outport.attach_endpoint(LocalOutEndpoint(outport, peers[name]))
+    assert actor.enabled()
+
+    # Only the select port has a token, no condition is entered
+    peers['select'].write_token(Token(True))
+    assert not actor.fire().did_fire
+    assert not actor._conditions
+    ports, actions = actor._action_index
+    assert len(ports) == 4
+    assert [need for _, need in actions] == [0b111, 0b1011]
+
+    peers['data'].write_token(Token(1))
+    assert actor.fire().did_fire
+    assert peers['case_true'].read_token().value == 1
+
+
+class Batched(Actor):
+
+    inport_names = ['token']
+    outport_names = ['token']
+
+    def init(self):
+        self.batches = []
+
+    def exception_handler(self, action, args, context):
+        self.batches.append(args[0])
+        return ActionResult(production=([], ))
+
+    @condition([('token', UpTo(3))], [('token', UpTo(3))])
+    def odd(self, tokens):
+        self.batches.append(tokens)
+        return ActionResult(production=([t for t in tokens if t % 2], ))
+
+    action_priority = (odd, )
+
+
+def connected(actor):
+    producer, consumer = OutPort('out', Mock()), InPort('in', Mock())
+    inport, outport = actor.inports['token'], actor.outports['token']
+    inport.attach_endpoint(LocalInEndpoint(inport, producer))
+    producer.attach_endpoint(LocalOutEndpoint(producer, inport))
+    consumer.attach_endpoint(LocalInEndpoint(consumer, outport))
+    outport.attach_endpoint(LocalOutEndpoint(outport, consumer))
+    actor.fsm.transition_to(Actor.STATUS.READY)
+    actor.fsm.transition_to(Actor.STATUS.ENABLED)
+    return producer, consumer
+
+
+def test_batched_action():
+    actor = Batched('Batched')
+    actor.init()
+    actor._calvinsys = Mock()
+    producer, consumer = connected(actor)
+    producer.fifo.resize(10)
+    for value in [1, 2, 3, 4, 5]:
+        producer.write_token(Token(value))
+    producer.write_token(EOSToken())
+    producer.write_token(Token(7))
+    result = actor.fire()
+    # Batches up to 3 tokens, the exception token is alone
+    assert [b if isinstance(b, list) else 'EOS' for b in actor.batches] == [[1, 2, 3], [4, 5], 'EOS', [7]]
+    assert result.tokens_consumed == 7
+    assert result.tokens_produced == 4
+    assert [consumer.read_token().value for _ in range(4)] == [1, 3, 5, 7]
+    assert actor.inports['token'].available_tokens() == 0
+
+
+def test_batched_action_limited_by_slots():
+    actor = Batched('Batched')
+    actor.init()
+    actor._calvinsys = Mock()
+    producer, consumer = connected(actor)
+    for value in [1, 3, 5]:
+        producer.write_token(Token(value))
+    # Leave a single free slot in the outport fifo
+    while actor.outports['token'].available_tokens() > 1:
+        actor.outports['token'].write_token(Token(0))
+    actor.fire()
+    assert actor.batches == [[1]]
+    assert actor.inports['token'].available_tokens() == 2
+
+
+class Offloaded(Actor):
+
+    inport_names = ['token']
+    outport_names = ['token']
+
+    def init(self):
+        pass
+
+    @condition(['token'], ['token'], offload=True)
+    def double(self, token):
+        return ActionResult(production=(2 * token, ))
+
+    action_priority = (double, )
+
+
+class Pool(object):
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, f, *args):
+        job = defer.Deferred()
+        self.jobs.append((job, f, args))
+        return job
+
+    def run(self):
+        job, f, args = self.jobs.pop(0)
+        job.callback(f(*args))
+
+    def fail(self):
+        job, _, _ = self.jobs.pop(0)
+        job.errback(Exception("failed"))
+
+    def wait(self, key, callback):
+        pass
+
+
+def offloaded_actor(monkeypatch):
+    pool = Pool()
+    monkeypatch.setattr(offload, 'get_offload', lambda: pool)
+    actor = Offloaded('Offloaded')
+    actor._calvinsys = Mock()
+    producer, consumer = connected(actor)
+    return pool, actor, producer, consumer
+
+
+def test_offloaded_action_completes_in_order(monkeypatch):
+    pool, actor, producer, consumer = offloaded_actor(monkeypatch)
+    inport, outport = actor.inports['token'], actor.outports['token']
+    producer.write_token(Token(1))
+    producer.write_token(Token(2))
+
+    # The first token is peeked and the action runs in the pool, the actor is busy until it returns
+    assert not actor.fire().did_fire
+    assert len(pool.jobs) == 1
+    assert not actor.fire().did_fire
+    assert len(pool.jobs) == 1
+    assert inport.available_tokens() == 1
+    assert consumer.available_tokens() == 0
+
+    pool.run()
+    assert consumer.read_token().value == 2
+    assert actor._calvinsys.scheduler_wakeup.called
+    assert not actor.fire().did_fire
+    pool.run()
+    assert consumer.read_token().value == 4
+    assert inport.available_tokens() == 0
+
+
+def test_failed_offloaded_action_triggers_actor(monkeypatch):
+    pool, actor, producer, consumer = offloaded_actor(monkeypatch)
+    inport = actor.inports['token']
+    producer.write_token(Token(1))
+    actor.fire()
+
+    # The peeked token is rewound and the actor fired again
+    pool.fail()
+    assert inport.available_tokens() == 1
+    assert actor.id in actor._calvinsys.scheduler_wakeup.call_args[0][0]
+
+
+def test_refused_offload_retried_when_worker_finishes(monkeypatch):
+    class ThreadPool(object):
+        def __init__(self, size, name):
+            self.jobs = []
+
+        def defer_to_thread(self, f, *args):
+            job = defer.Deferred()
+            self.jobs.append(job)
+            return job
+
+    monkeypatch.setattr(offload.threads, 'ThreadPool', ThreadPool)
+    pool = offload.Offload(1, 0)
+    monkeypatch.setattr(offload, 'get_offload', lambda: pool)
+    actor = Offloaded('Offloaded')
+    actor._calvinsys = Mock()
+    producer, consumer = connected(actor)
+    other = pool.submit(lambda: None)
+    producer.write_token(Token(1))
+    actor._calvinsys.reset_mock()
+
+    # Refused, the token stays until the other job frees the worker
+    assert not actor.fire().did_fire
+    assert actor.inports['token'].available_tokens() == 1
+    assert not actor._calvinsys.scheduler_wakeup.called
+    pool._pool.jobs.remove(other)
+    other.callback(None)
+    assert actor.id in actor._calvinsys.scheduler_wakeup.call_args[0][0]
+
+
+def test_offloaded_action_abandoned_on_disconnect(monkeypatch):
+    pool, actor, producer, consumer = offloaded_actor(monkeypatch)
+    inport, outport = actor.inports['token'], actor.outports['token']
+    producer.write_token(Token(1))
+    actor.fire()
+
+    # The peeked token is rewound and the late result dropped
+    actor.did_disconnect(outport)
+    assert inport.available_tokens() == 1
+    pool.run()
+    assert consumer.available_tokens() == 0
+
+
+
+def test_fire_yields_on_budget(actor):
+    # Connected to itself the actor could fire forever
+    inport, outport = actor.inports['token'], actor.outports['token']
+    inport.attach_endpoint(LocalInEndpoint(inport, outport))
+    outport.attach_endpoint(LocalOutEndpoint(outport, inport))
+    outport.write_token(Token(1))
+    actor._fire_budget = 3
+    result = actor.fire()
+    assert result.did_fire
+    assert result.yielded
+    assert result.tokens_consumed == 3
+    usage = actor.metering.get_aggregated_meter(actor.metering.register())
+    assert usage['activity'][actor.id]['donothing'] == 3
+    assert usage['cpu_time'][actor.id]['donothing'] >= 0.0
+    assert usage['yields'][actor.id] == 1
+
+
 @pytest.mark.parametrize("inport_ret_val,outport_ret_val,expected", [
     (False, False, False),
     (False, True, False),
@@ -129,11 +385,17 @@ def test_state(actor):
     correct_state = {
         '_component_members': set([actor.id]),
         '_deployment_requirements': [],
-        '_managed': set(['dump', '_signature', 'id', '_deployment_requirements', 'name', 'credentials']),
+        '_managed': set(['dump', '_signature', 'id', '_deployment_requirements', 'name', 'credentials',
+                         '_sched_class', '_sched_deadline']),
+        '_sched_class': 'normal',
+        '_sched_deadline': None,
         '_signature': None,
         'dump': False,
         'id': actor.id,
         'inports': {'token': {'fifo': {'N': 5,
+                                       'min_length': 5,
+                                       'max_length': 5,
+                                       'adaptive': False,
                                        'fifo': [{'data': 0, 'type': 'Token'},
                                                 {'data': 0, 'type': 'Token'},
                                                 {'data': 0, 'type': 'Token'},
@@ -148,6 +410,9 @@ def test_state(actor):
         'name': '',
         'outports': {'token': {'fanout': 1,
                                'fifo': {'N': 5,
+                                        'min_length': 5,
+                                        'max_length': 5,
+                                        'adaptive': False,
                                         'fifo': [{'data': 0, 'type': 'Token'},
                                                  {'data': 0, 'type': 'Token'},
                                                  {'data': 0, 'type': 'Token'},
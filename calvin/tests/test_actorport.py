@@ -21,6 +21,7 @@ from calvin.runtime.north.actormanager import ActorManager
 from calvin.tests import DummyNode
 from calvin.runtime.south.endpoint import LocalOutEndpoint, LocalInEndpoint
 from calvin.actor.actorport import InPort, OutPort
+from calvin.runtime.north.calvin_token import Token
 
 pytestmark = pytest.mark.unittest
 
@@ -194,3 +195,33 @@ def test_set_inport_state(inport, outport):
     assert inport.read_token().value == 3
     assert inport.read_token().value == 4
     assert inport.read_token() is None
+
+
+def test_fifo_size_survives_state(outport):
+    outport.fifo_size = 20
+    outport.fifo_size_max = 64
+    for n in range(10):
+        outport.write_token(Token(n))
+
+    port = OutPort("outport", actor())
+    port._set_state(outport._state())
+    assert port.fifo_size == 20
+    assert (port.fifo_size_min, port.fifo_size_max) == (20, 64)
+    assert port.available_tokens() == 9
+
+
+def test_fixed_fifo_size_survives_state(outport):
+    assert outport.fifo_size_min == outport.fifo_size_max
+    outport.fifo_size = 20
+    assert (outport.fifo_size_min, outport.fifo_size_max) == (20, 20)
+
+    port = OutPort("outport", actor())
+    port._set_state(outport._state())
+    assert (port.fifo_size, port.fifo_size_min, port.fifo_size_max) == (20, 20, 20)
+    # Low occupancy does not shrink a fixed size FIFO
+    port.fifo.add_reader("reader")
+    for n in range(400):
+        port.write_token(Token(n))
+        port.fifo.read("reader")
+        port.fifo.commit_reads("reader")
+    assert port.fifo_size == 20
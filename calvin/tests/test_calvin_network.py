@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from mock import Mock
+
+from calvin.runtime.north import calvin_network
+from calvin.runtime.south.plugins.transports.lib.twisted import twisted_transport
+
+pytestmark = pytest.mark.unittest
+
+
+def joined_link():
+    transport = Mock()
+    tp = twisted_transport.CalvinTransport("NODE", "calvinip://127.0.0.1:5000", {}, Mock(return_value=transport),
+                                           proto=Mock())
+    join = {'cmd': 'JOIN_REQUEST', 'id': "PEER", 'sid': "SID", 'serializers': ['json'], 'features': ['segments']}
+    tp._data_received(json.dumps(join))
+    return calvin_network.CalvinLink("NODE", "PEER", tp), transport
+
+
+def test_rtt_from_replies(monkeypatch):
+    link, transport = joined_link()
+    assert link.transport.get_rtt() == 2000
+    assert link.transport.get_rttvar() is None
+    now = [100.0]
+    monkeypatch.setattr(calvin_network.time, 'time', lambda: now[0])
+    callback = Mock()
+
+    link.send_with_reply(callback, {'cmd': 'GET'})
+    msg_id = json.loads(transport.send.call_args[0][0][-1])['msg_uuid']
+    now[0] += 0.010
+    link.reply_handler({'msg_uuid': msg_id, 'value': {'status': 200, 'data': None, 'success_list': [200]}})
+    assert callback.called
+    assert link.transport.get_rtt() == pytest.approx(10.0)
+    assert link.transport.get_rttvar() == pytest.approx(5.0)
+
+    # Smoothed, not replaced
+    link.send_with_reply(callback, {'cmd': 'GET'})
+    msg_id = json.loads(transport.send.call_args[0][0][-1])['msg_uuid']
+    now[0] += 0.090
+    link.reply_handler({'msg_uuid': msg_id, 'value': {'status': 200, 'data': None, 'success_list': [200]}})
+    assert link.transport.get_rtt() == pytest.approx(20.0)
+    assert link.transport.get_rttvar() == pytest.approx(23.75)
+
+
+def test_stats():
+    link, transport = joined_link()
+    link.send({'cmd': 'TUNNEL_DATA', 'value': 1})
+    link.retransmitted(3)
+    link.send_with_reply(Mock(), {'cmd': 'GET'})
+    stats = link.stats()
+    # The join reply and the two messages
+    assert stats['messages_sent'] == 3
+    assert stats['messages_received'] == 1
+    assert stats['bytes_sent'] > 0 and stats['bytes_received'] > 0
+    assert stats['pending_replies'] == 1
+    assert stats['retransmissions'] == 3
+    assert stats['timeouts'] == 0
+    assert stats['compression'] is None
+
+    link.reply_timeout(link.replies.keys()[0])
+    assert link.stats()['timeouts'] == 1
+    assert link.stats()['pending_replies'] == 0
+
+
+class Node(object):
+    id = "NODE"
+
+
+def test_join_reaching_unexpected_peer_fails():
+    network = calvin_network.CalvinNetwork(Node())
+    network.transports = {'calvinlocal': Mock()}
+    uri = "calvinlocal://host/tmp/calvin-5000.sock"
+    callback = Mock()
+    network.join([uri], callback, ["PEER"])
+
+    tp_link = Mock()
+    network.join_finished(tp_link, "OTHER", uri, True)
+    assert tp_link.disconnect.called
+    assert "OTHER" not in network.links
+    assert not network.pending_joins and not network.pending_joins_by_id
+    assert callback.call_args[1]['status'].status == calvin_network.response.SERVICE_UNAVAILABLE
+
+    # Nor to ourselves
+    tp_link = Mock()
+    network.join_finished(tp_link, "NODE", uri, False)
+    assert tp_link.disconnect.called
+    assert "NODE" not in network.links
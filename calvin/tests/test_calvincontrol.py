@@ -44,6 +44,7 @@ def test_get_calvincontrol_returns_xxx():
     ("GET /log/TRACE_" + uuid + " HTTP/1", "TRACE_" + uuid, "handle_get_log"),
     ("GET /id HTTP/1", None, "handle_get_node_id"),
     ("GET /nodes HTTP/1", None, "handle_get_nodes"),
+    ("GET /links HTTP/1", None, "handle_get_links"),
     ("GET /node/NODE_" + uuid + " HTTP/1", "NODE_" + uuid, "handle_get_node"),
     ("POST /peer_setup HTTP/1", None, "handle_peer_setup"),
     ("GET /applications HTTP/1", None, "handle_get_applications"),
@@ -56,6 +57,8 @@ def test_get_calvincontrol_returns_xxx():
     ("GET /actor/" + uuid + "/report HTTP/1", uuid, "handle_get_actor_report"),
     ("POST /actor/" + uuid + "/migrate HTTP/1", uuid, "handle_actor_migrate"),
     ("POST /actor/" + uuid + "/disable HTTP/1", uuid, "handle_actor_disable"),
+    ("POST /actor/" + uuid + "/scheduling HTTP/1", uuid, "handle_actor_scheduling"),
+    ("GET /scheduling HTTP/1", None, "handle_get_scheduling"),
     ("GET /actor/" + uuid + "/port/PORT_" + uuid + " HTTP/1", uuid, "handle_get_port"),
     ("GET /actor/" + uuid + "/port/PORT_" + uuid + "/state HTTP/1", uuid, "handle_get_port_state"),
     ("POST /connect HTTP/1", None, "handle_connect"),
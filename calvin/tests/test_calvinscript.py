@@ -93,6 +93,18 @@ class CalvinScriptParserTest(CalvinTestBase):
         result, errors, warnings = self.invoke_parser(test)
         self.assertEqual(errors[0], {'reason': 'Syntax error.', 'line': 6, 'col': 2})
 
+    def testPortProperties(self):
+        script = """
+        src : std.CountTimer()
+        snk : io.StandardOut()
+        src.integer[fifo_size=20] > snk.token[fifo_size_min=2, fifo_size_max=64]
+        """
+        result = self.invoke_parser_assert_syntax('inline', script)
+        link = result['structure']['connections'][0]
+        self.assertEqual(link['src_port'], 'integer')
+        self.assertEqual(link['src_port_properties'], {'fifo_size': ('VALUE', 20)})
+        self.assertEqual(link['dst_port_properties'], {'fifo_size_min': ('VALUE', 2), 'fifo_size_max': ('VALUE', 64)})
+
 
 class CalvinScriptAnalyzerTest(CalvinTestBase):
     """Test the CalvinsScript analyzer"""
@@ -114,6 +126,27 @@ class CalvinScriptAnalyzerTest(CalvinTestBase):
         app_info = generate_app_info(result)
         self.assert_app_info(test, app_info)
 
+    def testPortProperties(self):
+        script = """
+        define SIZE = 16
+        component Delay(size) in -> out {
+            d:std.Identity()
+            .in > d.token
+            d.token[fifo_size=size] > .out
+        }
+        src : std.CountTimer()
+        delay : Delay(size=SIZE)
+        snk : io.StandardOut()
+        src.integer > delay.in[fifo_size=8]
+        delay.out > snk.token
+        """
+        result = self.invoke_parser_assert_syntax('inline', script)
+        app_info = generate_app_info(result)
+        self.assertTrue(app_info['valid'])
+        self.assertEqual(app_info['port_properties'], {
+            'in': {'inline:delay:d.token': {'fifo_size': 8}},
+            'out': {'inline:delay:d.token': {'fifo_size': 16}}})
+
     def testMissingActor(self):
         script = """a:std.NotLikely()"""
         result = self.invoke_parser_assert_syntax('inline', script)
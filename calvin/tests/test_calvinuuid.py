@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+
+import pytest
+
+from calvin.utilities import calvinuuid
+
+pytestmark = pytest.mark.unittest
+
+
+def _child_id(queue):
+    queue.put(calvinuuid.ephemeral("CB"))
+
+
+def test_ephemeral_ids_are_unique():
+    ids = [calvinuuid.ephemeral("MSGID") for _ in range(1000)]
+    assert len(set(ids)) == 1000
+    assert all(id_.startswith("MSGID_") for id_ in ids)
+
+
+def test_forked_process_has_own_sequence():
+    first = calvinuuid.ephemeral("CB")
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_child_id, args=(queue,))
+    process.start()
+    child = queue.get(timeout=10)
+    process.join()
+    # Same counter value, since forked right after, but another process part
+    assert child.split("-")[0] != first.split("-")[0]
+    assert child != calvinuuid.ephemeral("CB")
@@ -21,6 +21,7 @@ from mock import Mock
 from calvin.actor.actorport import InPort, OutPort
 from calvin.runtime.north.calvin_token import Token
 from calvin.runtime.south.endpoint import LocalInEndpoint, LocalOutEndpoint, TunnelInEndpoint, TunnelOutEndpoint
+from calvin.runtime.south.monitor import Event_Monitor
 
 pytestmark = pytest.mark.unittest
 
@@ -96,6 +97,24 @@ class TestLocalEndpoint(unittest.TestCase):
         assert self.local_in.get_peer() == ('local', self.peer_port.id)
         assert self.local_out.get_peer() == ('local', self.port.id)
 
+    def test_fifo_positions_reconciled_on_destroy(self):
+        self.peer_port.write_token(Token(1))
+        self.peer_port.write_token(Token(2))
+        assert self.local_in.read_token().value == 1
+        assert self.local_in.read_token().value == 2
+
+        # The shared fifo is used while connected, the own fifo only catches up at destroy
+        assert self.port.fifo.write_pos == 0
+        self.local_in.destroy()
+        assert self.port.fifo.write_pos == 2
+        assert self.port.fifo.read_pos[self.port.id] == 2
+        assert self.port.fifo.tentative_read_pos[self.port.id] == 2
+
+    def test_binary_token_passed_through(self):
+        frame = memoryview(bytearray(100000))
+        self.peer_port.write_token(Token(frame))
+        assert self.local_in.read_token().value is frame
+
 
 class TestTunnelEndpoint(unittest.TestCase):
 
@@ -206,6 +225,27 @@ class TestTunnelEndpoint(unittest.TestCase):
         assert self.tunnel_out.port.fifo.tentative_read_pos[self.port.id] == 1
         assert self.tunnel_out.port.fifo.read_pos[self.port.id] == 1
 
+    def test_rtt_and_retransmissions(self):
+        for n in range(3):
+            self.tunnel_out.port.write_token(Token(n))
+        self.tunnel_out.communicate()
+        # One token at a time is timed
+        assert self.tunnel_out.timed[0] == 0
+        self.tunnel_out.reply(0, 'ACK')
+        assert self.tunnel.rtt_sample.call_count == 1
+        assert self.tunnel_out.timed is None
+
+        # Tokens 1 and 2 are sent again
+        self.tunnel_out.reply(1, 'NACK')
+        self.tunnel.retransmitted.assert_called_with(2)
+        self.tunnel_out.bulk = True
+        self.tunnel_out.communicate()
+        assert self.tunnel_out.timed[0] == 1
+        self.tunnel_out.reply(2, 'ACK')
+        assert self.tunnel.rtt_sample.call_count == 1
+        self.tunnel_out.reply(1, 'ACK')
+        assert self.tunnel.rtt_sample.call_count == 2
+
     def test_bulk_communicate(self):
         self.tunnel_out.port.write_token(Token(1))
         self.tunnel_out.port.write_token(Token(2))
@@ -227,3 +267,153 @@ class TestTunnelEndpoint(unittest.TestCase):
         self.tunnel_out.reply(1, 'ACK')
         assert self.tunnel_out.communicate() is True
         assert self.tunnel.send.call_count == 2
+
+    def test_recv_token_batch(self):
+        payload = {
+            'port_id': self.peer_port.id,
+            'peer_port_id': self.port.id,
+            'sequencenbr': 0,
+            'tokens': [{'type': 'Token', 'data': n} for n in range(3)]
+        }
+        self.tunnel_in.recv_token_batch(payload)
+        assert self.trigger_loop.called
+        assert [self.port.fifo.fifo[n].value for n in range(3)] == [0, 1, 2]
+        self.tunnel.send.assert_called_with({
+            'cmd': 'TOKEN_BATCH_REPLY',
+            'port_id': self.peer_port.id,
+            'peer_port_id': self.port.id,
+            'sequencenbr': 0,
+            'ack': 3,
+            'value': 'ACK'
+        })
+
+        # Resent tokens are ACKed, tokens that don't fit are NACKed (fifo holds 4 tokens)
+        self.trigger_loop.reset_mock()
+        payload['sequencenbr'] = 2
+        self.tunnel_in.recv_token_batch(payload)
+        assert self.trigger_loop.called
+        assert self.port.fifo.write_pos == 4
+        reply = self.tunnel.send.call_args[0][0]
+        assert reply['ack'] == 4
+        assert reply['value'] == 'NACK'
+
+    def test_batch_communicate(self):
+        tunnel_out = TunnelOutEndpoint(self.peer_port, self.tunnel, self.node_id, self.port.id, self.trigger_loop,
+                                       ['TOKEN_BATCH'])
+        self.peer_port.attach_endpoint(tunnel_out)
+        for n in range(3):
+            self.peer_port.write_token(Token(n))
+        assert tunnel_out.communicate() is True
+        assert self.tunnel.send.call_count == 1
+        msg = self.tunnel.send.call_args[0][0]
+        assert msg['cmd'] == 'TOKEN_BATCH'
+        assert msg['sequencenbr'] == 0
+        assert len(msg['tokens']) == 3
+
+        tunnel_out.reply_batch(0, 2, 'NACK')
+        assert self.peer_port.fifo.read_pos[self.port.id] == 2
+        assert self.peer_port.fifo.tentative_read_pos[self.port.id] == 2
+        assert tunnel_out.bulk is False
+
+        tunnel_out.bulk = True
+        tunnel_out.communicate()
+        msg = self.tunnel.send.call_args[0][0]
+        assert msg['cmd'] == 'TOKEN'
+        assert msg['sequencenbr'] == 2
+        tunnel_out.reply_batch(2, 3, 'ACK')
+        assert self.peer_port.fifo.read_pos[self.port.id] == 3
+
+    def test_no_batch_to_older_peer(self):
+        self.peer_port.write_token(Token(1))
+        self.peer_port.write_token(Token(2))
+        self.tunnel_out.communicate()
+        assert [c[0][0]['cmd'] for c in self.tunnel.send.call_args_list] == ['TOKEN', 'TOKEN']
+
+    def test_credit_limits_sending(self):
+        tunnel_out = TunnelOutEndpoint(self.peer_port, self.tunnel, self.node_id, self.port.id, self.trigger_loop,
+                                       ['CREDIT'], 2)
+        self.peer_port.attach_endpoint(tunnel_out)
+        for n in range(3):
+            self.peer_port.write_token(Token(n))
+        tunnel_out.communicate()
+        assert self.tunnel.send.call_count == 2
+        assert tunnel_out.communicate() is False
+
+        # Stale credit is ignored
+        self.trigger_loop.reset_mock()
+        tunnel_out.reply(0, 'ACK', 1)
+        assert tunnel_out.credit == 2
+        tunnel_out.grant_credit(3)
+        assert self.trigger_loop.called
+        assert tunnel_out.communicate() is True
+        assert self.tunnel.send.call_args[0][0]['sequencenbr'] == 2
+
+    def test_credit_grants(self):
+        tunnel_in = TunnelInEndpoint(self.port, self.tunnel, self.peer_node_id, self.peer_port.id, self.trigger_loop,
+                                     ['CREDIT'])
+        self.port.attach_endpoint(tunnel_in)
+        payload = {
+            'port_id': self.peer_port.id,
+            'peer_port_id': self.port.id,
+            'sequencenbr': 0,
+            'token': {'type': 'Token', 'data': 5}
+        }
+        for n in range(4):
+            payload['sequencenbr'] = n
+            tunnel_in.recv_token(payload)
+        # Fifo holds 4 tokens and is full
+        assert self.tunnel.send.call_args[0][0]['credit'] == 4
+
+        # The peer has no credit left, tell it when a slot is freed and our actor wants tokens
+        self.tunnel.send.reset_mock()
+        assert tunnel_in.available_tokens() == 4
+        assert not self.tunnel.send.called
+        tunnel_in.read_token()
+        assert tunnel_in.available_tokens() == 3
+        self.tunnel.send.assert_called_with({
+            'cmd': 'TOKEN_CREDIT',
+            'port_id': self.peer_port.id,
+            'peer_port_id': self.port.id,
+            'credit': 5
+        })
+
+        # Otherwise only when half of the fifo is freed
+        self.tunnel.send.reset_mock()
+        tunnel_in.read_token()
+        assert not self.tunnel.send.called
+        tunnel_in.read_token()
+        assert self.tunnel.send.call_args[0][0]['credit'] == 7
+
+    def test_monitor_visits_dirty_endpoints(self):
+        monitor = Event_Monitor()
+        monitor.register_out_endpoint(self.tunnel_out)
+        # Registered endpoints are visited once
+        assert not monitor.loop(None)
+        assert not monitor.loop(None)
+        self.tunnel_out.communicate = Mock(wraps=self.tunnel_out.communicate)
+
+        # Writing a token makes the endpoint dirty
+        self.peer_port.write_token(Token(1))
+        assert monitor.loop(None)
+        assert not monitor.loop(None)
+        assert self.tunnel_out.communicate.call_count == 1
+
+        # and so does a reply, after a NACK the endpoint sends one token at a time
+        self.peer_port.write_token(Token(2))
+        self.tunnel_out.reply(0, 'NACK')
+        assert monitor.loop(None)
+        assert self.tunnel_out.bulk is False
+        assert self.tunnel.send.call_count == 2
+        # Another NACK before the backoff has passed, the endpoint waits in the heap
+        self.tunnel_out.reply(0, 'NACK')
+        assert not monitor.loop(None)
+        assert len(monitor._delayed) == 1
+        assert not monitor.loop(None)
+        monitor._delayed[0] = (0.0, self.tunnel_out)
+        self.tunnel_out.time_cont = 0.0
+        assert monitor.loop(None)
+        assert self.tunnel.send.call_count == 3
+
+        monitor.unregister_out_endpoint(self.tunnel_out)
+        self.peer_port.write_token(Token(3))
+        assert not monitor._dirty
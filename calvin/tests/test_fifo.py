@@ -176,3 +176,118 @@ class FifoTests(unittest.TestCase):
         self.assertTrue(f.write(Token('a')))
         self.assertFalse(f.can_write())
         self.assertFalse(f.write(Token('b')))
+
+    def test5(self):
+        """Slowest reader position follows commits"""
+        f = fifo.FIFO(5)
+        for reader in ['r1', 'r2', 'r3']:
+            f.add_reader(reader)
+
+        for token in ['1', '2', '3', '4']:
+            self.assertTrue(f.write(Token(token)))
+        self.assertEquals(f.available_slots(), 0)
+
+        f.read('r1')
+        f.read('r2')
+        f.commit_reads('r1')
+        f.commit_reads('r2')
+        # r3 still holds the first token
+        self.assertEquals(len(f), 4)
+        self.assertFalse(f.can_write())
+
+        f.read('r3')
+        f.commit_reads('r3')
+        self.assertEquals(len(f), 3)
+        self.assertEquals(f.available_slots(), 1)
+
+        # Removing the slowest reader frees its tokens
+        f.read('r1')
+        f.commit_reads('r1')
+        f.remove_reader('r2')
+        f.remove_reader('r3')
+        self.assertEquals(len(f), 2)
+        self.assertEquals(f.available_slots(), 2)
+
+        # A new reader starts from the beginning
+        f.add_reader('r4')
+        self.assertEquals(f.read_pos, {'r1': 2, 'r4': 0})
+        self.assertEquals(len(f), 4)
+
+    def test6(self):
+        """State and validation"""
+        f = fifo.FIFO(5, validate=True)
+        f.add_reader('r1')
+        f.add_reader('r2')
+        for token in ['1', '2', '3']:
+            self.assertTrue(f.write(Token(token)))
+        f.read('r1')
+        f.commit_reads('r1')
+        f.read('r2')
+
+        state = f._state()
+        self.assertEquals(state['read_pos'], {'r1': 1, 'r2': 0})
+        self.assertEquals(state['tentative_read_pos'], {'r1': 1, 'r2': 1})
+
+        g = fifo.FIFO(5)
+        g._set_state(state)
+        self.assertEquals(len(g), 3)
+        self.assertEquals(g.available_tokens('r2'), 2)
+        self.verify_data(['2', '3'], [g.read('r1') for _ in range(2)])
+
+        self.assertRaises(Exception, f.read, 'r3')
+        self.assertRaises(Exception, f.add_reader, 3)
+
+    def test7(self):
+        """Resizing keeps tokens and positions"""
+        f = fifo.FIFO(5)
+        f.add_reader('r1')
+        f.add_reader('r2')
+        for token in ['1', '2', '3', '4']:
+            self.assertTrue(f.write(Token(token)))
+        f.read('r1')
+        f.commit_reads('r1')
+        f.read('r2')
+        f.read('r2')
+
+        # The tokens don't fit
+        self.assertFalse(f.resize(4))
+        self.assertTrue(f.resize(9))
+        self.assertEquals(f.available_slots(), 4)
+        self.assertEquals(f.read_pos, {'r1': 1, 'r2': 0})
+        self.verify_data(['3', '4'], [f.read('r2') for _ in range(2)])
+        f.commit_reads('r2')
+        self.verify_data(['2', '3', '4'], [f.read('r1') for _ in range(3)])
+        f.commit_reads('r1')
+        self.assertTrue(f.resize(3))
+        for token in ['5', '6']:
+            self.assertTrue(f.write(Token(token)))
+        self.assertFalse(f.can_write())
+        self.verify_data(['5', '6'], [f.read('r1') for _ in range(2)])
+        self.assertEquals((f.min_length, f.max_length), (3, 3))
+
+    def test8(self):
+        """Adaptive sizing"""
+        f = fifo.FIFO(4)
+        f.add_reader('r1')
+        self.assertTrue(f.set_bounds(2, 16))
+
+        # Repeatedly filled up by a bursty writer, grows up to the bound
+        for _ in range(10):
+            while f.can_write():
+                f.write(Token(0))
+            while f.read('r1') is not None:
+                f.commit_reads('r1')
+        self.assertEquals(f.N, 16)
+
+        # Low occupancy shrinks it, as long as the occupancy stays below a quarter of it
+        for _ in range(400):
+            f.write(Token(0))
+            f.read('r1')
+            f.commit_reads('r1')
+        self.assertEquals(f.N, 4)
+
+        state = f._state()
+        g = fifo.FIFO(5)
+        g._set_state(state)
+        self.assertEquals((g.N, g.min_length, g.max_length), (4, 2, 16))
+        self.assertFalse(f.set_bounds(8, 4))
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import pytest
+from mock import Mock
+
+from calvin.runtime.north.actormanager import ActorManager
+from calvin.runtime.north.calvin_token import Token
+from calvin.runtime.north.fusion import Fusion, Chain
+from calvin.runtime.north.scheduler import Scheduler
+from calvin.runtime.south.endpoint import LocalInEndpoint, LocalOutEndpoint
+from calvin.tests import DummyNode
+
+pytestmark = pytest.mark.unittest
+
+
+def connect(outport, inport):
+    inport.attach_endpoint(LocalInEndpoint(inport, outport))
+    outport.attach_endpoint(LocalOutEndpoint(outport, inport))
+
+
+class FusionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.actor_mgr = ActorManager(DummyNode())
+        self.src, self.a, self.b, self.c, self.sink = [self.new_actor() for _ in range(5)]
+        # Only a, b and c get all their ports connected, i.e. enabled
+        for producer, consumer in [(self.src, self.a), (self.a, self.b), (self.b, self.c), (self.c, self.sink)]:
+            connect(producer.outports['token'], consumer.inports['token'])
+        self.enabled = [self.c, self.b, self.a]
+
+    def new_actor(self):
+        actor_id = self.actor_mgr.new('std.Identity', {})
+        actor = self.actor_mgr.actors[actor_id]
+        actor._calvinsys = Mock()
+        return actor
+
+    def test_find_chain(self):
+        fusion = Fusion()
+        assert fusion.outdated(self.enabled)
+        fusion.find(self.enabled)
+        assert not fusion.outdated(self.enabled)
+        chain = fusion.chains[self.a.id]
+        assert chain.actors == [self.a, self.b, self.c]
+        assert fusion.chains[self.c.id] is chain
+        assert self.src.id not in fusion.chains
+        assert fusion.group(self.enabled) == [chain]
+
+    def test_reconnect_unfuses(self):
+        fusion = Fusion()
+        fusion.find(self.enabled)
+        connect(self.a.outports['token'], self.b.inports['token'])
+        assert fusion.group(self.enabled) == [self.c, self.b, self.a]
+        assert not fusion.chains
+        assert fusion.outdated(self.enabled)
+        fusion.find(self.enabled)
+        assert fusion.chains[self.b.id].actors == [self.a, self.b, self.c]
+
+    def test_fused_chain_fired_in_one_pass(self):
+        actor_mgr = Mock()
+        actor_mgr.actors = self.actor_mgr.actors
+        actor_mgr.enabled_actors.return_value = self.enabled
+        scheduler = Scheduler(Mock(), actor_mgr, Mock())
+
+        self.src.outports['token'].write_token(Token(1))
+        scheduler.fire_actors()
+        assert self.sink.inports['token'].available_tokens() == 0
+
+        scheduler._fusion = Fusion()
+        self.src.outports['token'].write_token(Token(2))
+        scheduler.fire_actors()
+        assert type(scheduler._fusion.chains[self.a.id]) is Chain
+        assert [self.sink.inports['token'].read_token().value for _ in range(2)] == [1, 2]
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import unittest
+
+from calvin.runtime.north.calvin_token import Token, ExceptionToken, EOSToken
+from calvin.runtime.north.plugins.coders.messages import message_coder_factory, cbor_coder
+from calvin.runtime.north.plugins.coders.negotiators import negotiator_factory
+
+pytestmark = pytest.mark.unittest
+
+
+class TestCBORCoder(unittest.TestCase):
+
+    def setUp(self):
+        self.coder = message_coder_factory.get("cbor")
+
+    def roundtrip(self, value):
+        return self.coder.decode(self.coder.encode(value))
+
+    def test_values(self):
+        values = [0, 23, 24, 255, 256, 65536, 2 ** 32, 2 ** 64 - 1, 2 ** 64, 2 ** 100,
+                  -1, -24, -25, -2 ** 64, -2 ** 64 - 1, -2 ** 100,
+                  0.0, 1.5, -1e300, True, False, None,
+                  "", "port", "\x00\xff", u"", u"åäö", [], [1, [2, "3"]], {}, {"a": {"b": [None]}}]
+        for value in values:
+            decoded = self.roundtrip(value)
+            assert decoded == value
+            assert type(decoded) == type(value)
+        assert self.roundtrip((1, 2)) == [1, 2]
+
+    def test_known_encodings(self):
+        # Examples from RFC 7049 appendix A
+        assert self.coder.encode(100) == "\x18\x64"
+        assert self.coder.encode(-1000) == "\x39\x03\xe7"
+        assert self.coder.encode(u"IETF") == "\x64IETF"
+        assert self.coder.encode([1, [2, 3]]) == "\x82\x01\x82\x02\x03"
+        assert self.coder.decode("\xf9\x3c\x00") == 1.0
+        assert self.coder.decode("\xfa\x47\xc3\x50\x00") == 100000.0
+
+    def test_errors(self):
+        with pytest.raises(TypeError):
+            self.coder.encode(set([1]))
+        with pytest.raises(ValueError):
+            self.coder.decode("\x01\x02")
+        with pytest.raises(ValueError):
+            self.coder.decode("\x5f")
+
+    def test_tokens(self):
+        for token in [Token(5), Token({"a": [1.5, "x"]}), ExceptionToken(), EOSToken()]:
+            decoded = Token.decode(token.encode(self.coder), self.coder)
+            assert type(decoded) is type(token)
+            assert decoded.value == token.value
+
+    def test_control_messages(self):
+        messages = [
+            {'cmd': 'TUNNEL_DATA', 'tunnel_id': 'TUNNEL_1', 'value': {
+                'cmd': 'TOKEN', 'port_id': 'p1', 'peer_port_id': 'p2', 'sequencenbr': 1000,
+                'token': Token(u"data").encode()}},
+            {'cmd': 'REPLY', 'msg_uuid': 'MSGID_1', 'value': {'status': 200, 'data': {'port_id': 'p1'}}},
+            {'cmd': 'PORT_CONNECT', 'port_id': 'p1', 'peer_actor_id': None, 'peer_port_name': None,
+             'peer_port_id': 'p2', 'peer_port_dir': None, 'tunnel_id': 'TUNNEL_1', 'token_capabilities': ['CREDIT']}
+        ]
+        for msg in messages:
+            assert self.roundtrip(msg) == msg
+
+    def test_smaller_than_json(self):
+        msg = {'cmd': 'TOKEN_REPLY', 'port_id': 'p1', 'peer_port_id': 'p2', 'sequencenbr': 123456, 'value': 'ACK'}
+        assert len(self.coder.encode(msg)) < len(message_coder_factory.get("json").encode(msg))
+
+
+class TestNegotiation(unittest.TestCase):
+
+    def test_dynamic(self):
+        negotiator = negotiator_factory.get("dynamic")
+        assert negotiator.get_list() == ['cbor', 'json']
+        assert isinstance(negotiator.get_coder(['json', 'cbor']), cbor_coder.MessageCoder)
+        # An older peer only knows json
+        assert not isinstance(negotiator.get_coder(['json']), cbor_coder.MessageCoder)
+
+    def test_static(self):
+        negotiator = negotiator_factory.get("static")
+        assert negotiator.get_list() == ['json']
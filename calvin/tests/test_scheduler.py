@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2016 Ericsson AB
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+import pytest
+from mock import Mock, patch
+
+from calvin.actor.actor import ActionResult
+from calvin.runtime.north.scheduler import Scheduler
+
+pytestmark = pytest.mark.unittest
+
+
+def create_actor(actor_id, did_fire=False):
+    actor = Mock()
+    actor.id = actor_id
+    actor.enabled.return_value = True
+    actor.fire.return_value = ActionResult(did_fire=did_fire)
+    actor.inports = {}
+    actor.outports = {}
+    actor._sched_class = 'normal'
+    actor._sched_deadline = None
+    return actor
+
+
+@patch('calvin.runtime.north.scheduler.async')
+class SchedulerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.actor_mgr = Mock()
+        self.actors = {a_id: create_actor(a_id) for a_id in ['a1', 'a2', 'a3']}
+        self.actor_mgr.actors = self.actors
+        self.actor_mgr.enabled_actors.return_value = self.actors.values()
+        self.monitor = Mock()
+        self.monitor.loop.return_value = False
+        self.monitor.next_due.return_value = None
+        self.scheduler = Scheduler(Mock(), self.actor_mgr, self.monitor)
+
+    def test_sweep_fires_all_actors(self, async):
+        self.scheduler.trigger_loop(actor_ids=['a1'])
+        self.scheduler.loop_once()
+        for actor in self.actors.values():
+            assert actor.fire.called
+
+    def test_readiness_fires_triggered_actors(self, async):
+        self.scheduler._readiness = True
+        self.scheduler._last_sweep = float('inf')
+        self.scheduler.trigger_loop(actor_ids=['a1'])
+        self.scheduler.loop_once()
+        assert self.actors['a1'].fire.called
+        assert not self.actors['a2'].fire.called
+        assert not self.actors['a3'].fire.called
+        # Nothing fired, wait for next trigger or the sweep
+        async.DelayedCall.assert_called_with(self.scheduler._heartbeat, self.scheduler.trigger_loop)
+
+    def test_readiness_full_sweep(self, async):
+        self.scheduler._readiness = True
+        self.scheduler.trigger_loop(actor_ids=['a1'])
+        self.scheduler.loop_once()
+        for actor in self.actors.values():
+            assert actor.fire.called
+
+    def test_readiness_triggers_local_peers(self, async):
+        self.scheduler._readiness = True
+        a1 = self.actors['a1']
+        a1.fire.return_value = ActionResult(did_fire=True)
+        peer_port = Mock()
+        peer_port.owner = self.actors['a2']
+        a1.outports = {'token': Mock(endpoints=[Mock(peer_port=peer_port)])}
+        total = self.scheduler.fire_actors(set(['a1', 'unknown']))
+        assert total.did_fire
+        assert total.actor_ids == set(['a2'])
+        assert not self.actors['a3'].fire.called
+
+    def test_fires_by_class_and_deadline(self, async):
+        order = []
+        for actor in self.actors.values():
+            actor.fire.side_effect = lambda actor=actor: order.append(actor.id) or ActionResult(did_fire=True)
+        self.actors['a1']._sched_class = 'bulk'
+        self.actors['a2']._sched_deadline = 1.0
+        self.actors['a3']._sched_deadline = 0.5
+        self.scheduler.fire_actors(None)
+        assert order == ['a3', 'a2', 'a1']
+        stats = self.scheduler.stats()
+        assert stats['normal']['count'] == 2
+        assert stats['bulk']['count'] == 1
+        assert stats['realtime']['count'] == 0
+
+    def test_bulk_budget_defers_bulk_actors(self, async):
+        for actor in self.actors.values():
+            actor._sched_class = 'bulk'
+        self.scheduler._bulk_budget = 0.0
+        self.scheduler._triggered.update({'a1': 1.0, 'a2': 1.0, 'a3': 1.0})
+        total = self.scheduler.fire_actors(None)
+        # The first bulk actor uses up the budget
+        fired = [actor.id for actor in self.actors.values() if actor.fire.called]
+        assert len(fired) == 1
+        assert total.deferred == set(self.actors) - set(fired)
+        assert total.actor_ids >= total.deferred
+        # Deferred actors keep their trigger time, and go before later triggered bulk actors
+        assert self.scheduler._triggered == dict.fromkeys(total.deferred, 1.0)
+        self.scheduler._triggered[fired[0]] = 2.0
+        deferred = total.deferred
+        total = self.scheduler.fire_actors(None)
+        assert fired[0] in total.deferred
+        assert len(total.deferred & deferred) == 1
+
+    def test_readiness_refires_yielded_actor(self, async):
+        self.scheduler._readiness = True
+        result = ActionResult(did_fire=True)
+        result.yielded = True
+        self.actors['a1'].fire.return_value = result
+        total = self.scheduler.fire_actors(set(['a1']))
+        assert total.actor_ids == set(['a1'])
+
+    def test_idle_wait_doubles(self, async):
+        self.scheduler._idle_max = 3.0
+        waits = []
+        for _ in range(4):
+            self.scheduler.loop_once()
+            waits.append(async.DelayedCall.call_args[0][0])
+        assert waits == [1.0, 2.0, 3.0, 3.0]
+
+    def test_idle_sleeps_until_monitor_due(self, async):
+        self.monitor.next_due.return_value = time.time() + 0.25
+        self.scheduler.loop_once()
+        wait = async.DelayedCall.call_args[0][0]
+        assert 0 < wait <= 0.25
+        # Only events wake an idle node
+        self.monitor.next_due.return_value = None
+        self.scheduler._idle_max = 0
+        self.scheduler._idle_wait = None
+        async.DelayedCall.reset_mock()
+        self.scheduler.loop_once()
+        assert not async.DelayedCall.called
+
+    def test_back_to_back_loops(self, async):
+        a1 = self.actors['a1']
+        a1.fire.side_effect = [ActionResult(did_fire=True)] * 3 + [ActionResult(did_fire=False)] * 2
+        self.scheduler._burst = 1.0
+        self.scheduler.loop_once()
+        # Looped without a reactor round-trip until nothing fired, then went idle
+        assert a1.fire.call_count == 4
+        async.DelayedCall.assert_called_once_with(self.scheduler._heartbeat, self.scheduler.trigger_loop)
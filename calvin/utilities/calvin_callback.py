@@ -30,7 +30,7 @@ class CalvinCB(object):
     """
     def __init__(self, func, *args, **kwargs):
         super(CalvinCB, self).__init__()
-        self.id = calvinuuid.uuid("CB")
+        self.id = calvinuuid.ephemeral("CB")
         self.func = func
         self.args = list(args)
         self.kwargs = kwargs
@@ -73,7 +73,7 @@ class CalvinCBGroup(object):
     """
     def __init__(self, funcs=None):
         super(CalvinCBGroup, self).__init__()
-        self.id = calvinuuid.uuid("CBG")
+        self.id = calvinuuid.ephemeral("CBG")
         self.funcs = funcs if funcs else []
 
     def func_append(self, func):
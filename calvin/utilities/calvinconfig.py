@@ -80,18 +80,38 @@ class CalvinConfig(object):
             'global': {
                 'comment': 'User definable section',
                 'actor_paths': ['systemactors'],
-                'framework': 'twistedimpl',
+                'framework': 'twistedimpl', # twistedimpl or asyncioimpl, the dht storages need twistedimpl
                 'storage_type': 'dht', # supports dht, securedht, local, and proxy
                 'storage_proxy': None,
                 'capabilities_blacklist': [],
-                'remote_coder_negotiator': 'static',
+                'remote_coder_negotiator': 'static',  # supports static and dynamic (prefers cbor over json)
                 'static_coder': 'json',
                 'metering_timeout': 10.0,
                 'metering_aggregated_timeout': 3600.0,  # Larger or equal to metering_timeout
                 'media_framework': 'defaultimpl',
                 'display_plugin': 'stdout_impl',
-                'transports': ['calvinip'],
-                'control_proxy': None
+                'transports': ['calvinip'],  # In order of preference, put 'calvinlocal' first to link runtimes on the same host over Unix sockets
+                'control_proxy': None,
+                'scheduler_mode': 'sweep',  # supports sweep and readiness
+                'scheduler_sweep_interval': 10.0,  # Full sweep interval in readiness mode
+                'scheduler_fusion': False,  # Fire chains of local single producer/consumer actors as one unit
+                'scheduler_bulk_budget': 0.005,  # Seconds bulk class actors may run per scheduler loop
+                'scheduler_idle_max': 10.0,  # Max seconds between loops on an idle node, 0 only wakes on events
+                'scheduler_burst': 0.005,  # Seconds of back to back loops before yielding to I/O
+                'actor_fire_budget': 0,  # Firings before an actor yields to the scheduler, 0 is unlimited
+                'actor_fire_budget_time': 0.0,  # Seconds of firing before an actor yields, 0 is unlimited
+                'timer_tick': 0.01,  # Resolution of the timer wheel, delays are rounded up to whole ticks
+                'offload_pool_size': 4,  # Worker threads for actions declared with @condition(..., offload=True)
+                'offload_queue_limit': 16,  # Offloaded actions waiting for a worker, beyond that actors retry later
+                'token_batch_size': 32,  # Max tokens per TOKEN_BATCH message to peers supporting it
+                'binary_segment_min_size': 4096,  # str values from this size are sent as raw frame segments
+                'transport_batch_size': 65536,  # Bytes of messages collected into one frame before it is sent
+                'transport_batch_delay': 0.0,  # Max seconds a message waits for more, 0 sends at the end of the turn
+                'transport_compression': 'zlib',  # Compression offered to peers, zlib or None
+                'transport_compress_min_size': 1024,  # Coded messages from this size are compressed
+                'fifo_size': 5,  # Default number of entries in a port FIFO
+                'fifo_size_min': 5,  # Bounds for adaptive FIFO sizing, adaptive when min < max
+                'fifo_size_max': 5
             },
             'testing': {
                 'comment': 'Test settings',
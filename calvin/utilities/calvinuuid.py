@@ -15,7 +15,9 @@
 # limitations under the License.
 
 import calvinlogger
+import itertools
 import logging
+import multiprocessing.util
 import uuid as sys_uuid
 
 
@@ -25,3 +27,30 @@ def uuid(prefix):
         return prefix + "_" + u
     else:
         return u
+
+
+class _Sequence(object):
+
+    """ The ephemeral ids of this process, a random process part and a counter """
+
+    def __init__(self):
+        super(_Sequence, self).__init__()
+        self.reset()
+
+    def reset(self):
+        self.base = sys_uuid.uuid4().hex[:12]
+        self.counter = itertools.count()
+
+
+_sequence = _Sequence()
+# Runtimes are forked by multiprocessing, each needs a sequence of its own
+multiprocessing.util.register_after_fork(_sequence, _Sequence.reset)
+
+
+def ephemeral(prefix):
+    """
+    A cheap id for short lived things such as callbacks, message ids and tunnels, unique among the
+    runtime processes but not over restarts. Persistent entities (actors, ports, applications, nodes)
+    use uuid.
+    """
+    return "%s_%s-%d" % (prefix, _sequence.base, next(_sequence.counter))
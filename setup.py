@@ -64,7 +64,8 @@ setup(name='calvin',
           "Topic :: Software Development",
       ],
       extras_require={
-          'crypto': 'pyOpenSSL==0.15.1'
+          'crypto': 'pyOpenSSL==0.15.1',
+          'asyncio': 'trollius>=2.1'
       },
       entry_points={
           'console_scripts': [